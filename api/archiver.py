@@ -0,0 +1,133 @@
+# ---------------------------------------------------------
+# 파일명: archiver.py
+# 위치: api/archiver.py
+# 이 파일은 완료된 지 오래된 할 일을 보관 테이블(archived_tasks)로 옮기는
+# 백그라운드 작업(archiver)을 정의한다.
+#
+# - 완료된 할 일이 tasks/dones에 계속 쌓이면 목록 조회와 인덱스가 점점 커진다.
+# - 보관 기준(ARCHIVE_AFTER_DAYS)보다 오래전에 완료된 할 일을
+#   작은 묶음(batch) 단위로 옮기고, 묶음 사이에는 잠깐 쉬어서(throttle)
+#   서비스 중인 DB에 부담을 주지 않는다.
+# - 보관된 할 일은 GET /tasks?include_archived=true 로 함께 볼 수 있다.
+#
+# [보관하지 않는 할 일]
+# - 반복 할 일 (발생별 상태가 계속 필요함)
+# - 하위 할 일이 있거나 상위 할 일이 있는 할 일
+#   (옮기면 상위 할 일의 하위 트리 조회와 완료 비율이 말없이 바뀜)
+# - 태그가 붙은 할 일 (보관 테이블에는 태그가 없으므로 옮기면 태그가 사라짐)
+# ---------------------------------------------------------
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import AsyncContextManager, Callable
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.models.task as task_model
+from api.db import utcnow
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# 보관 정책 설정 (환경 변수)
+# - ARCHIVE_AFTER_DAYS: 완료 후 며칠이 지나면 보관할지 (설정하지 않으면 보관 기능 꺼짐)
+# - ARCHIVE_BATCH_SIZE: 한 번에(한 트랜잭션에) 옮길 할 일 개수
+# - ARCHIVE_BATCH_PAUSE_SECONDS: 묶음과 묶음 사이에 쉬는 시간
+# - ARCHIVE_INTERVAL_SECONDS: 보관 작업을 다시 시작하기까지 기다리는 시간
+# ---------------------------------------------------------
+ARCHIVE_AFTER_DAYS = (
+    int(os.environ["ARCHIVE_AFTER_DAYS"])
+    if "ARCHIVE_AFTER_DAYS" in os.environ
+    else None
+)
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_BATCH_PAUSE_SECONDS = float(os.getenv("ARCHIVE_BATCH_PAUSE_SECONDS", "0.5"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+
+# ---------------------------------------------------------
+# [1] 묶음 하나를 보관하는 함수
+# - cutoff 이전에 완료된 할 일을 최대 batch_size개 골라
+#   archived_tasks에 복사한 뒤 원래 테이블에서 지운다. (한 트랜잭션)
+# - 반환값: 옮긴 할 일 개수
+# ---------------------------------------------------------
+async def archive_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    child = aliased(task_model.Task)
+    result = await db.execute(
+        select(
+            task_model.Task.id,
+            task_model.Task.title,
+            task_model.Task.due_date,
+            task_model.Task.parent_id,
+            task_model.Task.path,
+            task_model.Done.done_at,
+        )
+        .join(task_model.Done)
+        .where(
+            task_model.Done.done_at < cutoff,
+            task_model.Task.recurrence.is_(None),
+            task_model.Task.parent_id.is_(None),
+            ~exists().where(child.parent_id == task_model.Task.id),
+            ~exists().where(task_model.TaskTag.task_id == task_model.Task.id),
+        )
+        .order_by(task_model.Done.done_at)
+        .limit(batch_size)
+    )
+    rows = [dict(row._mapping) for row in result.all()]
+    if not rows:
+        return 0
+
+    await db.execute(insert(task_model.ArchivedTask), rows)
+    # 완료 기록은 ON DELETE CASCADE로 함께 지워짐
+    await db.execute(
+        delete(task_model.Task)
+        .where(task_model.Task.id.in_([row["id"] for row in rows]))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return len(rows)
+
+
+# ---------------------------------------------------------
+# [2] cutoff 이전에 완료된 할 일을 모두 보관하는 함수
+# - 묶음마다 새 세션(짧은 트랜잭션)을 사용하고, 묶음 사이에는 pause만큼 쉰다.
+# - 반환값: 옮긴 할 일의 총 개수
+# ---------------------------------------------------------
+async def archive_completed(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    cutoff: datetime,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    pause: float = ARCHIVE_BATCH_PAUSE_SECONDS,
+) -> int:
+    total = 0
+    while True:
+        async with session_factory() as db:
+            moved = await archive_batch(db, cutoff, batch_size)
+        total += moved
+        if moved < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+# ---------------------------------------------------------
+# [3] 앱이 실행되는 동안 주기적으로 보관 작업을 하는 백그라운드 루프
+# - api/main.py의 lifespan에서 시작되고, 앱이 종료될 때 취소된다.
+# ---------------------------------------------------------
+async def run_archiver(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    after_days: int,
+    interval: float = ARCHIVE_INTERVAL_SECONDS,
+) -> None:
+    while True:
+        try:
+            cutoff = utcnow() - timedelta(days=after_days)
+            moved = await archive_completed(session_factory, cutoff)
+            if moved:
+                logger.info("archived %d completed tasks", moved)
+        except Exception:
+            logger.exception("task archiver failed")
+        await asyncio.sleep(interval)
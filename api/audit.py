@@ -0,0 +1,186 @@
+# ---------------------------------------------------------
+# 파일명: audit.py
+# 위치: api/audit.py
+# 이 파일은 "누가 어떤 할 일을 어떻게 바꿨는지" 기록하는 감사 로그(audit log)
+# 기능을 정의한다.
+#
+# - 요청을 처리할 때마다 audit_logs에 한 줄씩 INSERT 하면 쓰기 요청마다
+#   DB 왕복이 한 번 더 늘어난다.
+# - 그래서 라우터는 변경 이벤트를 메모리 안의 큐(크기 제한 있음)에 넣기만 하고
+#   (emit), 백그라운드 작업(run)이 일정 간격으로 큐를 비우면서
+#   여러 줄을 한 번의 INSERT 문으로 저장한다.
+# - 앱이 종료될 때(lifespan) 큐에 남은 이벤트를 마지막으로 모두 저장한다.
+# - 큐가 가득 차면 요청을 막지 않고 이벤트를 버리며, 버린 개수와 저장 지연은
+#   메트릭(GET /metrics)으로 확인할 수 있다.
+#   - audit_events_total: 큐에 넣은 이벤트 수
+#   - audit_dropped_total: 큐가 가득 차거나 저장에 실패해서 버린 이벤트 수
+#   - audit_flushed_total: DB에 저장한 이벤트 수
+#   - audit_flush_errors_total: 저장 실패 횟수
+#   - audit_queue_depth: 지금 큐에 쌓여 있는 이벤트 수
+#   - audit_flush_lag_seconds: 마지막 저장에서 가장 오래 기다린 이벤트의 대기 시간
+#
+# 사용 예 (라우터):
+#   audit.emit("update", task_id, actor, {"title": "새 제목"})
+# ---------------------------------------------------------
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncContextManager, Callable
+
+from fastapi import Header
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.models.task as task_model
+from api import metrics
+from api.db import utcnow
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# 감사 로그 설정 (환경 변수)
+# - AUDIT_QUEUE_SIZE: 큐에 최대 몇 개의 이벤트를 쌓아 둘지
+# - AUDIT_BATCH_SIZE: 한 번의 INSERT 문으로 저장할 최대 이벤트 수
+# - AUDIT_FLUSH_INTERVAL_SECONDS: 큐를 비우는 간격
+# ---------------------------------------------------------
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+
+
+# ---------------------------------------------------------
+# [1] 변경 이벤트 하나
+# ---------------------------------------------------------
+@dataclass(slots=True)
+class AuditEvent:
+    action: str  # 무엇을 했는지 (예: "create", "update", "delete", "done")
+    task_id: int | None  # 바뀐 할 일 번호
+    actor: str | None  # 누가 했는지
+    changes: dict[str, Any] | None = None  # 바뀐 내용
+    created_at: datetime = field(default_factory=utcnow)  # 변경이 일어난 시각
+
+
+# ---------------------------------------------------------
+# [2] 이벤트를 모아 두었다가 한 번에 저장하는 큐
+# ---------------------------------------------------------
+class AuditQueue:
+    def __init__(
+        self, maxsize: int = AUDIT_QUEUE_SIZE, batch_size: int = AUDIT_BATCH_SIZE
+    ):
+        self._queue: asyncio.Queue[AuditEvent] = asyncio.Queue(maxsize)
+        self._batch_size = batch_size
+        self._stopping = asyncio.Event()
+        # False이면 이벤트를 받지 않음 (감사 로그를 저장할 DB가 없는 메모리 저장소)
+        self.enabled = True
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    # 이벤트를 큐에 넣는다 (기다리지 않음, 큐가 가득 차면 버림)
+    def put(self, event: AuditEvent) -> None:
+        if not self.enabled:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            metrics.inc("audit_dropped_total")
+            return
+        metrics.inc("audit_events_total")
+
+    # 큐에서 최대 batch_size개를 꺼내 한 번의 INSERT 문으로 저장한다
+    # - 반환값: 저장한 이벤트 수
+    async def flush(
+        self, session_factory: Callable[[], AsyncContextManager[AsyncSession]]
+    ) -> int:
+        batch = []
+        while len(batch) < self._batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if not batch:
+            return 0
+
+        rows = [
+            {
+                "task_id": event.task_id,
+                "action": event.action,
+                "actor": event.actor,
+                "changes": (
+                    json.dumps(jsonable_encoder(event.changes), ensure_ascii=False)
+                    if event.changes is not None
+                    else None
+                ),
+                "created_at": event.created_at,
+            }
+            for event in batch
+        ]
+        try:
+            async with session_factory() as db:
+                await db.execute(insert(task_model.AuditLog), rows)
+                await db.commit()
+        except Exception:
+            logger.exception("failed to write %d audit events", len(batch))
+            metrics.inc("audit_flush_errors_total")
+            metrics.inc("audit_dropped_total", len(batch))
+            return 0
+
+        metrics.inc("audit_flushed_total", len(batch))
+        metrics.set_gauge(
+            "audit_flush_lag_seconds", (utcnow() - batch[0].created_at).total_seconds()
+        )
+        return len(batch)
+
+    # 큐가 빌 때까지 저장한다
+    async def flush_all(
+        self, session_factory: Callable[[], AsyncContextManager[AsyncSession]]
+    ) -> int:
+        total = 0
+        while not self._queue.empty():
+            total += await self.flush(session_factory)
+        return total
+
+    # 앱이 실행되는 동안 interval마다 큐를 비우는 백그라운드 루프
+    # - stop()이 호출되면 남은 이벤트를 모두 저장하고 끝난다.
+    async def run(
+        self,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        interval: float = AUDIT_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self._stopping.clear()
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=interval)
+            except TimeoutError:
+                pass
+            await self.flush_all(session_factory)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+
+# 앱 전체에서 함께 쓰는 큐
+audit_queue = AuditQueue()
+metrics.register_gauge("audit_queue_depth", lambda: audit_queue.qsize())
+
+
+# ---------------------------------------------------------
+# [3] 라우터에서 변경 이벤트를 남길 때 사용하는 함수
+# ---------------------------------------------------------
+def emit(
+    action: str,
+    task_id: int | None,
+    actor: str | None,
+    changes: dict[str, Any] | None = None,
+) -> None:
+    audit_queue.put(AuditEvent(action, task_id, actor, changes))
+
+
+# ---------------------------------------------------------
+# [4] 요청한 사람을 알아내는 의존성 함수
+# - X-Actor 헤더 값을 사용한다. (예: X-Actor: alice)
+# ---------------------------------------------------------
+async def get_actor(x_actor: str | None = Header(default=None)) -> str | None:
+    return x_actor
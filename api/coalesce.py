@@ -0,0 +1,164 @@
+# ---------------------------------------------------------
+# 파일명: coalesce.py
+# 위치: api/coalesce.py
+# 이 파일은 똑같은 조회 요청이 동시에 여러 개 들어왔을 때
+# 한 번만 처리하고 응답을 나눠 주는 미들웨어를 정의한다. (single-flight)
+#
+# - 많은 화면이 한꺼번에 새로고침하면 같은 GET /tasks 요청이 수십 개 들어오고,
+#   요청마다 조회 쿼리를 실행하면서 DB 연결을 하나씩 붙잡는다.
+# - 이 미들웨어는 요청을 "키"로 묶는다.
+#   - 키 = 주소 + 정렬한 쿼리 문자열 + 범위 헤더 값(사용자/테넌트)
+#   - 같은 키의 요청이 이미 처리 중이면(leader), 뒤에 온 요청(follower)은
+#     기다렸다가 leader가 만든 응답(상태 코드, 헤더, 본문 바이트)을 그대로 받는다.
+#   - 처리가 끝나면 키를 지우므로 응답을 캐시하지는 않는다.
+#     (이미 처리 중인 조회와 겹친 요청만 같은 결과를 받음)
+# - leader가 실패하거나(5xx 응답 포함) 연결이 끊기면 기다리던 요청은 각자 직접 처리한다.
+#   (일시적인 오류 응답을 기다리던 요청 모두에게 퍼뜨리지 않음)
+# - GET 요청 중 COALESCE_PATHS로 시작하는 주소만 대상이다. (기본값: 꺼짐)
+#
+# [주의] 읽은 직후 내 변경이 보이지 않을 수 있음 (read-your-writes가 깨짐)
+# - follower는 leader가 이미 시작한 조회의 결과를 받는다.
+#   그래서 follower가 들어오기 직전에 끝난 수정/삭제가 응답에 빠져 있을 수 있다.
+#   (예: PUT /tasks/3 직후의 GET /tasks가 수정 전 목록을 받음)
+# - 낡은 정도는 조회 한 번이 걸리는 시간을 넘지 않는다.
+# - 이 정도의 낡은 응답을 받아도 되는 주소(예: 대시보드의 목록 새로고침)만
+#   COALESCE_PATHS에 넣어서 켠다.
+#
+# [메트릭] (GET /metrics)
+#   - coalesce_requests_total: 묶을 수 있는 조회 요청 수
+#   - coalesce_leaders_total: 실제로 처리한 요청 수
+#   - coalesce_followers_total: 다른 요청의 응답을 나눠 받은 요청 수
+#   - coalesce_ratio: followers / requests (1에 가까울수록 많이 묶였음)
+#   - coalesce_inflight: 지금 처리 중인 키 수
+# ---------------------------------------------------------
+
+import asyncio
+import os
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api import metrics
+
+# ---------------------------------------------------------
+# 묶기 설정 (환경 변수)
+# - COALESCE_PATHS: 묶을 주소의 시작 부분 (쉼표로 구분, 설정하지 않으면 기능 꺼짐)
+#   예: "/tasks"
+# - COALESCE_SCOPE_HEADERS: 응답이 달라질 수 있는 요청자 헤더 (쉼표로 구분)
+#   예: "x-actor" (사용자별), "x-tenant-id" (테넌트별)
+#   이 헤더 값이 다른 요청끼리는 묶지 않는다.
+# ---------------------------------------------------------
+COALESCE_PATHS = [path for path in os.getenv("COALESCE_PATHS", "").split(",") if path]
+COALESCE_SCOPE_HEADERS = [
+    name.strip().lower()
+    for name in os.getenv("COALESCE_SCOPE_HEADERS", "authorization,x-actor").split(",")
+    if name.strip()
+]
+
+# leader가 만든 응답: (시작 메시지, 본문 바이트) / 실패하거나 5xx 응답이면 None
+_Response = tuple[Message, bytes] | None
+
+
+class CoalesceMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: list[str] | None = None,
+        scope_headers: list[str] | None = None,
+    ):
+        self.app = app
+        # None이면 요청마다 COALESCE_PATHS 설정을 읽는다
+        self._paths = None if paths is None else tuple(paths)
+        if scope_headers is None:
+            scope_headers = COALESCE_SCOPE_HEADERS
+        self.scope_headers = [name.encode() for name in scope_headers]
+        # 키 -> leader의 응답을 받을 Future
+        self._inflight: dict[tuple, asyncio.Future[_Response]] = {}
+        self._requests = 0
+        self._followers = 0
+        metrics.register_gauge("coalesce_inflight", lambda: len(self._inflight))
+        metrics.register_gauge("coalesce_ratio", self._ratio)
+
+    def _ratio(self) -> float:
+        return self._followers / self._requests if self._requests else 0.0
+
+    # -----------------------------------------------------
+    # [1] 요청 키 만들기
+    # - 쿼리 문자열은 정렬해서 ?a=1&b=2 와 ?b=2&a=1 을 같은 요청으로 본다.
+    # -----------------------------------------------------
+    def _key(self, scope: Scope) -> tuple | None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None
+        path = scope["path"]
+        paths = tuple(COALESCE_PATHS) if self._paths is None else self._paths
+        if not paths or not path.startswith(paths):
+            return None
+
+        query = urlencode(
+            sorted(
+                parse_qsl(
+                    scope["query_string"].decode("latin-1"), keep_blank_values=True
+                )
+            )
+        )
+        headers = dict(scope["headers"])
+        return (path, query, *(headers.get(name) for name in self.scope_headers))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = self._key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        metrics.inc("coalesce_requests_total")
+        self._requests += 1
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # 기다리던 요청의 연결이 끊겨도 leader의 Future는 취소되지 않게 함
+            response = await asyncio.shield(inflight)
+            if response is not None:
+                metrics.inc("coalesce_followers_total")
+                self._followers += 1
+                start, body = response
+                await send({**start, "headers": list(start["headers"])})
+                await send({"type": "http.response.body", "body": body})
+                return
+            # leader가 실패했으면 직접 처리한다
+
+        await self._lead(key, scope, receive, send)
+
+    # -----------------------------------------------------
+    # [2] 직접 처리하면서 응답을 모아 기다리는 요청들에게 나눠 준다
+    # -----------------------------------------------------
+    async def _lead(
+        self, key: tuple, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        metrics.inc("coalesce_leaders_total")
+
+        # 같은 키를 이미 다른 요청이 처리 중이면(실패 후 다시 처리하는 경우) 결과를 나누지 않음
+        future = None
+        if key not in self._inflight:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # 바깥 미들웨어가 헤더 리스트를 고칠 수 있으므로 복사해 둠
+                start = {**message, "headers": list(message.get("headers", []))}
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        response: _Response = None
+        try:
+            await self.app(scope, receive, send_and_capture)
+            if start is not None and start["status"] < 500:
+                response = (start, b"".join(chunks))
+        finally:
+            if future is not None:
+                del self._inflight[key]
+                future.set_result(response)
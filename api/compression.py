@@ -0,0 +1,306 @@
+# ---------------------------------------------------------
+# 파일명: compression.py
+# 위치: api/compression.py
+# 이 파일은 큰 응답(할 일 목록 등)을 압축해서 보내는 미들웨어를 정의한다.
+#
+# - 할 일 목록 JSON은 같은 키와 비슷한 제목이 반복되므로 압축이 잘 된다.
+# - 클라이언트가 보낸 Accept-Encoding 헤더를 보고 압축 방식을 고른다.
+#   - 지원: zstd, br(brotli), gzip (q 값이 같으면 이 순서로 우선)
+#   - br / zstd는 brotli / zstandard 패키지가 설치되어 있을 때만 사용한다.
+#     (poetry install -E compression)
+# - COMPRESSION_MIN_SIZE 바이트보다 작은 응답은 압축하지 않는다.
+#   (작은 응답은 압축해도 줄어드는 양보다 CPU 비용이 큼)
+# - 스트리밍 응답도 본문 조각이 올 때마다 이어서 압축해서 바로 보낸다.
+#   (전체 본문을 모으지 않음, 처음 COMPRESSION_MIN_SIZE 바이트만 모아서 크기를 판단)
+#   - 압축기는 내용을 안에 모아 두므로, 조각마다 flush해서 받은 만큼을 바로 내보낸다.
+#     (flush 없이는 마지막 조각까지 빈 조각만 보내게 됨)
+#   - 압축 결과가 비어 있는 조각은 보내지 않는다.
+# - 큰 조각(COMPRESSION_THREAD_MIN_SIZE 이상)의 압축은 스레드 풀에서 실행해서
+#   압축하는 동안 이벤트 루프가 다른 요청을 처리할 수 있게 한다.
+# - 이미 압축된 응답(Content-Encoding이 있음)이나 압축 효과가 없는 형식
+#   (이미지 등)은 그대로 보낸다.
+#
+# [메트릭] (GET /metrics)
+#   - compression_responses_total / compression_<방식>_responses_total: 압축한 응답 수
+#   - compression_bytes_in_total / compression_bytes_out_total: 압축 전 / 후 바이트 수
+#   - compression_ratio: 압축 후 / 압축 전 (작을수록 많이 줄었음)
+#   - compression_cpu_seconds_total: 압축에 쓴 CPU 시간
+# ---------------------------------------------------------
+
+import asyncio
+import os
+import time
+import zlib
+from typing import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api import metrics
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 br은 사용하지 않음
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard가 없으면 zstd는 사용하지 않음
+    zstandard = None
+
+# ---------------------------------------------------------
+# 압축 설정 (환경 변수)
+# - COMPRESSION_MIN_SIZE: 이 크기(바이트)보다 작은 응답은 압축하지 않음
+# - COMPRESSION_THREAD_MIN_SIZE: 이 크기 이상의 조각은 스레드 풀에서 압축함
+# - COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_QUALITY / COMPRESSION_ZSTD_LEVEL: 압축 강도
+# ---------------------------------------------------------
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_THREAD_MIN_SIZE = int(os.getenv("COMPRESSION_THREAD_MIN_SIZE", "65536"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+# 압축할 응답 형식 (Content-Type의 앞부분)
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/x-ndjson")
+
+
+# ---------------------------------------------------------
+# [1] 압축 방식별 압축기
+# - compress(data): 조각을 이어서 압축
+# - flush(): 지금까지 받은 내용을 모두 내보냄 (스트림은 계속 이어짐)
+# - finish(): 남은 내용을 모두 내보내고 스트림을 끝냄
+# ---------------------------------------------------------
+class _GzipCompressor:
+    def __init__(self):
+        # wbits=31: gzip 헤더/체크섬을 붙임
+        self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(
+            level=COMPRESSION_ZSTD_LEVEL
+        ).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# 사용할 수 있는 압축 방식 (앞에 있을수록 우선)
+ENCODERS: dict[str, Callable[[], object]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = _ZstdCompressor
+if brotli is not None:
+    ENCODERS["br"] = _BrotliCompressor
+ENCODERS["gzip"] = _GzipCompressor
+
+
+# ---------------------------------------------------------
+# [2] Accept-Encoding 헤더에서 압축 방식 고르기
+# - 예: "gzip, br;q=0.8" -> gzip / "br;q=1, gzip;q=0.5" -> br / "identity" -> None
+# - q=0 은 "사용하지 말라"는 뜻이다. "*"는 나머지 모든 방식을 뜻한다.
+# ---------------------------------------------------------
+def choose_encoding(accept_encoding: str) -> str | None:
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in ENCODERS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+# ---------------------------------------------------------
+# [3] 압축 미들웨어
+# ---------------------------------------------------------
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        thread_min_size: int = COMPRESSION_THREAD_MIN_SIZE,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_min_size = thread_min_size
+        self._bytes_in = 0
+        self._bytes_out = 0
+        metrics.register_gauge("compression_ratio", self._ratio)
+
+    def _ratio(self) -> float:
+        return self._bytes_out / self._bytes_in if self._bytes_in else 0.0
+
+    # 압축을 마친 응답 하나를 메트릭에 기록한다
+    def record(self, encoding: str, bytes_in: int, bytes_out: int) -> None:
+        self._bytes_in += bytes_in
+        self._bytes_out += bytes_out
+        metrics.inc("compression_responses_total")
+        metrics.inc(f"compression_{encoding}_responses_total")
+        metrics.inc("compression_bytes_in_total", bytes_in)
+        metrics.inc("compression_bytes_out_total", bytes_out)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponse(self, encoding, send).run(self.app, scope, receive)
+
+    # 조각 하나를 압축한다 (큰 조각은 스레드 풀에서)
+    # - 반환값: 압축한 바이트 (CPU 시간은 메트릭에 더함)
+    async def compress(self, function: Callable[[bytes], bytes], data: bytes) -> bytes:
+        if len(data) >= self.thread_min_size:
+            output, cpu_seconds = await asyncio.to_thread(_timed, function, data)
+        else:
+            output, cpu_seconds = _timed(function, data)
+        metrics.inc("compression_cpu_seconds_total", cpu_seconds)
+        return output
+
+
+# 압축 함수를 실행하고, 실행한 스레드의 CPU 시간을 함께 돌려준다
+def _timed(function: Callable[[bytes], bytes], data: bytes) -> tuple[bytes, float]:
+    start = time.thread_time()
+    output = function(data)
+    return output, time.thread_time() - start
+
+
+# ---------------------------------------------------------
+# [4] 응답 하나의 압축 상태
+# - 시작 메시지(상태 코드, 헤더)는 압축 여부가 정해질 때까지 보내지 않고 들고 있다.
+# ---------------------------------------------------------
+class _CompressedResponse:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Message | None = None
+        self.buffer = bytearray()
+        self.compressor = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def run(self, app: ASGIApp, scope: Scope, receive: Receive) -> None:
+        await app(scope, receive, self.send_message)
+
+    async def send_message(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                or (
+                    "content-length" in headers
+                    and int(headers["content-length"]) < self.middleware.minimum_size
+                )
+            ):
+                self.passthrough = True
+                await self.send(message)
+                return
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            # 아직 압축 여부를 정하지 않음: 최소 크기가 될 때까지 모은다
+            self.buffer += body
+            if len(self.buffer) < self.middleware.minimum_size and more_body:
+                return
+            if len(self.buffer) < self.middleware.minimum_size:
+                # 끝까지 받았는데도 작으면 압축하지 않고 그대로 보냄
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(
+                    {"type": "http.response.body", "body": bytes(self.buffer)}
+                )
+                return
+            await self._begin()
+            body, self.buffer = bytes(self.buffer), bytearray()
+
+        compressor = self.compressor
+        if more_body:
+            # 중간 조각: 받은 만큼을 바로 보낼 수 있게 flush함
+            def function(data: bytes) -> bytes:
+                return compressor.compress(data) + compressor.flush()
+
+        else:
+            # 마지막 조각: 남은 내용까지 모두 내보냄
+            def function(data: bytes) -> bytes:
+                return compressor.compress(data) + compressor.finish()
+
+        output = await self.middleware.compress(function, body)
+        self.bytes_in += len(body)
+        self.bytes_out += len(output)
+        if not more_body:
+            self.middleware.record(self.encoding, self.bytes_in, self.bytes_out)
+        elif not output:
+            return
+        await self.send(
+            {"type": "http.response.body", "body": output, "more_body": more_body}
+        )
+
+    # 압축을 시작한다: 헤더를 고쳐서 시작 메시지를 보냄
+    async def _begin(self) -> None:
+        self.compressor = ENCODERS[self.encoding]()
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        del headers["Content-Length"]
+        await self.send({**self.start, "headers": headers.raw})
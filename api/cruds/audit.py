@@ -0,0 +1,29 @@
+# -----------------------------------------------------------------
+# 파일명: audit.py
+# 위치: api/cruds/audit.py
+# 목적: 감사 로그(audit_logs)에 저장된 할 일 변경 이력을 조회합니다.
+# - 저장(INSERT)은 api/audit.py의 백그라운드 작업이 한꺼번에 처리합니다.
+# -----------------------------------------------------------------
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.models.task as task_model
+
+
+# -----------------------------------------------------------------
+# 할 일 하나의 변경 이력을 최신순으로 조회하는 함수
+# - OFFSET 대신 "이 id보다 이전 기록"(before_id)으로 다음 페이지를 읽습니다.
+#   (ix_audit_logs_task_id_id 인덱스를 그대로 따라가므로 기록이 많아도 빠름)
+# -----------------------------------------------------------------
+async def get_history(
+    db: AsyncSession, task_id: int, limit: int, before_id: int | None = None
+) -> list[task_model.AuditLog]:
+    query = select(task_model.AuditLog).where(task_model.AuditLog.task_id == task_id)
+    if before_id is not None:
+        query = query.where(task_model.AuditLog.id < before_id)
+
+    result = await db.execute(
+        query.order_by(task_model.AuditLog.id.desc()).limit(limit)
+    )
+    return list(result.scalars().all())
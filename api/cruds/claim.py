@@ -0,0 +1,139 @@
+# -----------------------------------------------------------------
+# 파일명: claim.py
+# 위치: api/cruds/claim.py
+# 목적: 할 일 목록을 "작업 큐"처럼 사용할 수 있게 하는 기능을 정의합니다.
+# - 작업자(worker)는 다음 할 일을 하나씩 "점유(claim)"해서 가져갑니다.
+# - 점유에는 기한(lease)이 있고, 작업자는 heartbeat로 기한을 늘립니다.
+# - 기한이 지나면(작업자가 죽었다고 보고) 다른 작업자가 다시 가져갈 수 있습니다.
+#
+# [동시성 처리]
+# - PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED
+#   다른 작업자가 잠근 행은 기다리지 않고 건너뛰므로 작업자가 많아도 서로 막히지 않습니다.
+# - SQLite(테스트용): 조건부 UPDATE로 점유하고, 다른 작업자가 먼저 가져갔으면 다시 시도합니다.
+#   경쟁에서 질 때마다 다른 작업자가 할 일 하나를 가져간 것이므로,
+#   점유할 수 있는 할 일이 남아 있는 한 언젠가는 성공하고, 없으면 None으로 끝납니다.
+# -----------------------------------------------------------------
+
+from datetime import timedelta
+
+from sqlalchemy import and_, exists, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+import api.models.task as task_model
+from api.db import utcnow
+
+
+# -----------------------------------------------------------------
+# 점유할 수 있는 할 일의 조건
+# - 아직 완료되지 않았고 (dones에 없음)
+# - 아무도 점유하지 않았거나, 점유 기한이 지난 할 일
+# -----------------------------------------------------------------
+def _claimable(now) -> ColumnElement[bool]:
+    return and_(
+        ~exists().where(task_model.Done.id == task_model.Task.id),
+        or_(
+            task_model.Task.claimed_by.is_(None),
+            task_model.Task.lease_expires_at < now,
+        ),
+    )
+
+
+# 마감일이 빠른 순서 (마감일이 없는 할 일은 맨 뒤), 같으면 id 순서
+_QUEUE_ORDER = (task_model.Task.due_date.asc().nulls_last(), task_model.Task.id)
+
+
+# -----------------------------------------------------------------
+# [1] 다음 할 일을 점유하는 함수
+# - 반환값: 점유한 Task 객체, 가져갈 할 일이 없으면 None
+# -----------------------------------------------------------------
+async def claim_next(
+    db: AsyncSession, worker: str, lease_seconds: int
+) -> task_model.Task | None:
+    now = utcnow()
+    lease_expires_at = now + timedelta(seconds=lease_seconds)
+
+    if db.get_bind().dialect.name == "postgresql":
+        # 잠긴 행은 건너뛰고, 첫 번째로 잠글 수 있는 행 하나만 가져옴
+        result = await db.execute(
+            select(task_model.Task)
+            .where(_claimable(now))
+            .order_by(*_QUEUE_ORDER)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        task = result.scalars().first()
+        if task is None:
+            await db.rollback()
+            return None
+
+        task.claimed_by = worker
+        task.lease_expires_at = lease_expires_at
+        await db.commit()
+        await db.refresh(task)
+        return task
+
+    # 후보 조회 결과가 비어 있을 때까지 반복 (정해진 횟수 후에 "없음"으로 끝내지 않음)
+    while True:
+        result = await db.execute(
+            select(task_model.Task.id)
+            .where(_claimable(now))
+            .order_by(*_QUEUE_ORDER)
+            .limit(1)
+        )
+        task_id = result.scalar()
+        if task_id is None:
+            await db.rollback()
+            return None
+
+        # 조건을 다시 확인하면서 점유 -> 그 사이 다른 작업자가 가져갔으면 0행이 바뀜
+        result = await db.execute(
+            update(task_model.Task)
+            .where(task_model.Task.id == task_id, _claimable(now))
+            .values(claimed_by=worker, lease_expires_at=lease_expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if result.rowcount == 1:
+            return await db.get(task_model.Task, task_id, populate_existing=True)
+
+
+# -----------------------------------------------------------------
+# [2] 점유 기한을 늘리는 함수 (heartbeat)
+# - 이 작업자가 점유 중이고, 아직 기한이 지나지 않은 경우에만 늘어납니다.
+# - 반환값: 갱신된 Task 객체, 점유 중이 아니면 None
+# -----------------------------------------------------------------
+async def heartbeat(
+    db: AsyncSession, task_id: int, worker: str, lease_seconds: int
+) -> task_model.Task | None:
+    now = utcnow()
+    result = await db.execute(
+        update(task_model.Task)
+        .where(
+            task_model.Task.id == task_id,
+            task_model.Task.claimed_by == worker,
+            task_model.Task.lease_expires_at >= now,
+        )
+        .values(lease_expires_at=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount != 1:
+        return None
+    return await db.get(task_model.Task, task_id, populate_existing=True)
+
+
+# -----------------------------------------------------------------
+# [3] 점유를 반납하는 함수
+# - 작업을 포기할 때 사용합니다. 다른 작업자가 바로 가져갈 수 있게 됩니다.
+# - 반환값: 반납했으면 True, 이 작업자가 점유 중이 아니면 False
+# -----------------------------------------------------------------
+async def release(db: AsyncSession, task_id: int, worker: str) -> bool:
+    result = await db.execute(
+        update(task_model.Task)
+        .where(task_model.Task.id == task_id, task_model.Task.claimed_by == worker)
+        .values(claimed_by=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
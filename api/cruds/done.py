@@ -5,13 +5,25 @@
 # 사용 기술: SQLAlchemy (비동기 방식), FastAPI에서 사용됨
 # -----------------------------------------------------------------
 
-from sqlalchemy import select  # DB에서 데이터 조회할 때 사용
+from sqlalchemy import delete, insert, select, update  # 여러 행을 한 번에 처리하는 쿼리
 from sqlalchemy.engine import Result  # 조회 결과 타입
 from sqlalchemy.ext.asyncio import AsyncSession  # 비동기 DB 접속을 위한 세션
 
 # task_model 안에 정의된 Done 모델을 불러옵니다
 import api.models.task as task_model
 
+# 자주 쓰는 조회 쿼리를 캐시해 두는 쿼리 계층을 불러옵니다
+import api.cruds.statements as statements
+
+# 하위 트리(subtree) 조건을 만드는 함수를 불러옵니다
+from api.cruds.task import subtree_filter
+
+# 웹훅으로 보낼 변경 알림을 같은 트랜잭션 안에서 쌓아 둡니다 (api/outbox.py)
+from api import outbox
+
+# * 아래 함수들은 dones를 바꿀 때 tasks.is_done도 같은 트랜잭션에서 함께 바꿉니다.
+#   ("다음에 할 일" 인덱스가 완료된 할 일을 빼는 데 사용함, api/models/task.py 참고)
+
 
 # -----------------------------------------------------------------
 # [1] 완료된 할 일을 조회하는 함수
@@ -20,9 +32,7 @@ import api.models.task as task_model
 # -----------------------------------------------------------------
 async def get_done(db: AsyncSession, task_id: int) -> task_model.Done | None:
     # Done 테이블에서 id가 task_id인 데이터를 선택합니다
-    result: Result = await db.execute(
-        select(task_model.Done).filter(task_model.Done.id == task_id)
-    )
+    result: Result = await db.execute(statements.DONE_BY_ID, {"task_id": task_id})
 
     # 결과 중 첫 번째 값을 가져옵니다. 없으면 None이 됩니다.
     return result.scalars().first()
@@ -39,6 +49,10 @@ async def create_done(db: AsyncSession, task_id: int) -> task_model.Done:
 
     # DB에 저장될 항목으로 추가합니다
     db.add(done)
+    await _set_is_done(db, task_model.Task.id == task_id, True)
+
+    # 웹훅 알림도 같은 트랜잭션에 저장합니다
+    await outbox.enqueue(db, "task.done", [task_id])
 
     # 실제로 DB로 저장합니다 (commit)
     await db.commit()
@@ -58,6 +72,62 @@ async def create_done(db: AsyncSession, task_id: int) -> task_model.Done:
 async def delete_done(db: AsyncSession, original: task_model.Done) -> None:
     # 전달받은 객체를 삭제 대상으로 지정합니다
     await db.delete(original)
+    await _set_is_done(db, task_model.Task.id == original.id, False)
+
+    # 웹훅 알림도 같은 트랜잭션에 저장합니다
+    await outbox.enqueue(db, "task.undone", [original.id])
 
     # 삭제 내용을 DB에 반영합니다
     await db.commit()
+
+
+# -----------------------------------------------------------------
+# [4] 하위 트리 전체를 한 번에 "완료" 처리하는 함수
+# - root 할 일과 그 아래 모든 하위 할 일 중 아직 완료되지 않은 것만
+#   INSERT INTO dones (id) SELECT ... 한 문장으로 저장합니다.
+# -----------------------------------------------------------------
+async def create_done_subtree(db: AsyncSession, root: task_model.Task) -> None:
+    result: Result = await db.execute(
+        insert(task_model.Done)
+        .from_select(
+            ["id"],
+            select(task_model.Task.id)
+            .outerjoin(task_model.Done)
+            .where(subtree_filter(root))
+            .where(task_model.Done.id.is_(None)),
+        )
+        .returning(task_model.Done.id)
+    )
+    # 새로 완료된 할 일마다 웹훅 알림을 저장합니다
+    await outbox.enqueue(db, "task.done", list(result.scalars().all()))
+    await _set_is_done(db, subtree_filter(root), True)
+    await db.commit()
+
+
+# -----------------------------------------------------------------
+# [5] 하위 트리 전체의 완료 상태를 한 번에 해제하는 함수
+# - DELETE FROM dones WHERE id IN (하위 트리의 id들) 한 문장으로 처리합니다.
+# -----------------------------------------------------------------
+async def delete_done_subtree(db: AsyncSession, root: task_model.Task) -> None:
+    result: Result = await db.execute(
+        delete(task_model.Done)
+        .where(
+            task_model.Done.id.in_(
+                select(task_model.Task.id).where(subtree_filter(root))
+            )
+        )
+        .returning(task_model.Done.id)
+    )
+    await outbox.enqueue(db, "task.undone", list(result.scalars().all()))
+    await _set_is_done(db, subtree_filter(root), False)
+    await db.commit()
+
+
+# 조건에 맞는 할 일의 tasks.is_done을 바꿉니다 (이미 같은 값인 행은 건드리지 않음)
+async def _set_is_done(db: AsyncSession, where, value: bool) -> None:
+    await db.execute(
+        update(task_model.Task)
+        .where(where, task_model.Task.is_done != value)
+        .values(is_done=value)
+        .execution_options(synchronize_session=False)
+    )
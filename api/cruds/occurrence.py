@@ -0,0 +1,159 @@
+# -----------------------------------------------------------------
+# 파일명: occurrence.py
+# 위치: api/cruds/occurrence.py
+# 목적: 반복 할 일의 발생(occurrence)을 조회하고, 발생별 상태를 저장합니다.
+# - 발생일은 DB에 미리 만들어 두지 않고, 요청한 기간 안에서만 계산합니다.
+# - 완료하거나 제목을 바꾼 발생만 task_occurrences 테이블에 저장됩니다.
+# - 일반(반복하지 않는) 할 일도 같은 기간에 있으면 함께 날짜순으로 합쳐 돌려줍니다.
+# -----------------------------------------------------------------
+
+import datetime
+import heapq
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.models.task as task_model
+from api.recurrence import occurrences, parse_rule, is_occurrence
+
+
+# -----------------------------------------------------------------
+# 반복 할 일 하나의 발생을 기간 안에서 하나씩 만드는 제너레이터
+# - 저장된 발생 상태(materialized)가 있으면 그 값으로 덮어씁니다.
+# -----------------------------------------------------------------
+def _expand(row, date_from, date_to, materialized) -> Iterator[dict]:
+    rule = parse_rule(row.recurrence)
+    for day in occurrences(rule, row.due_date, date_from, date_to):
+        state = materialized.get((row.id, day))
+        yield {
+            "task_id": row.id,
+            "date": day,
+            "title": state.title if state and state.title is not None else row.title,
+            "done": bool(state and state.done),
+            "recurring": True,
+        }
+
+
+# -----------------------------------------------------------------
+# [1] 기간 [date_from, date_to] 안의 모든 발생을 날짜순으로 돌려주는 함수
+# - 일반 할 일: (due_date, id) 인덱스로 기간 안의 행만 읽습니다.
+# - 반복 할 일: 반복 규칙이 있는 행만 담긴 부분 인덱스로 읽은 뒤 발생일을 계산합니다.
+# - heapq.merge로 여러 제너레이터를 날짜순으로 합칩니다.
+# -----------------------------------------------------------------
+async def list_occurrences(
+    db: AsyncSession, date_from: datetime.date, date_to: datetime.date
+) -> list[dict]:
+    result = await db.execute(
+        select(
+            task_model.Task.id,
+            task_model.Task.title,
+            task_model.Task.due_date,
+            task_model.Done.id.isnot(None).label("done"),
+        )
+        .outerjoin(task_model.Done)
+        .where(
+            task_model.Task.recurrence.is_(None),
+            task_model.Task.due_date.between(date_from, date_to),
+        )
+        .order_by(task_model.Task.due_date, task_model.Task.id)
+    )
+    concrete = [
+        {
+            "task_id": row.id,
+            "date": row.due_date,
+            "title": row.title,
+            "done": row.done,
+            "recurring": False,
+        }
+        for row in result.all()
+    ]
+
+    # 반복 할 일 전체가 완료된 경우(시리즈 종료)는 더 이상 발생시키지 않습니다.
+    result = await db.execute(
+        select(
+            task_model.Task.id,
+            task_model.Task.title,
+            task_model.Task.due_date,
+            task_model.Task.recurrence,
+        )
+        .outerjoin(task_model.Done)
+        .where(
+            task_model.Task.recurrence.isnot(None),
+            task_model.Task.due_date <= date_to,
+            task_model.Done.id.is_(None),
+        )
+    )
+    recurring = result.all()
+
+    materialized = {}
+    if recurring:
+        result = await db.execute(
+            select(task_model.TaskOccurrence).where(
+                task_model.TaskOccurrence.task_id.in_([row.id for row in recurring]),
+                task_model.TaskOccurrence.occurrence_date.between(date_from, date_to),
+            )
+        )
+        materialized = {
+            (state.task_id, state.occurrence_date): state
+            for state in result.scalars().all()
+        }
+
+    merged = heapq.merge(
+        concrete,
+        *(_expand(row, date_from, date_to, materialized) for row in recurring),
+        key=lambda occurrence: (occurrence["date"], occurrence["task_id"]),
+    )
+    return list(merged)
+
+
+# -----------------------------------------------------------------
+# [2] day가 이 반복 할 일의 발생일인지 확인하는 함수
+# -----------------------------------------------------------------
+def is_task_occurrence(task: task_model.Task, day: datetime.date) -> bool:
+    if task.recurrence is None or task.due_date is None:
+        return False
+    return is_occurrence(parse_rule(task.recurrence), task.due_date, day)
+
+
+# -----------------------------------------------------------------
+# [3] 발생 하나의 상태를 저장(생성 또는 수정)하는 함수
+# - done, title 중 None이 아닌 값만 바꿉니다.
+# - 바꾼 뒤 아무 상태도 남지 않으면(미완료 + 제목 그대로) 행을 지워
+#   다시 "계산만 되는" 발생으로 되돌립니다.
+# -----------------------------------------------------------------
+async def update_occurrence(
+    db: AsyncSession,
+    task: task_model.Task,
+    day: datetime.date,
+    done: bool | None = None,
+    title: str | None = None,
+) -> dict:
+    state = await db.get(task_model.TaskOccurrence, (task.id, day))
+    if state is None:
+        state = task_model.TaskOccurrence(
+            task_id=task.id, occurrence_date=day, done=False
+        )
+        db.add(state)
+
+    if done is not None:
+        state.done = done
+    if title is not None:
+        state.title = title
+
+    occurrence = {
+        "task_id": task.id,
+        "date": day,
+        "title": state.title if state.title is not None else task.title,
+        "done": state.done,
+        "recurring": True,
+    }
+
+    if not state.done and state.title is None:
+        if state in db.new:
+            db.expunge(state)
+        else:
+            await db.delete(state)
+
+    await db.commit()
+    return occurrence
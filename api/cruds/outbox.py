@@ -0,0 +1,87 @@
+# -----------------------------------------------------------------
+# 파일명: outbox.py
+# 위치: api/cruds/outbox.py
+# 목적: 웹훅 알림 보관함(outbox_events)에서 보낼 행을 가져오고,
+#       보낸 결과(성공/실패)를 저장합니다.
+# - 알림을 쌓는 쪽(enqueue)과 실제 전송(dispatcher)은 api/outbox.py에 있습니다.
+#
+# [동시성 처리]
+# - 가져간 행은 next_attempt_at을 "지금 + lease"로 미뤄 둡니다.
+#   보내는 도중 dispatcher가 죽어도 lease가 지나면 다시 가져갈 수 있습니다.
+# - PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED 로 여러 dispatcher가
+#   서로 기다리지 않고 다른 행을 가져갑니다.
+# -----------------------------------------------------------------
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.models.task as task_model
+
+
+# -----------------------------------------------------------------
+# [1] 보낼 차례가 된 행을 최대 batch_size개 가져오는 함수
+# - 반환값: (id, endpoint, payload, attempts) 행 리스트 (오래된 것부터)
+#   (commit 뒤 세션을 닫아도 쓸 수 있도록 ORM 객체 대신 값만 돌려줌)
+# -----------------------------------------------------------------
+async def claim_batch(
+    db: AsyncSession, now: datetime, batch_size: int, lease_seconds: float
+) -> list[Row]:
+    query = (
+        select(
+            task_model.OutboxEvent.id,
+            task_model.OutboxEvent.endpoint,
+            task_model.OutboxEvent.payload,
+            task_model.OutboxEvent.attempts,
+        )
+        .where(
+            task_model.OutboxEvent.status == "pending",
+            task_model.OutboxEvent.next_attempt_at <= now,
+        )
+        .order_by(task_model.OutboxEvent.next_attempt_at, task_model.OutboxEvent.id)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+
+    events = list((await db.execute(query)).all())
+    if not events:
+        await db.rollback()
+        return []
+
+    await db.execute(
+        update(task_model.OutboxEvent)
+        .where(task_model.OutboxEvent.id.in_([event.id for event in events]))
+        .values(next_attempt_at=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return events
+
+
+# -----------------------------------------------------------------
+# [2] 보내기에 성공한 행을 한 번에 삭제하는 함수
+# -----------------------------------------------------------------
+async def delete_delivered(db: AsyncSession, event_ids: list[int]) -> None:
+    if not event_ids:
+        return
+    await db.execute(
+        delete(task_model.OutboxEvent)
+        .where(task_model.OutboxEvent.id.in_(event_ids))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+# -----------------------------------------------------------------
+# [3] 보내기에 실패한 행의 재시도 정보를 한 번에 저장하는 함수
+# - failures: [{"id", "status", "attempts", "next_attempt_at", "last_error"}, ...]
+#   (기본키로 찾아 UPDATE 하는 bulk update, 한 번의 executemany로 처리됨)
+# -----------------------------------------------------------------
+async def record_failures(db: AsyncSession, failures: list[dict]) -> None:
+    if not failures:
+        return
+    await db.execute(update(task_model.OutboxEvent), failures)
+    await db.commit()
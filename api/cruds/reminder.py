@@ -0,0 +1,34 @@
+# -----------------------------------------------------------------
+# 파일명: reminder.py
+# 위치: api/cruds/reminder.py
+# 목적: 알림 스케줄러(api/reminder.py)가 읽어 갈 "곧 마감인 할 일"을 조회합니다.
+# - 테이블 전체가 아니라 기간 [date_from, date_to] 안의 행만
+#   (due_date, id) 인덱스(ix_tasks_due_date_id)로 읽습니다.
+# -----------------------------------------------------------------
+
+import datetime
+
+from sqlalchemy import exists, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.models.task as task_model
+
+
+# -----------------------------------------------------------------
+# 기간 안에 마감인, 아직 완료되지 않은 일반(반복 아님) 할 일 목록
+# - 반환값: (id, title, due_date) 행 리스트 (마감일, id 순서)
+# -----------------------------------------------------------------
+async def get_upcoming(
+    db: AsyncSession, date_from: datetime.date, date_to: datetime.date
+) -> list[Row]:
+    result = await db.execute(
+        select(task_model.Task.id, task_model.Task.title, task_model.Task.due_date)
+        .where(
+            task_model.Task.due_date.between(date_from, date_to),
+            task_model.Task.recurrence.is_(None),
+            ~exists().where(task_model.Done.id == task_model.Task.id),
+        )
+        .order_by(task_model.Task.due_date, task_model.Task.id)
+    )
+    return list(result.all())
@@ -0,0 +1,109 @@
+# ---------------------------------------------------------
+# 파일명: statements.py
+# 위치: api/cruds/statements.py
+# 이 파일은 자주 실행되는 조회 쿼리(SELECT)를 한 곳에 모아 둔 "쿼리 계층"이다.
+# - get_task, get_done, get_tasks_with_done 처럼 요청마다 실행되는 쿼리는
+#   매번 select(...)를 새로 만들고, 캐시 키를 계산하는 비용이 든다.
+# - 여기서는 쿼리를 모듈이 처음 불러와질 때 "딱 한 번" 만들어 둔다.
+#   값이 바뀌는 부분은 bindparam("이름")으로 비워 두고, 실행할 때 값만 넘긴다.
+# - 쿼리 객체가 항상 같으므로 SQLAlchemy의 캐시 키가 객체에 저장(메모)되고,
+#   컴파일된 SQL도 엔진의 컴파일 캐시(query_cache_size)에서 그대로 재사용된다.
+# - asyncpg 드라이버는 같은 SQL 문자열을 prepared statement로 재사용한다.
+#   (PgBouncer 환경 설정은 api/db.py의 engine_options() 참고)
+#
+# 사용 예:
+#   await db.execute(statements.TASK_BY_ID, {"task_id": 3})
+# ---------------------------------------------------------
+
+from sqlalchemy import bindparam, func, literal, null, select, text
+
+from api.models.task import ArchivedTask, Task, Done
+
+# ---------------------------------------------------------
+# [1] id로 할 일(Task) 하나를 조회하는 쿼리
+# - SELECT ... FROM tasks WHERE tasks.id = :task_id
+# ---------------------------------------------------------
+TASK_BY_ID = select(Task).where(Task.id == bindparam("task_id"))
+
+
+# ---------------------------------------------------------
+# [2] id로 완료 기록(Done) 하나를 조회하는 쿼리
+# - SELECT ... FROM dones WHERE dones.id = :task_id
+# ---------------------------------------------------------
+DONE_BY_ID = select(Done).where(Done.id == bindparam("task_id"))
+
+
+# ---------------------------------------------------------
+# [3] 모든 할 일과 완료 여부를 함께 조회하는 쿼리
+# - tasks LEFT OUTER JOIN dones
+# - 파라미터가 없으므로 한 번 컴파일된 SQL이 그대로 재사용된다.
+# ---------------------------------------------------------
+TASKS_WITH_DONE = select(
+    Task.id,
+    Task.title,
+    Task.due_date,
+    Task.recurrence,
+    Task.priority,
+    Done.id.isnot(None).label("done"),
+).outerjoin(Done)
+
+
+# ---------------------------------------------------------
+# [3-1] 보관된 할 일을 [3]과 같은 모양으로 조회하는 쿼리
+# - 보관된 할 일은 모두 완료된 할 일이므로 done은 항상 True
+# - 우선순위는 보관하지 않으므로 0(보통)으로 보여줌
+# - include_archived=true 일 때 [3]과 UNION ALL로 합쳐서 사용한다.
+# ---------------------------------------------------------
+ARCHIVED_TASKS = select(
+    ArchivedTask.id,
+    ArchivedTask.title,
+    ArchivedTask.due_date,
+    null().label("recurrence"),
+    literal(0).label("priority"),
+    literal(True).label("done"),
+)
+
+
+# ---------------------------------------------------------
+# [4] 할 일 개수를 세는 쿼리 (정확한 개수)
+# - SELECT count(*) FROM tasks
+# - PostgreSQL은 테이블 대신 기본키 인덱스만 읽는 index-only scan으로 셀 수 있다.
+# ---------------------------------------------------------
+COUNT_TASKS = select(func.count()).select_from(Task)
+
+# 보관된 할 일 개수 (include_archived=true 일 때 더함)
+COUNT_ARCHIVED_TASKS = select(func.count()).select_from(ArchivedTask)
+
+
+# ---------------------------------------------------------
+# [5] 할 일 개수를 추정하는 쿼리 (PostgreSQL 전용)
+# - 통계 정보(pg_class.reltuples)를 읽기만 하므로 테이블 크기와 상관없이 즉시 끝난다.
+# - VACUUM/ANALYZE 시점의 값이라 실제 개수와 조금 다를 수 있다.
+# - 한 번도 ANALYZE 되지 않은 테이블은 -1을 돌려준다.
+# ---------------------------------------------------------
+ESTIMATE_TASKS = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'tasks'::regclass"
+)
+
+# 보관된 할 일 개수 추정 (보관 테이블은 계속 커지므로 count(*) 대신 사용)
+ESTIMATE_ARCHIVED_TASKS = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'archived_tasks'::regclass"
+)
+
+
+# ---------------------------------------------------------
+# [6] "다음에 할 일" 상위 limit개를 조회하는 쿼리
+# - 아직 완료되지 않은 일반(반복 아님) 할 일
+# - 마감일이 빠른 순서 (지난 마감일이 먼저 나옴, 마감일 없는 할 일은 맨 뒤)
+#   -> 마감일이 같으면 우선순위가 높은 순서 -> id 순서
+# - ORDER BY가 ix_tasks_next_open 인덱스의 순서와 똑같으므로 (PostgreSQL 기준) 정렬 없이
+#   인덱스 앞에서부터 읽다가 limit개가 차면 멈춘다.
+#   - 완료된 할 일은 tasks.is_done으로 인덱스에서 빠져 있으므로
+#     완료된 할 일이 얼마나 쌓여 있든 limit개만 읽는다.
+# ---------------------------------------------------------
+NEXT_TASKS = (
+    select(Task.id, Task.title, Task.due_date, Task.priority)
+    .where(Task.recurrence.is_(None), ~Task.is_done)
+    .order_by(Task.due_date.asc().nulls_last(), Task.priority.desc(), Task.id)
+    .limit(bindparam("limit"))
+)
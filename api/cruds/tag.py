@@ -0,0 +1,144 @@
+# -----------------------------------------------------------------
+# 파일명: tag.py
+# 위치: api/cruds/tag.py
+# 목적: 할 일에 태그(라벨)를 붙이고, 떼고, 태그로 할 일을 거르는 기능을 정의합니다.
+# - 붙이기/떼기는 여러 할 일 x 여러 태그를 한 번의 INSERT / DELETE로 처리합니다.
+# - 목록 조회 시 태그는 할 일마다 따로 조회하지 않고, 한 번에 모아서 조회합니다.
+# -----------------------------------------------------------------
+
+from sqlalchemy import delete, func, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+import api.models.task as task_model
+
+# IN (...) 목록 하나에 넣을 id 최대 개수
+# - SQLite는 한 쿼리의 바인드 파라미터 개수에 제한이 있으므로 나눠서 조회합니다.
+IN_CHUNK_SIZE = 500
+
+
+# -----------------------------------------------------------------
+# [0] INSERT ... ON CONFLICT DO NOTHING 문장을 만드는 함수
+# - 같은 태그/같은 (할 일, 태그) 쌍을 여러 요청이 동시에 넣어도
+#   UNIQUE/PRIMARY KEY 오류(500) 없이, 이미 있는 행은 DB가 건너뜁니다.
+# - PostgreSQL과 테스트용 SQLite 모두 같은 문법을 지원합니다.
+# -----------------------------------------------------------------
+def insert_ignore(db: AsyncSession, table):
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return sqlite.insert(table).on_conflict_do_nothing()
+
+
+# -----------------------------------------------------------------
+# [1] 태그 이름 목록을 받아 {이름: id} 사전을 돌려주는 함수
+# - 아직 없는 태그는 한 번의 INSERT로 새로 만들고(이미 있으면 건너뜀),
+#   다시 한 번 조회해서 다른 요청이 만든 태그의 id까지 함께 돌려줍니다.
+# -----------------------------------------------------------------
+async def get_or_create_tags(db: AsyncSession, names: list[str]) -> dict[str, int]:
+    names = sorted(set(names))
+    await db.execute(
+        insert_ignore(db, task_model.Tag), [{"name": name} for name in names]
+    )
+    result = await db.execute(
+        select(task_model.Tag.name, task_model.Tag.id).where(
+            task_model.Tag.name.in_(names)
+        )
+    )
+    return dict(result.all())
+
+
+# -----------------------------------------------------------------
+# [2] 여러 할 일에 여러 태그를 한 번에 붙이는 함수
+# - INSERT INTO task_tags SELECT (할 일 x 태그) ON CONFLICT DO NOTHING 한 문장
+# - 이미 붙어 있는 쌍과 존재하지 않는 할 일은 건너뜁니다.
+# - 반환값: 새로 붙은 (할 일, 태그) 쌍마다 그 할 일 번호 (RETURNING, 쌍의 개수 = 길이)
+# -----------------------------------------------------------------
+async def attach_tags(
+    db: AsyncSession, task_ids: list[int], names: list[str]
+) -> list[int]:
+    tag_ids = await get_or_create_tags(db, names)
+
+    pairs = (
+        select(task_model.Task.id, task_model.Tag.id)
+        .join(task_model.Tag, true())
+        .where(
+            task_model.Task.id.in_(set(task_ids)),
+            task_model.Tag.id.in_(tag_ids.values()),
+        )
+    )
+    result = await db.execute(
+        insert_ignore(db, task_model.TaskTag)
+        .from_select([task_model.TaskTag.task_id, task_model.TaskTag.tag_id], pairs)
+        .returning(task_model.TaskTag.task_id)
+    )
+    attached = list(result.scalars().all())
+
+    await db.commit()
+    return attached
+
+
+# -----------------------------------------------------------------
+# [3] 여러 할 일에서 여러 태그를 한 번에 떼는 함수
+# - DELETE FROM task_tags WHERE task_id IN (...) AND tag_id IN (...) 한 문장
+# - 반환값: 떨어진 (할 일, 태그) 쌍마다 그 할 일 번호 (RETURNING, 쌍의 개수 = 길이)
+# -----------------------------------------------------------------
+async def detach_tags(
+    db: AsyncSession, task_ids: list[int], names: list[str]
+) -> list[int]:
+    result = await db.execute(
+        delete(task_model.TaskTag)
+        .where(
+            task_model.TaskTag.task_id.in_(set(task_ids)),
+            task_model.TaskTag.tag_id.in_(
+                select(task_model.Tag.id).where(task_model.Tag.name.in_(set(names)))
+            ),
+        )
+        .returning(task_model.TaskTag.task_id)
+    )
+    detached = list(result.scalars().all())
+    await db.commit()
+    return detached
+
+
+# -----------------------------------------------------------------
+# [4] 여러 할 일의 태그를 한 번에 조회하는 함수
+# - 반환값: {할 일 id: [태그 이름, ...]}
+# - 할 일 개수와 상관없이 (IN_CHUNK_SIZE개마다) 한 번의 쿼리로 조회합니다.
+# -----------------------------------------------------------------
+async def get_tags_for_tasks(
+    db: AsyncSession, task_ids: list[int]
+) -> dict[int, list[str]]:
+    tags: dict[int, list[str]] = {}
+    for start in range(0, len(task_ids), IN_CHUNK_SIZE):
+        result = await db.execute(
+            select(task_model.TaskTag.task_id, task_model.Tag.name)
+            .join(task_model.Tag)
+            .where(
+                task_model.TaskTag.task_id.in_(task_ids[start : start + IN_CHUNK_SIZE])
+            )
+            .order_by(task_model.TaskTag.task_id, task_model.Tag.name)
+        )
+        for task_id, name in result.all():
+            tags.setdefault(task_id, []).append(name)
+    return tags
+
+
+# -----------------------------------------------------------------
+# [5] 태그로 할 일을 거르는 WHERE 조건을 만드는 함수
+# - match="all": 모든 태그가 붙은 할 일만 (AND)
+# - match="any": 태그 중 하나라도 붙은 할 일 (OR)
+# - (tag_id, task_id) 인덱스만 읽어서 할 일 id 목록을 만듭니다.
+# -----------------------------------------------------------------
+def tag_filter(names: list[str], match: str = "all") -> ColumnElement[bool]:
+    names = sorted(set(names))
+    tagged = (
+        select(task_model.TaskTag.task_id)
+        .join(task_model.Tag)
+        .where(task_model.Tag.name.in_(names))
+    )
+    if match == "all":
+        tagged = tagged.group_by(task_model.TaskTag.task_id).having(
+            func.count(task_model.TaskTag.tag_id) == len(names)
+        )
+    return task_model.Task.id.in_(tagged)
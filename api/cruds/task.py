@@ -17,6 +17,9 @@
 #   - FastAPI에서 async def 함수와 함께 사용하며, commit/refresh 같은 작업 앞에는 await를 붙여야 한다.
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# * datetime: 날짜 비교(done_before)에 사용
+import datetime
+
 # * task_model:
 #   - 실제 DB에 저장될 Task 테이블 클래스가 정의되어 있음
 # * task_schema:
@@ -24,12 +27,28 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import api.models.task as task_model
 import api.schemas.task as task_schema
 
-# * select:
-#   - SQLAlchemy에서 SELECT 쿼리를 만들 때 사용
+# * statements:
+#   - 자주 쓰는 조회 쿼리를 미리 캐시해 두는 쿼리 계층 (api/cruds/statements.py)
+import api.cruds.statements as statements
+
+# * tag_crud:
+#   - 태그 필터 조건과 태그 일괄 조회 기능 (api/cruds/tag.py)
+import api.cruds.tag as tag_crud
+
+# * outbox:
+#   - 웹훅으로 보낼 변경 알림을 같은 트랜잭션 안에서 쌓아 두는 기능 (api/outbox.py)
+from api import outbox
+
+# * 여러 할 일을 한 번에 삭제할 때 한 문장(한 트랜잭션)에서 지울 최대 개수
+BULK_DELETE_BATCH_SIZE = 1000
+
 # * Result:
 #   - 쿼리 실행 결과를 담는 객체 (fetchall() 또는 all()로 결과 추출 가능)
-from sqlalchemy import select
+# * delete, update, select, or_, func, literal:
+#   - 여러 행을 한 번에 처리하는 집합(set) 단위 쿼리를 만들 때 사용
+from sqlalchemy import delete, update, select, or_, func, literal, union_all, case
 from sqlalchemy.engine import Result
+from sqlalchemy.sql import ColumnElement
 
 # ----------------------------------------------------------
 # [ 함수: create_task ]
@@ -57,6 +76,15 @@ async def create_task(
     # * DB에 새 Task 객체를 추가함 (add만 해서는 실제 저장되지 않음)
     db.add(task)
 
+    # * flush: commit 전에 INSERT만 먼저 실행해서 자동 생성된 id를 받아옴
+    #   - path(경로)는 자기 id를 포함하므로 id를 알아야 만들 수 있음
+    #   - 같은 트랜잭션 안이므로 commit 전까지는 한 번의 작업으로 처리됨
+    await db.flush()
+    task.path = f"{await _parent_path(db, task.parent_id)}{task.id}/"
+
+    # * 웹훅 알림도 같은 트랜잭션에 저장함 (commit이 실패하면 알림도 함께 취소됨)
+    await outbox.enqueue(db, "task.created", [task.id], task_create.model_dump())
+
     # * 실제 DB에 저장되도록 commit 실행
     # * await: DB 작업이 끝날 때까지 기다렸다가 다음 줄을 실행함
     await db.commit()
@@ -83,8 +111,10 @@ async def create_task(
 async def get_task(db: AsyncSession, task_id: int) -> task_model.Task | None:
     result: Result = await db.execute(
         # * await: DB에 쿼리를 보낸 뒤, 결과가 올 때까지 기다림
-        select(task_model.Task).filter(task_model.Task.id == task_id)
+        statements.TASK_BY_ID,
+        {"task_id": task_id},
         # * SELECT 쿼리: Task 테이블에서 id가 task_id인 항목을 찾음
+        #   (미리 만들어 둔 쿼리에 task_id 값만 넘겨서 실행함)
     )
     return result.scalars().first()
     # * result.scalars(): 결과 중 실제 모델 객체만 추출
@@ -112,9 +142,30 @@ async def update_task(
     original.due_date = task_create.due_date
     # * 새로 추가된 due_date(마감일)도 함께 수정함
 
+    if "priority" in task_create.model_fields_set:
+        original.priority = task_create.priority
+    # * 우선순위는 요청에 보낸 경우에만 바꿈 (보내지 않으면 기존 값 유지)
+
+    if "recurrence" in task_create.model_fields_set:
+        original.recurrence = task_create.recurrence
+    # * 반복 규칙도 요청에 보낸 경우에만 바꿈 (null을 보내면 반복을 끔)
+
+    # * parent_id를 요청에 명시적으로 보낸 경우에만 상위 할 일을 옮김
+    #   (보내지 않으면 기존 위치를 그대로 유지함)
+    if (
+        "parent_id" in task_create.model_fields_set
+        and task_create.parent_id != original.parent_id
+    ):
+        await _move_subtree(db, original, task_create.parent_id)
+
     db.add(original)
     # * 수정된 객체를 세션에 등록 (SQLAlchemy는 상태 변경을 추적함)
 
+    await outbox.enqueue(
+        db, "task.updated", [original.id], task_create.model_dump(exclude_unset=True)
+    )
+    # * 웹훅 알림도 같은 트랜잭션에 저장함
+
     await db.commit()
     # * 실제 DB에 반영함 (비동기이므로 await 필수)
 
@@ -134,19 +185,111 @@ async def update_task(
 # * 함수정의: async def ... -> 비동기 DB 작업을 위해 async 사용
 # * 매개변수:
 #   - db: 비동기 DB 세션 (AsyncSession)
-#   - original: 삭제할 Task 객체 (이미 DB에서 조화된 상태)
-# * 반환값: 없음 (삭제만 수행하고 결과는 따로 반환하지 않음)
-async def delete_task(db: AsyncSession, original: task_model.Task) -> None:
-    # * db.delete(original):
-    #   - DB 세션에서 해당 Task 객체를 삭제 대상으로 표시함
-    #   - 실제로 삭제되는 건 아니고 "삭제 준비됨" 상태가 됨
+#   - task_id: 삭제할 할 일의 번호
+# * 반환값: 삭제된 할 일 번호 목록 (자기 자신 + 모든 하위 할 일, 할 일이 없었으면 빈 목록)
+# * 하위 트리의 번호를 먼저 잠가서(FOR UPDATE) 읽은 뒤, root 한 줄만 지움
+#   - 하위 할 일, 완료 기록, 태그 연결, 발생 상태는 DB의 외래키 ON DELETE CASCADE로 함께 삭제됨
+#   - CASCADE로 지워진 행은 DELETE ... RETURNING에 나오지 않으므로 번호는 미리 읽어 둠
+#     (알림 취소, 감사 로그, outbox가 하위 할 일까지 빠짐없이 처리되도록 함)
+#   - 잠근 동안에는 이 트리 아래로 새 하위 할 일을 만들 수 없어서 (외래키 확인이 기다림)
+#     읽은 번호와 실제로 지워지는 할 일이 같음
+async def delete_task(db: AsyncSession, task_id: int) -> list[int]:
+    return await _delete_where(db, task_model.Task.id == task_id)
+    # * _delete_where 안에서 commit까지 하므로 삭제가 최종적으로 반영됨
 
-    await db.delete(original)
-    # * await: delete 작업이 완료될 때까지 기다림 (비동기 방식으로 처리)
 
+# ----------------------------------------------------------------
+# [ 함수: bulk_delete_tasks ]
+# 여러 할 일을 한 번에 삭제하는 함수
+# - ids: 이 번호들의 할 일을 삭제
+# - done_before: 이 날짜 이전에 완료된 할 일을 삭제
+#   (둘 다 주면 두 조건을 모두 만족하는 할 일만 삭제)
+# - 한 번에 너무 많은 행을 잠그지 않도록 batch_size개씩 나눠서
+#   DELETE 한 문장 + commit을 반복함
+# * 반환값: 실제로 삭제된 할 일 번호 목록 (CASCADE로 함께 지워진 하위 할 일 포함)
+#   (없는 번호, 조건에 맞지 않아 남은 할 일은 제외)
+# ----------------------------------------------------------------
+async def bulk_delete_tasks(
+    db: AsyncSession,
+    ids: list[int] | None = None,
+    done_before: datetime.date | None = None,
+    batch_size: int = BULK_DELETE_BATCH_SIZE,
+) -> list[int]:
+    conditions = []
+    if done_before is not None:
+        cutoff = datetime.datetime.combine(done_before, datetime.time())
+        conditions.append(
+            task_model.Task.id.in_(
+                select(task_model.Done.id).where(task_model.Done.done_at < cutoff)
+            )
+        )
+
+    deleted: list[int] = []
+
+    # * id 목록을 받은 경우: 목록을 batch_size개씩 잘라서 삭제
+    if ids is not None:
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start : start + batch_size]
+            deleted += await _delete_where(
+                db, *conditions, task_model.Task.id.in_(chunk)
+            )
+        return deleted
+
+    # * 조건만 받은 경우: 조건에 맞는 id를 batch_size개씩 골라서 삭제
+    #   (더 지울 것이 없으면 끝)
+    while True:
+        batch = await _delete_where(
+            db,
+            task_model.Task.id.in_(
+                select(task_model.Task.id).where(*conditions).limit(batch_size)
+            ),
+        )
+        if not batch:
+            return deleted
+        deleted += batch
+
+
+# * 조건에 맞는 할 일을 지우고 바로 commit함
+#   (지운 id 목록 반환, CASCADE로 함께 지워지는 하위 할 일 포함)
+#   - delete_task와 같이 조건에 맞는 할 일과 그 하위 트리의 번호를 먼저 잠가서 읽음
+#     (CASCADE로 지워진 행은 DELETE ... RETURNING에 나오지 않음)
+#   - 지운 id 모두의 웹훅 알림을 같은 트랜잭션에 저장함
+async def _delete_where(db: AsyncSession, *where: ColumnElement[bool]) -> list[int]:
+    result: Result = await db.execute(
+        select(task_model.Task.id, task_model.Task.path).where(*where).with_for_update()
+    )
+    roots = result.all()
+    if not roots:
+        await db.commit()
+        return []
+
+    # 다른 root의 하위 트리 안에 있는 root는 그 root의 조건에 이미 포함됨
+    # (경로를 정렬하면 하위 트리의 경로는 상위 경로 바로 뒤에 이어서 나옴)
+    prefixes: list[str] = []
+    for path in sorted(task_path(root) for root in roots):
+        if not prefixes or not path.startswith(prefixes[-1]):
+            prefixes.append(path)
+    result = await db.execute(
+        select(task_model.Task.id)
+        .where(
+            or_(
+                task_model.Task.id.in_([root.id for root in roots]),
+                *(task_model.Task.path.like(f"{prefix}%") for prefix in prefixes),
+            )
+        )
+        .order_by(task_model.Task.id)
+        .with_for_update()
+    )
+    deleted = list(result.scalars().all())
+
+    await db.execute(
+        delete(task_model.Task)
+        .where(task_model.Task.id.in_([root.id for root in roots]))
+        .execution_options(synchronize_session=False)
+    )
+    await outbox.enqueue(db, "task.deleted", deleted)
     await db.commit()
-    # * 실제로 DB에서 데이터를 삭제함
-    #   - commit을 해야 삭제가 최종적으로 반영됨
+    return deleted
 
 
 # ----------------------------------------------------------
@@ -156,23 +299,301 @@ async def delete_task(db: AsyncSession, original: task_model.Task) -> None:
 # ----------------------------------------------------------
 
 
-# * 반환값: (id, title, done) 형식의 튜플 리스트
-#   - 예: [(1, "공부하기", True), (2, "청소하기", False), ...]
-async def get_tasks_with_done(db: AsyncSession) -> list[tuple[int, str, bool]]:
+# * 매개변수:
+#   - tags: 이 태그들로 할 일을 거름 (None이면 거르지 않음)
+#   - tag_match: "all"이면 모든 태그가 붙은 할 일, "any"이면 하나라도 붙은 할 일
+#   - limit, offset: 페이지 나누기 (limit이 None이면 전체)
+#   - include_archived: True이면 보관된(archived) 할 일도 함께 조회함
+#     (태그 필터와 함께 쓸 수 없음 -> 라우터에서 400으로 거절함)
+# * 반환값: id, title, due_date, done, tags를 담은 딕셔너리 리스트
+#   - 예: [{"id": 1, "title": "공부하기", ..., "done": True, "tags": ["집"]}, ...]
+async def get_tasks_with_done(
+    db: AsyncSession,
+    tags: list[str] | None = None,
+    tag_match: str = "all",
+    limit: int | None = None,
+    offset: int = 0,
+    include_archived: bool = False,
+) -> list[dict]:
+    stmt = statements.TASKS_WITH_DONE
+    # * SELECT id, title, due_date, (dones.id IS NOT NULL) AS done
+    #   FROM tasks LEFT OUTER JOIN dones
+    # * Done 테이블에 이 할 일(Task)의 완료 기록이 있으면 -> True
+    # * Done 테이블에 없으면 -> False (아직 완료 안 된 상태)
+    #   -> 쉽게 말해, '모든 할 일'을 다 불러오고, 그 중에서 완료된 것도 표시하는 방식
+
+    if tags:
+        stmt = stmt.where(tag_crud.tag_filter(tags, tag_match))
+        # * 태그 필터: task_tags의 (tag_id, task_id) 인덱스로 할 일 id를 먼저 고름
+
+    order_by = task_model.Task.id
+    if include_archived and not tags:
+        combined = union_all(stmt, statements.ARCHIVED_TASKS).subquery()
+        stmt, order_by = select(combined), combined.c.id
+        # * 진행 중인 할 일 + 보관된 할 일을 UNION ALL로 합침 (보관 테이블은 이때만 읽음)
+
+    if limit is not None or offset:
+        stmt = stmt.order_by(order_by).limit(limit).offset(offset)
+        # * 페이지를 나눌 때는 id 순서로 정렬해야 페이지가 겹치거나 빠지지 않음
+
+    result: Result = await db.execute(stmt)
+    rows = result.all()
+
+    # * 태그는 할 일마다 따로 조회하지 않고, 이번 결과의 id들로 한 번에 조회함
+    task_tags = await tag_crud.get_tags_for_tasks(db, [row.id for row in rows])
+
+    return [{**row._mapping, "tags": task_tags.get(row.id, [])} for row in rows]
+    # 쿼리 결과를 리스트로 반환함
+
+
+# ----------------------------------------------------------
+# [ 함수: count_tasks ]
+# 할 일 개수를 세는 함수 (목록 옆에 "N개"를 보여줄 때 사용)
+# - mode="exact": count(*)로 정확하게 셈 (태그 필터도 적용됨)
+# - mode="estimated": PostgreSQL 통계(pg_class.reltuples)로 즉시 추정함
+#   - 필터가 있거나, 통계가 없거나, SQLite이면 정확한 개수로 대신함
+# ----------------------------------------------------------
+# - include_archived=True이면 보관된 할 일 개수도 더함
+#   (estimated이면 보관 테이블도 통계로 추정함)
+async def count_tasks(
+    db: AsyncSession,
+    mode: str = "exact",
+    tags: list[str] | None = None,
+    tag_match: str = "all",
+    include_archived: bool = False,
+) -> int:
+    estimated = (
+        mode == "estimated" and not tags and db.get_bind().dialect.name == "postgresql"
+    )
+
+    archived = 0
+    if include_archived and not tags:
+        if estimated:
+            archived = await _estimate(
+                db, statements.ESTIMATE_ARCHIVED_TASKS, statements.COUNT_ARCHIVED_TASKS
+            )
+        else:
+            archived = (await db.execute(statements.COUNT_ARCHIVED_TASKS)).scalar_one()
+
+    if estimated:
+        return (
+            await _estimate(db, statements.ESTIMATE_TASKS, statements.COUNT_TASKS)
+            + archived
+        )
+
+    stmt = statements.COUNT_TASKS
+    if tags:
+        stmt = stmt.where(tag_crud.tag_filter(tags, tag_match))
+    return (await db.execute(stmt)).scalar_one() + archived
+
+
+# * 통계로 추정한 개수 (통계가 없거나 음수이면 count_stmt로 정확하게 셈)
+async def _estimate(db: AsyncSession, estimate_stmt, count_stmt) -> int:
+    estimate = (await db.execute(estimate_stmt)).scalar()
+    if estimate is not None and estimate >= 0:
+        return estimate
+    return (await db.execute(count_stmt)).scalar_one()
+
+
+# ----------------------------------------------------------
+# [ 함수: get_calendar ]
+# 기간 [date_from, date_to] 안의 할 일을 마감일(날짜)별로 묶어서 반환하는 함수
+# - (due_date, id) 인덱스로 기간 안의 행만 읽음 (한 달 보기 = 그 달의 행만)
+# - 날짜별 개수/완료 개수는 SQL의 윈도우 함수(count() OVER ...)로 함께 계산함
+# - 반복 할 일은 넣지 않음 (due_date는 첫 발생일일 뿐이라 그날에만 나오면 틀림)
+#   -> 반복 할 일의 발생일은 GET /tasks/occurrences 로 조회
+# * 반환값: [{"date": 날짜, "count": 개수, "done_count": 완료 개수, "tasks": [...]}, ...]
+#   - 할 일이 없는 날짜는 포함하지 않음
+# ----------------------------------------------------------
+async def get_calendar(
+    db: AsyncSession, date_from: datetime.date, date_to: datetime.date
+) -> list[dict]:
+    done = task_model.Done.id.isnot(None)
+    per_day = {"partition_by": task_model.Task.due_date}
     result: Result = await db.execute(
         select(
-            task_model.Task.id,  # 할 일 번호
-            task_model.Task.title,  # 할 일 제목
+            task_model.Task.id,
+            task_model.Task.title,
             task_model.Task.due_date,
-            (task_model.Done.id.isnot(None)).label("done"),
-            # * Done 테이블에 이 할 일(Task)의 완료 기록이 없으면 -> True
-            # * Done 테이블에 없으면 -> False (아직 완료 안 된 상태)
-            # 이건 SQL에서 '외부 조인'이라는 방법을 써서 확인함
-            #   -> 쉽게 말해, '모든 할 일'을 다 불러오고, 그 중에서 완료된 것도 표시하는 방식
-        ).outerjoin(
-            task_model.Done
-        )  # outerjoin: 할 일이 완료됐든 안 됐든 모두 가져오기
+            task_model.Task.recurrence,
+            task_model.Task.priority,
+            done.label("done"),
+            func.count().over(**per_day).label("day_count"),
+            func.sum(case((done, 1), else_=0)).over(**per_day).label("day_done_count"),
+        )
+        .outerjoin(task_model.Done)
+        .where(
+            task_model.Task.due_date.between(date_from, date_to),
+            task_model.Task.recurrence.is_(None),
+        )
+        .order_by(task_model.Task.due_date, task_model.Task.id)
     )
+    rows = result.all()
+    task_tags = await tag_crud.get_tags_for_tasks(db, [row.id for row in rows])
+
+    days: list[dict] = []
+    for row in rows:
+        if not days or days[-1]["date"] != row.due_date:
+            days.append(
+                {
+                    "date": row.due_date,
+                    "count": row.day_count,
+                    "done_count": row.day_done_count,
+                    "tasks": [],
+                }
+            )
+        days[-1]["tasks"].append(
+            {
+                "id": row.id,
+                "title": row.title,
+                "due_date": row.due_date,
+                "recurrence": row.recurrence,
+                "priority": row.priority,
+                "done": row.done,
+                "tags": task_tags.get(row.id, []),
+            }
+        )
+    return days
 
-    return result.all()
-    # 쿼리 결과를 리스트로 반환함
+
+# ----------------------------------------------------------
+# [ 함수: get_next_tasks ]
+# "다음에 할 일" 상위 limit개를 반환하는 함수 (GET /tasks/next)
+# - 아직 완료되지 않은 일반(반복 아님) 할 일을
+#   지난 마감일 -> 가까운 마감일 -> 마감일 없음 순서로, 같은 날이면 우선순위가 높은 순서로
+# - 전체 목록을 정렬하지 않고 ix_tasks_next_open 인덱스 앞에서부터 limit개만 읽음
+#   (statements.NEXT_TASKS 참고)
+# * 반환값: [{"id", "title", "due_date", "priority", "overdue"}, ...]
+# ----------------------------------------------------------
+async def get_next_tasks(
+    db: AsyncSession, today: datetime.date, limit: int
+) -> list[dict]:
+    result: Result = await db.execute(statements.NEXT_TASKS, {"limit": limit})
+    return [
+        {
+            **row._mapping,
+            "overdue": row.due_date is not None and row.due_date < today,
+        }
+        for row in result.all()
+    ]
+
+
+# ----------------------------------------------------------
+# [ 하위 할 일(subtask) 관련 함수들 ]
+# - 할 일은 parent_id로 상위 할 일을 가리키고,
+#   path에 최상위부터의 경로("1/2/3/")를 함께 저장한다 (materialized path).
+# - 하위 트리 전체는 "path LIKE '1/2/%'" 조건 하나로 찾을 수 있으므로
+#   깊이와 상관없이 항상 한 번의 쿼리로 처리된다.
+# ----------------------------------------------------------
+
+
+# * 할 일의 경로 문자열을 반환함
+#   - path가 비어 있는 예전 데이터는 최상위 할 일로 간주함
+def task_path(task: task_model.Task) -> str:
+    return task.path or f"{task.id}/"
+
+
+# * root 자신과 그 아래 모든 하위 할 일을 고르는 WHERE 조건
+def subtree_filter(root: task_model.Task) -> ColumnElement[bool]:
+    return or_(
+        task_model.Task.id == root.id,
+        task_model.Task.path.like(f"{task_path(root)}%"),
+    )
+
+
+# * 상위 할 일의 경로를 조회함 (상위 할 일이 없으면 빈 문자열)
+async def _parent_path(db: AsyncSession, parent_id: int | None) -> str:
+    if parent_id is None:
+        return ""
+    parent = await get_task(db, parent_id)
+    return task_path(parent)
+
+
+# * 할 일을 다른 상위 할 일 아래로 옮김
+#   - 자기 자신의 path를 바꾸고,
+#   - 하위 할 일들의 path 앞부분(old_prefix)을 new_prefix로 한 번에 바꿈 (UPDATE 한 번)
+async def _move_subtree(
+    db: AsyncSession, original: task_model.Task, parent_id: int | None
+) -> None:
+    old_prefix = task_path(original)
+    new_prefix = f"{await _parent_path(db, parent_id)}{original.id}/"
+
+    await db.execute(
+        update(task_model.Task)
+        .where(task_model.Task.path.like(f"{old_prefix}%"))
+        .where(task_model.Task.id != original.id)
+        .values(
+            path=literal(new_prefix)
+            + func.substr(task_model.Task.path, len(old_prefix) + 1)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    original.parent_id = parent_id
+    original.path = new_prefix
+
+
+# * candidate가 root 자신이거나 root의 하위 할 일인지 확인함
+#   - 할 일을 자기 하위 트리 안으로 옮기면 순환이 생기므로 라우터에서 막는 데 사용
+def is_in_subtree(root: task_model.Task, candidate: task_model.Task) -> bool:
+    return candidate.id == root.id or task_path(candidate).startswith(task_path(root))
+
+
+# ----------------------------------------------------------
+# [ 함수: get_subtree ]
+# root 할 일과 그 아래 모든 하위 할 일을 한 번의 쿼리로 불러와
+# 트리(dict) 형태로 만들어 반환하는 함수
+# - 각 노드에는 하위 트리 전체 기준의 집계(rollup)가 포함된다.
+#   total: 자기 자신을 포함한 할 일 개수 / done_count: 그중 완료된 개수
+#   percent_complete: 완료 비율(%)
+# ----------------------------------------------------------
+async def get_subtree(db: AsyncSession, root: task_model.Task) -> dict:
+    result: Result = await db.execute(
+        select(
+            task_model.Task.id,
+            task_model.Task.title,
+            task_model.Task.due_date,
+            task_model.Task.parent_id,
+            task_model.Task.path,
+            task_model.Task.priority,
+            task_model.Done.id.isnot(None).label("done"),
+        )
+        .outerjoin(task_model.Done)
+        .where(subtree_filter(root))
+        .order_by(task_model.Task.id)
+    )
+    return build_subtree(result.all(), root.id)
+
+
+# * 하위 트리의 할 일들(id 순서)을 root_id를 꼭대기로 하는 트리(dict)로 만듦
+#   - 각 행은 id, title, due_date, parent_id, path, priority, done 속성을 가짐
+#   - 메모리 저장소(api/repositories/memory.py)도 같은 함수로 트리를 만듦
+def build_subtree(rows, root_id: int) -> dict:
+    # * id -> 노드(dict) 사전을 만든 뒤, parent_id로 자식 목록에 연결함
+    nodes = {
+        row.id: {
+            "id": row.id,
+            "title": row.title,
+            "due_date": row.due_date,
+            "parent_id": row.parent_id,
+            "priority": row.priority,
+            "done": row.done,
+            "total": 1,
+            "done_count": int(row.done),
+            "children": [],
+        }
+        for row in rows
+    }
+    for node in nodes.values():
+        if node["id"] != root_id and node["parent_id"] in nodes:
+            nodes[node["parent_id"]]["children"].append(node)
+
+    # * 집계는 깊은 노드부터 위로 올려 더함 (path가 길수록 깊은 노드)
+    for row in sorted(rows, key=lambda r: len(r.path or ""), reverse=True):
+        node = nodes[row.id]
+        node["percent_complete"] = round(node["done_count"] * 100 / node["total"], 1)
+        if row.id != root_id and row.parent_id in nodes:
+            nodes[row.parent_id]["total"] += node["total"]
+            nodes[row.parent_id]["done_count"] += node["done_count"]
+
+    return nodes[root_id]
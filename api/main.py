@@ -6,17 +6,103 @@
 # FastAPI 앱을 만들기 위한 도구를 불러온다.
 from fastapi import FastAPI
 
+# 앱이 켜지고 꺼질 때 백그라운드 작업을 시작/정리하기 위한 도구
+import asyncio
+from contextlib import asynccontextmanager
+
+# 백그라운드 작업에서 사용할 DB 세션 생성기와 보관(archive) 작업
+from api.db import db_session
+from api import archiver
+
+# 변경 이력(감사 로그)을 모아서 저장하는 큐
+from api.audit import audit_queue
+
+# 마감 알림 스케줄러
+from api import reminder
+
+# 할 일 변경을 웹훅으로 보내는 outbox dispatcher
+from api import outbox
+
+# 할 일 저장소 설정 (REPO_BACKEND=sql 또는 memory)
+from api import repositories
+
+# 같은 조회 요청이 동시에 들어오면 한 번만 처리하는 미들웨어
+from api.coalesce import CoalesceMiddleware
+
+# 큰 응답을 gzip / br / zstd로 압축하는 미들웨어
+from api.compression import CompressionMiddleware
+
 # 우리가 만든 기능 코드들을 불러온다.
 # task -> 할 일 만들기, 수정, 삭제
 # done -> 완료 표시와 취소
-from api.routers import task, done
+# tag -> 여러 할 일에 태그 붙이기/떼기
+# claim -> 작업 큐: 다음 할 일 점유, 기한 연장, 반납
+# occurrence -> 반복 할 일의 날짜별 발생 조회와 완료 처리
+# audit -> 할 일별 변경 이력 조회
+# metrics -> 앱 내부 메트릭 조회
+from api.routers import task, done, tag, claim, occurrence, audit, metrics
 
 # 보충 설명:
 # 'api/routers/task.py', 'api/routers/done.py' 파일을 불러온 것이다.
 # 기능별로 파일을 나눠서 코드가 복잡하지 않도록 관리하는 방식이다.
 
+
+# ---------------------------------------------------------------
+# lifespan: 앱이 시작될 때 백그라운드 작업을 켜고, 종료될 때 정리한다.
+# - yield 앞: 앱 시작 시 실행 / yield 뒤: 앱 종료 시 실행
+# - 보관(archive) 작업은 ARCHIVE_AFTER_DAYS 환경 변수를 설정했을 때만 켜진다.
+# - 감사 로그 저장 작업은 항상 켜지고, 종료할 때 큐에 남은 이벤트를 모두 저장한 뒤 끝난다.
+# - 마감 알림은 REMINDER_SINKS 환경 변수로 전달 방법을 정했을 때만 켜진다.
+# - 웹훅 전송은 WEBHOOK_URLS 환경 변수를 설정했을 때만 켜진다.
+# - 메모리 저장소(REPO_BACKEND=memory)는 DB가 없으므로 위 작업을 모두 끄고,
+#   종료할 때 스냅샷만 저장한다.
+# ---------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if repositories.REPO_BACKEND == "memory":
+        audit_queue.enabled = False
+        yield
+        repositories.memory_repository().close()
+        return
+
+    audit_writer = asyncio.create_task(audit_queue.run(db_session))
+    background = []
+    if reminder.scheduler.sinks:
+        background.append(asyncio.create_task(reminder.scheduler.run(db_session)))
+    if outbox.WEBHOOK_URLS:
+        background.append(
+            asyncio.create_task(outbox.OutboxDispatcher(db_session).run())
+        )
+    if archiver.ARCHIVE_AFTER_DAYS is not None:
+        background.append(
+            asyncio.create_task(
+                archiver.run_archiver(db_session, archiver.ARCHIVE_AFTER_DAYS)
+            )
+        )
+
+    yield
+
+    for job in background:
+        job.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+
+    audit_queue.stop()
+    await audit_writer
+
+
 # FastAPI 앱을 만든다. 이앱이 웹 서버의 본체가 된다.
-app = FastAPI()
+# - lifespan: 위에서 정의한 시작/종료 처리를 연결함
+app = FastAPI(lifespan=lifespan)
+
+# 같은 GET 요청(주소 + 쿼리 + 요청자)이 동시에 여러 개 오면 한 번만 조회하고
+# 응답을 나눠 준다. (COALESCE_PATHS, COALESCE_SCOPE_HEADERS 환경 변수로 설정)
+# - COALESCE_PATHS를 설정한 주소만 묶는다. (기본값: 꺼짐, api/coalesce.py의 [주의] 참고)
+app.add_middleware(CoalesceMiddleware)
+
+# Accept-Encoding에 맞춰 큰 응답을 압축한다. (COMPRESSION_MIN_SIZE 등 환경 변수로 설정)
+# - 나중에 추가한 미들웨어가 바깥쪽에서 실행되므로, 묶인 요청들은 압축 전 응답을 나눠 받고
+#   각자의 Accept-Encoding에 맞게 따로 압축된다.
+app.add_middleware(CompressionMiddleware)
 
 # 수업 흐름 연결 설명:
 # 우리가 만든 여러 기능을 'router'라는 방식으로 모아서 관리했는데,
@@ -30,6 +116,29 @@ app.include_router(task.router)
 # 예: /tasks/3/done 주소에서 할 일을 완료 처리하거나 완료 취소하는 기능
 app.include_router(done.router)
 
+# 기능 설명: tag 기능들을 앱에 연결한다
+# 예: /tasks/tags/attach 주소로 여러 할 일에 태그를 한 번에 붙이는 기능
+app.include_router(tag.router)
+
+# 아래 세 기능은 DB에서만 동작하므로 SQL 저장소일 때만 연결한다.
+# - 메모리 저장소(REPO_BACKEND=memory)에서는 이 주소들이 없다. (404)
+if repositories.REPO_BACKEND == "sql":
+    # 기능 설명: claim 기능들을 앱에 연결한다
+    # 예: POST /tasks/claim 으로 작업자가 다음 할 일을 하나 가져가는 기능
+    app.include_router(claim.router)
+
+    # 기능 설명: occurrence 기능들을 앱에 연결한다
+    # 예: /tasks/occurrences?from=2025-05-01&to=2025-05-31 로 한 달 동안의 반복 할 일 보기
+    app.include_router(occurrence.router)
+
+    # 기능 설명: audit 기능들을 앱에 연결한다
+    # 예: GET /tasks/3/history 로 3번 할 일을 누가 언제 바꿨는지 보기
+    app.include_router(audit.router)
+
+# 기능 설명: metrics 기능들을 앱에 연결한다
+# 예: GET /metrics 로 감사 로그 큐 길이, 버린 이벤트 수 등을 보기
+app.include_router(metrics.router)
+
 # 보충 설명:
 # include_router는 말 그대로 기능(router)을 앱(app)에 포함시킨다는 뜻이다.
 # 기능을 각각 파일에 나눠 만든 후, 이 main.py에서 전부 연결해줘야 FastAPI 서버가 완성된다.
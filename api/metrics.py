@@ -0,0 +1,42 @@
+# ---------------------------------------------------------
+# 파일명: metrics.py
+# 위치: api/metrics.py
+# 이 파일은 앱 내부 상태를 숫자로 모아 두는 간단한 메트릭 저장소이다.
+# - counter: 계속 늘어나기만 하는 값 (예: 처리한 이벤트 수)
+# - gauge: 현재 상태를 나타내는 값 (예: 큐에 쌓인 이벤트 수)
+# - GET /metrics 로 현재 값을 JSON으로 볼 수 있다. (api/routers/metrics.py)
+#
+# 사용 예:
+#   metrics.inc("audit_events_total")
+#   metrics.set_gauge("audit_queue_depth", 3)
+#   metrics.register_gauge("audit_queue_depth", lambda: queue.qsize())
+# ---------------------------------------------------------
+
+from collections import defaultdict
+from typing import Callable
+
+_counters: dict[str, float] = defaultdict(float)
+_gauges: dict[str, float] = {}
+_gauge_functions: dict[str, Callable[[], float]] = {}
+
+
+# counter 값을 value만큼 늘린다
+def inc(name: str, value: float = 1) -> None:
+    _counters[name] += value
+
+
+# gauge 값을 직접 설정한다
+def set_gauge(name: str, value: float) -> None:
+    _gauges[name] = value
+
+
+# 조회할 때마다 함수를 호출해서 값을 읽는 gauge를 등록한다
+def register_gauge(name: str, function: Callable[[], float]) -> None:
+    _gauge_functions[name] = function
+
+
+# 현재 모든 메트릭 값을 {이름: 값} 사전으로 돌려준다
+def snapshot() -> dict[str, float]:
+    values = {**_counters, **_gauges}
+    values.update({name: function() for name, function in _gauge_functions.items()})
+    return dict(sorted(values.items()))
@@ -1,19 +1,36 @@
 # ---------------------------------------------------------
 # 파일명: task,py
 # 위치: api/models/task.py
-# 이 파일은 데이터베이스의 'tasks'와 'dones' 테이블에
-# 대응되는 SQLAlchemy 모델 클래스(Task, Done)를 정의한다.
+# 이 파일은 데이터베이스의 'tasks'와 'dones' 테이블,
+# 그리고 할 일에 딸린 테이블(태그, 반복 발생 상태 등)에
+# 대응되는 SQLAlchemy 모델 클래스(Task, Done, ...)를 정의한다.
 # ---------------------------------------------------------
 
 # ---------------------------------------------------------
 # SQLAlchemy에서 테이블을 정의할 때 필요한 기능들을 불러온다
 # ---------------------------------------------------------
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Integer,
+    String,
+    ForeignKey,
+    Date,
+    DateTime,
+    Index,
+    Text,
+    text,
+)
 
 # Column:테이블의 각 열(컬럼)을 정의할 때 사용
 # Integer: 정수형 데이터 타입 (예: ID)
 # String: 문자열 데이터 타입 (예: 제목)
 # ForeignKey: 다른 테이블의 값을 참조할 때 사용 (외래키 설정)
+# Index: 검색을 빠르게 하기 위한 인덱스를 정의할 때 사용
+# DateTime: 날짜+시각 데이터 타입 (예: 작업 점유 만료 시각)
+# Boolean: 참/거짓 데이터 타입
+# Text: 길이 제한이 없는 문자열 (예: 변경 내용 JSON)
+# text: 부분 인덱스 조건처럼 SQL 문장을 그대로 쓸 때 사용
 
 from sqlalchemy.orm import relationship
 
@@ -21,6 +38,7 @@ from sqlalchemy.orm import relationship
 # 예: Task와 Done이 서로 연결되도록 설정할 수 있음
 
 from api.db import Base  # SQLAlchemy에서 사용하는 모델의 기반 클래스
+from api.db import utcnow  # DB에 저장할 현재 시각(UTC)
 
 
 # ---------------------------------------------------------
@@ -44,10 +62,92 @@ class Task(Base):
     # * SQLAlchemy: Date
     # * PostgreSQL: DATE 형식
 
-    done = relationship("Done", back_populates="task", cascade="all, delete")
+    parent_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+    # -> DB 컬럼: tasks.parent_id (외래키: tasks.id, 자기 자신을 참조)
+    # * 상위 할 일(프로젝트)의 번호. 최상위 할 일이면 None
+    # * 예: 프로젝트(1) -> 단계(2) -> 세부 단계(3)
+
+    path = Column(String(255), nullable=True)
+    # -> DB 컬럼: tasks.path (경로 구체화, materialized path)
+    # * 최상위부터 자기 자신까지의 id를 "/"로 이어 붙인 문자열
+    # * 예: 1번 아래 2번 아래 3번이면 3번의 path = "1/2/3/"
+    # * 하위 트리 전체를 "path LIKE '1/2/%'" 한 번의 쿼리로 찾을 수 있음
+
+    recurrence = Column(String(255), nullable=True)
+    # -> DB 컬럼: tasks.recurrence
+    # * 반복 규칙 (RRULE 형식, 예: "FREQ=WEEKLY;BYDAY=MO" -> 매주 월요일)
+    # * due_date가 첫 발생일(시작일)이 됨
+    # * 반복되는 날마다 행을 만들지 않고, 조회할 때 기간 안의 발생일만 계산함
+    #   (api/recurrence.py 참고)
+
+    priority = Column(Integer, nullable=False, default=0, server_default="0")
+    # -> DB 컬럼: tasks.priority
+    # * 우선순위 (0: 보통 ~ 9: 가장 중요), 마감일이 같으면 큰 값이 먼저 나옴
+    # * GET /tasks/next 에서 "다음에 할 일" 순서를 정할 때 사용
+
+    is_done = Column(Boolean, nullable=False, default=False, server_default="false")
+    # -> DB 컬럼: tasks.is_done
+    # * 완료 여부를 tasks에도 함께 적어 둔 값 (dones에 행이 있으면 True)
+    # * "다음에 할 일" 인덱스(ix_tasks_next_open)에서 완료된 할 일을 빼기 위해 사용
+    #   (부분 인덱스의 조건에는 다른 테이블(dones)을 쓸 수 없음)
+    # * dones를 바꾸는 함수(api/cruds/done.py)가 같은 트랜잭션에서 함께 바꿈
+
+    claimed_by = Column(String(255), nullable=True)
+    # -> DB 컬럼: tasks.claimed_by
+    # * 작업 큐에서 이 할 일을 가져간(점유한) 작업자 이름. 아무도 없으면 None
+
+    lease_expires_at = Column(DateTime, nullable=True)
+    # -> DB 컬럼: tasks.lease_expires_at (UTC 기준)
+    # * 점유(lease)가 끝나는 시각. 이 시각이 지나면 다른 작업자가 다시 가져갈 수 있음
+    # * 작업자는 heartbeat로 이 시각을 계속 늘려야 함
+
+    done = relationship(
+        "Done", back_populates="task", cascade="all, delete", passive_deletes=True
+    )
     # Task <-> Done: 1:1 관계
     # done: 연결된 Done 객체 (완료 여부)를 참조함
     # cascade="all, delete"->Task삭제 시 연결된 Done도 함께 삭제됨
+    # passive_deletes=True -> Done을 따로 불러와서 지우지 않고,
+    #   DB의 ON DELETE CASCADE에 맡김 (DELETE 한 문장으로 끝남)
+
+    __table_args__ = (
+        Index(
+            "ix_tasks_path",
+            "path",
+            # PostgreSQL에서 LIKE 'prefix%' 검색에 인덱스를 쓰려면 pattern_ops가 필요함
+            postgresql_ops={"path": "varchar_pattern_ops"},
+        ),
+        # 작업 큐에서 "마감일이 가장 빠른 할 일"을 인덱스 순서대로 바로 찾기 위한 인덱스
+        Index("ix_tasks_due_date_id", "due_date", "id"),
+        # 반복 할 일만 모아 둔 부분 인덱스 (반복 규칙이 있는 행만 들어감)
+        Index(
+            "ix_tasks_recurring_due_date",
+            "due_date",
+            postgresql_where=text("recurrence IS NOT NULL"),
+            sqlite_where=text("recurrence IS NOT NULL"),
+        ),
+        # "다음에 할 일" 순서(마감일 -> 우선순위 높은 순 -> id)와 똑같이 정렬된 인덱스
+        # - GET /tasks/next 의 ORDER BY와 컬럼/방향이 같아서 정렬 없이 앞에서부터 limit개만 읽음
+        # - 반복 할 일과 완료된 할 일은 대상이 아니므로 완료되지 않은 일반 할 일만 넣은
+        #   부분 인덱스 (완료된 할 일이 아무리 많아도 인덱스 앞부분에 쌓이지 않음)
+        # - PostgreSQL은 title도 인덱스에 함께 담아(INCLUDE) 테이블을 읽지 않음 (index-only scan)
+        # - 조건은 NEXT_TASKS의 WHERE가 DB별로 바뀌는 모양과 글자 그대로 같아야 인덱스를 씀
+        #   (~Task.is_done -> PostgreSQL: NOT is_done / SQLite: is_done = 0)
+        Index(
+            "ix_tasks_next_open",
+            "due_date",
+            text("priority DESC"),
+            "id",
+            postgresql_include=["title"],
+            postgresql_where=text("recurrence IS NULL AND NOT is_done"),
+            sqlite_where=text("recurrence IS NULL AND is_done = 0"),
+        ),
+        # SQLite도 삭제(보관)된 id를 다시 쓰지 않도록 함
+        # (보관 테이블의 id와 겹치지 않게 하기 위함, PostgreSQL은 원래 재사용하지 않음)
+        {"sqlite_autoincrement": True},
+    )
 
 
 # ---------------------------------------------------------
@@ -56,13 +156,184 @@ class Task(Base):
 class Done(Base):
     __tablename__ = "dones"  # 이 클래스는 'dones' 테이블과 연결됨
 
-    id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
-    # -> DB 컬럼: dones.id (외래키: tasks.id)
+    id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    # -> DB 컬럼: dones.id (외래키: tasks.id, ON DELETE CASCADE)
+    # * 할 일이 삭제되면 DB가 완료 기록도 함께 삭제함
     # SQLAlchemy: Integer + Foreignkey + primary_key=True
     # postgreSQL: INTEGER + FOREIGN KEY + PRIMARY KEY
     # 1:1 관계 유지: dones.id = tasks.id 인 상태
     # 완료된 작업만 이 테이블에 기록됨
 
+    done_at = Column(DateTime, nullable=False, default=utcnow, index=True)
+    # -> DB 컬럼: dones.done_at (UTC 기준)
+    # * 완료 처리한 시각. 오래전에 완료된 할 일을 보관(archive)할 때 기준이 됨
+
     task = relationship("Task", back_populates="done")
     # 연결된 Task 객체를 참조할 수 있음
     # task: Done-> Task 방향 참조
+
+
+# ---------------------------------------------------------
+# [3] Tag 모델 -> tags 테이블과 매핑됨
+# - 할 일에 붙이는 라벨(예: "집", "회사", "급함")
+# - 같은 이름의 태그는 하나만 존재함 (unique)
+# ---------------------------------------------------------
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+
+    name = Column(String(64), nullable=False, unique=True)
+    # -> DB 컬럼: tags.name (중복 불가, 자동으로 인덱스가 생성됨)
+
+
+# ---------------------------------------------------------
+# [4] TaskTag 모델 -> task_tags 테이블과 매핑됨
+# - Task <-> Tag: 다대다(N:M) 관계를 이어 주는 연결 테이블
+# - 기본키 (task_id, tag_id): "이 할 일에 붙은 태그" 조회에 사용
+# - 인덱스 (tag_id, task_id): "이 태그가 붙은 할 일" 필터에 사용
+#   -> 두 방향 모두 인덱스만 읽고 답할 수 있음
+# ---------------------------------------------------------
+class TaskTag(Base):
+    __tablename__ = "task_tags"
+
+    task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag_id = Column(
+        Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    __table_args__ = (Index("ix_task_tags_tag_id_task_id", "tag_id", "task_id"),)
+
+
+# ---------------------------------------------------------
+# [5] TaskOccurrence 모델 -> task_occurrences 테이블과 매핑됨
+# - 반복 할 일의 "특정 날짜 한 번"에 대한 상태를 저장함
+# - 모든 발생일을 저장하지 않고, 상태가 생긴 발생일만 저장함
+#   (완료했거나, 그날만 제목을 바꾼 경우)
+# - 기본키 (task_id, occurrence_date)
+# ---------------------------------------------------------
+class TaskOccurrence(Base):
+    __tablename__ = "task_occurrences"
+
+    task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    occurrence_date = Column(Date, primary_key=True)
+    # -> 어떤 날짜의 발생인지
+
+    title = Column(String(1024), nullable=True)
+    # -> 이 날짜에만 적용되는 제목 (None이면 반복 할 일의 제목을 그대로 사용)
+
+    done = Column(Boolean, nullable=False, default=False)
+    # -> 이 날짜의 발생을 완료했는지 여부 (반복 할 일 전체의 완료와는 별개)
+
+
+# ---------------------------------------------------------
+# [6] ArchivedTask 모델 -> archived_tasks 테이블과 매핑됨
+# - 완료된 지 오래된 할 일을 tasks/dones에서 옮겨 보관하는 테이블
+#   (api/archiver.py가 백그라운드에서 조금씩 옮김)
+# - tasks 테이블을 작게 유지해서 목록 조회와 인덱스가 "진행 중인 할 일"
+#   개수에만 비례하도록 하기 위함
+# - 보관된 할 일은 모두 완료된 할 일이다.
+# ---------------------------------------------------------
+class ArchivedTask(Base):
+    __tablename__ = "archived_tasks"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    # -> 원래 tasks.id를 그대로 사용함
+
+    title = Column(String(1024))
+    due_date = Column(Date)
+    parent_id = Column(Integer, nullable=True)
+    path = Column(String(255), nullable=True)
+
+    done_at = Column(DateTime, nullable=False)
+    # -> 원래 dones.done_at (완료한 시각)
+
+    archived_at = Column(DateTime, nullable=False, default=utcnow)
+    # -> 보관 테이블로 옮긴 시각
+
+
+# ---------------------------------------------------------
+# [7] AuditLog 모델 -> audit_logs 테이블과 매핑됨
+# - 누가(actor) 어떤 할 일을(task_id) 어떻게 바꿨는지(action, changes) 기록함
+# - 할 일이 삭제되어도 기록은 남아야 하므로 외래키를 걸지 않음
+# - 요청마다 바로 쓰지 않고, api/audit.py가 모아서 한 번에 INSERT 함
+# ---------------------------------------------------------
+class AuditLog(Base):
+    __tablename__ = "audit_logs"
+
+    id = Column(Integer, primary_key=True)
+
+    task_id = Column(Integer, nullable=True)
+    # -> 바뀐 할 일 번호 (여러 할 일을 조건으로 한 번에 바꾼 경우 None)
+
+    action = Column(String(32), nullable=False)
+    # -> 무엇을 했는지 (예: "create", "update", "delete", "done", "undone")
+
+    actor = Column(String(255), nullable=True)
+    # -> 누가 했는지 (요청의 X-Actor 헤더, 없으면 None)
+
+    changes = Column(Text, nullable=True)
+    # -> 바뀐 내용 (JSON 문자열)
+
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    # -> 변경이 일어난 시각 (UTC)
+
+    __table_args__ = (
+        # 할 일별 변경 이력을 최신순으로 페이지 나눠 읽기 위한 인덱스
+        Index("ix_audit_logs_task_id_id", "task_id", "id"),
+    )
+
+
+# ---------------------------------------------------------
+# [8] OutboxEvent 모델 -> outbox_events 테이블과 매핑됨
+# - 할 일/완료 상태가 바뀔 때 "웹훅으로 보낼 알림"을 같은 트랜잭션 안에서 저장함
+#   (변경은 저장됐는데 알림만 빠지거나, 그 반대가 되는 일이 없음)
+# - 웹훅 주소(endpoint)마다 한 행씩 만들어서 주소별로 따로 재시도함
+# - 실제 전송은 api/outbox.py의 백그라운드 작업(dispatcher)이 담당함
+# ---------------------------------------------------------
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+
+    endpoint = Column(String(2048), nullable=False)
+    # -> 알림을 보낼 웹훅 주소
+
+    event_type = Column(String(32), nullable=False)
+    # -> 무슨 변경인지 (예: "task.created", "task.done")
+
+    task_id = Column(Integer, nullable=False)
+    # -> 바뀐 할 일 번호 (할 일이 삭제되어도 알림은 보내야 하므로 외래키 없음)
+
+    payload = Column(Text, nullable=False)
+    # -> 보낼 내용 (JSON 문자열)
+
+    status = Column(String(16), nullable=False, default="pending")
+    # -> "pending": 보낼 예정 / "dead": 재시도를 모두 실패해서 포기함 (dead letter)
+    #    (보내기에 성공한 행은 바로 삭제함)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    # -> 지금까지 보내기를 시도한 횟수
+
+    next_attempt_at = Column(DateTime, nullable=False, default=utcnow)
+    # -> 이 시각 이후에 보냄 (재시도 대기, 또는 dispatcher가 가져가서 보내는 중인 기한)
+
+    last_error = Column(Text, nullable=True)
+    # -> 마지막 실패 이유
+
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+
+    __table_args__ = (
+        # 보낼 차례가 된 행만 빠르게 찾기 위한 부분 인덱스 (dead 행은 들어가지 않음)
+        Index(
+            "ix_outbox_events_pending",
+            "next_attempt_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
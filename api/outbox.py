@@ -0,0 +1,234 @@
+# ---------------------------------------------------------
+# 파일명: outbox.py
+# 위치: api/outbox.py
+# 이 파일은 할 일이 바뀌었을 때 다른 시스템에 웹훅(HTTP POST)으로 알려주는
+# 기능을 정의한다. (transactional outbox 방식)
+#
+# - 라우터에서 바로 웹훅을 호출하면 상대 서버가 느릴 때 우리 응답도 느려진다.
+# - 그래서 CRUD 함수가 변경을 저장할 때, 같은 트랜잭션 안에서
+#   "보낼 알림"을 outbox_events 테이블에 함께 저장한다. (enqueue)
+# - 백그라운드 작업(OutboxDispatcher)이 보낼 차례가 된 행을 묶음으로 가져와서
+#   - 하나의 HTTP 클라이언트(연결 재사용)로 동시에 보내고,
+#   - 웹훅 주소별로 초당 전송 횟수를 제한하며 (token bucket),
+#   - 실패하면 점점 길게 기다렸다가 다시 보내고 (exponential backoff),
+#   - OUTBOX_MAX_ATTEMPTS번 실패하면 포기하고 status="dead"로 남긴다. (dead letter)
+# - 받는 쪽은 X-Outbox-Event-Id 헤더로 같은 알림을 두 번 받았는지 알 수 있다.
+#   (보낸 뒤 결과를 저장하기 전에 죽으면 같은 알림이 다시 갈 수 있음)
+# ---------------------------------------------------------
+
+import asyncio
+import json
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, AsyncContextManager, Callable
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.cruds.outbox as outbox_crud
+import api.models.task as task_model
+from api import metrics
+from api.db import utcnow
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# 웹훅 설정 (환경 변수)
+# - WEBHOOK_URLS: 알림을 보낼 주소들 (쉼표로 구분, 설정하지 않으면 기능 꺼짐)
+# - WEBHOOK_RATE_PER_SECOND: 주소 하나에 초당 보낼 수 있는 최대 알림 수
+# - WEBHOOK_TIMEOUT_SECONDS: 응답을 기다리는 최대 시간
+# - OUTBOX_BATCH_SIZE: 한 번에 가져와서 보낼 알림 수
+# - OUTBOX_POLL_SECONDS: 보낼 알림이 없을 때 다시 확인하기까지 기다리는 시간
+# - OUTBOX_MAX_ATTEMPTS: 이 횟수만큼 실패하면 포기함
+# - OUTBOX_BACKOFF_SECONDS / OUTBOX_BACKOFF_MAX_SECONDS: 재시도 대기 시간의 시작값 / 최댓값
+# ---------------------------------------------------------
+WEBHOOK_URLS = [url for url in os.getenv("WEBHOOK_URLS", "").split(",") if url]
+WEBHOOK_RATE_PER_SECOND = float(os.getenv("WEBHOOK_RATE_PER_SECOND", "10"))
+WEBHOOK_TIMEOUT_SECONDS = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "5"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "1"))
+OUTBOX_BACKOFF_MAX_SECONDS = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "3600"))
+
+
+# ---------------------------------------------------------
+# [1] 보낼 알림을 outbox에 쌓는 함수 (CRUD 함수에서 commit 전에 호출)
+# - event_type: "task.created", "task.updated", "task.deleted", "task.done", "task.undone"
+# - task_ids: 바뀐 할 일 번호들 (하위 트리/일괄 처리는 여러 개)
+# - 웹훅 주소 x 할 일 수만큼의 행을 한 번의 INSERT로 저장한다.
+# ---------------------------------------------------------
+async def enqueue(
+    db: AsyncSession,
+    event_type: str,
+    task_ids: list[int],
+    data: dict[str, Any] | None = None,
+) -> None:
+    if not WEBHOOK_URLS or not task_ids:
+        return
+
+    occurred_at = utcnow()
+    rows = []
+    for task_id in task_ids:
+        payload = json.dumps(
+            jsonable_encoder(
+                {
+                    "event": event_type,
+                    "task_id": task_id,
+                    "data": data,
+                    "occurred_at": occurred_at,
+                }
+            ),
+            ensure_ascii=False,
+        )
+        for endpoint in WEBHOOK_URLS:
+            rows.append(
+                {
+                    "endpoint": endpoint,
+                    "event_type": event_type,
+                    "task_id": task_id,
+                    "payload": payload,
+                    "next_attempt_at": occurred_at,
+                }
+            )
+    await db.execute(insert(task_model.OutboxEvent), rows)
+
+
+# ---------------------------------------------------------
+# [2] 주소별 전송 속도 제한 (token bucket)
+# - 초당 rate개씩 토큰이 차고, 최대 burst개까지 모아 둘 수 있다.
+# - 토큰이 없으면 생길 때까지 기다린다.
+# ---------------------------------------------------------
+class TokenBucket:
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated:
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+            self._updated = now
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                await asyncio.sleep(wait)
+                self._tokens = 1.0
+                self._updated = loop.time()
+            self._tokens -= 1
+
+
+# ---------------------------------------------------------
+# [3] outbox의 알림을 실제로 보내는 dispatcher
+# ---------------------------------------------------------
+class OutboxDispatcher:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        client: httpx.AsyncClient | None = None,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        rate_per_second: float = WEBHOOK_RATE_PER_SECOND,
+    ):
+        self.session_factory = session_factory
+        # 연결을 재사용하는 HTTP 클라이언트 (테스트에서는 가짜 서버에 연결된 클라이언트를 넘김)
+        self.client = client or httpx.AsyncClient(
+            timeout=WEBHOOK_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.rate_per_second = rate_per_second
+        self._buckets: dict[str, TokenBucket] = {}
+
+    # 재시도까지 기다릴 시간: 1, 2, 4, 8, ... 초 (최댓값 제한, 50~100% 사이로 흩뜨림)
+    @staticmethod
+    def backoff(attempts: int) -> timedelta:
+        delay = min(
+            OUTBOX_BACKOFF_MAX_SECONDS, OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1)
+        )
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    # 알림 하나를 보낸다 (반환값: 실패 이유, 성공이면 None)
+    async def _deliver(self, event: Row) -> str | None:
+        bucket = self._buckets.get(event.endpoint)
+        if bucket is None:
+            bucket = self._buckets[event.endpoint] = TokenBucket(self.rate_per_second)
+        await bucket.acquire()
+
+        try:
+            response = await self.client.post(
+                event.endpoint,
+                content=event.payload,
+                headers={
+                    "Content-Type": "application/json",
+                    "X-Outbox-Event-Id": str(event.id),
+                },
+            )
+        except httpx.HTTPError as e:
+            return f"{type(e).__name__}: {e}"
+        if response.is_success:
+            return None
+        return f"HTTP {response.status_code}"
+
+    # 한 묶음을 가져와서 보내고 결과를 저장한다 (반환값: 가져온 알림 수)
+    async def dispatch_once(self, now: datetime | None = None) -> int:
+        now = now or utcnow()
+        lease = WEBHOOK_TIMEOUT_SECONDS * 2 + self.batch_size / self.rate_per_second
+        async with self.session_factory() as db:
+            events = await outbox_crud.claim_batch(db, now, self.batch_size, lease)
+        if not events:
+            return 0
+
+        errors = await asyncio.gather(*(self._deliver(event) for event in events))
+
+        delivered, failures = [], []
+        for event, error in zip(events, errors):
+            if error is None:
+                delivered.append(event.id)
+                continue
+            attempts = event.attempts + 1
+            dead = attempts >= self.max_attempts
+            failures.append(
+                {
+                    "id": event.id,
+                    "attempts": attempts,
+                    "status": "dead" if dead else "pending",
+                    "next_attempt_at": now + self.backoff(attempts),
+                    "last_error": error,
+                }
+            )
+            metrics.inc("outbox_dead_letters_total" if dead else "outbox_retries_total")
+
+        async with self.session_factory() as db:
+            await outbox_crud.delete_delivered(db, delivered)
+            await outbox_crud.record_failures(db, failures)
+        metrics.inc("outbox_delivered_total", len(delivered))
+        return len(events)
+
+    # 앱이 실행되는 동안 계속 보내는 백그라운드 루프
+    # - 가져온 묶음이 가득 찼으면 쉬지 않고 다음 묶음을 가져온다.
+    # - api/main.py의 lifespan에서 시작되고, 앱이 종료될 때 취소된다.
+    async def run(self, poll_interval: float = OUTBOX_POLL_SECONDS) -> None:
+        try:
+            while True:
+                try:
+                    claimed = await self.dispatch_once()
+                except Exception:
+                    logger.exception("outbox dispatch failed")
+                    claimed = 0
+                if claimed < self.batch_size:
+                    await asyncio.sleep(poll_interval)
+        finally:
+            await self.client.aclose()
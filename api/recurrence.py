@@ -0,0 +1,155 @@
+# ---------------------------------------------------------
+# 파일명: recurrence.py
+# 위치: api/recurrence.py
+# 이 파일은 "반복 할 일"의 반복 규칙을 해석하고,
+# 정해진 기간 안의 발생일(occurrence)을 하나씩 만들어 내는 기능을 담고 있다.
+#
+# - 반복 규칙은 iCalendar RRULE 형식의 일부를 지원한다.
+#   예) "FREQ=WEEKLY;BYDAY=MO"          -> 매주 월요일
+#       "FREQ=DAILY;INTERVAL=2;COUNT=10" -> 이틀마다, 10번
+#       "FREQ=MONTHLY;UNTIL=20251231"    -> 매월 (2025년 말까지)
+# - 시작일(DTSTART)은 할 일의 due_date를 사용한다.
+# - 발생일은 DB에 미리 저장하지 않고, 조회할 때 제너레이터로 필요한 만큼만 만든다.
+# ---------------------------------------------------------
+
+import calendar
+import datetime
+from dataclasses import dataclass
+from typing import Iterator
+
+# 지원하는 반복 주기
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+
+# BYDAY에 쓰는 요일 이름 -> date.weekday() 값 (월요일=0)
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+
+# ---------------------------------------------------------
+# [1] 해석된 반복 규칙
+# ---------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class Rule:
+    freq: str  # 반복 주기 (DAILY / WEEKLY / MONTHLY / YEARLY)
+    interval: int = 1  # 몇 주기마다 반복하는지 (예: 2 -> 격주)
+    byday: tuple[int, ...] = ()  # WEEKLY일 때 반복할 요일들 (비어 있으면 시작일의 요일)
+    count: int | None = None  # 최대 반복 횟수
+    until: datetime.date | None = None  # 이 날짜까지만 반복
+
+
+# ---------------------------------------------------------
+# [2] 규칙 문자열을 해석하는 함수
+# - 형식이 잘못되면 ValueError를 발생시킨다.
+#   (스키마의 검증 함수에서 사용되므로 FastAPI가 422 응답으로 바꿔 준다)
+# ---------------------------------------------------------
+def parse_rule(text: str) -> Rule:
+    parts = {}
+    for part in text.strip().upper().split(";"):
+        key, sep, value = part.partition("=")
+        if not sep or not value:
+            raise ValueError(f"invalid recurrence part: {part!r}")
+        parts[key] = value
+
+    freq = parts.pop("FREQ", None)
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+
+    interval = int(parts.pop("INTERVAL", "1"))
+    if interval < 1:
+        raise ValueError("INTERVAL must be at least 1")
+
+    byday: tuple[int, ...] = ()
+    if "BYDAY" in parts:
+        if freq != "WEEKLY":
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        try:
+            byday = tuple(
+                sorted({WEEKDAYS[day] for day in parts.pop("BYDAY").split(",")})
+            )
+        except KeyError as e:
+            raise ValueError(f"invalid BYDAY value: {e.args[0]}") from None
+
+    count = int(parts.pop("COUNT")) if "COUNT" in parts else None
+    if count is not None and count < 1:
+        raise ValueError("COUNT must be at least 1")
+
+    until = None
+    if "UNTIL" in parts:
+        value = parts.pop("UNTIL")[:10].replace("-", "")
+        until = datetime.datetime.strptime(value[:8], "%Y%m%d").date()
+
+    if count is not None and until is not None:
+        raise ValueError("COUNT and UNTIL cannot be used together")
+    if parts:
+        raise ValueError(f"unsupported recurrence parts: {', '.join(sorted(parts))}")
+
+    return Rule(freq=freq, interval=interval, byday=byday, count=count, until=until)
+
+
+# ---------------------------------------------------------
+# [3] 시작일부터 모든 발생일을 순서대로 만드는 내부 제너레이터
+# - skip_to를 주면 그 날짜가 속한 주기부터 바로 시작한다.
+#   (몇 년 전에 시작한 규칙도 앞부분을 하나씩 만들지 않고 건너뜀)
+# ---------------------------------------------------------
+def _iter_all(
+    rule: Rule, start: datetime.date, skip_to: datetime.date | None
+) -> Iterator[datetime.date]:
+    skip_days = max(0, (skip_to - start).days) if skip_to else 0
+
+    if rule.freq == "DAILY":
+        k = skip_days // rule.interval
+        while True:
+            yield start + datetime.timedelta(days=k * rule.interval)
+            k += 1
+
+    elif rule.freq == "WEEKLY":
+        week_start = start - datetime.timedelta(days=start.weekday())
+        weekdays = rule.byday or (start.weekday(),)
+        k = (skip_days + start.weekday()) // (7 * rule.interval)
+        while True:
+            base = week_start + datetime.timedelta(weeks=k * rule.interval)
+            for weekday in weekdays:
+                day = base + datetime.timedelta(days=weekday)
+                if day >= start:
+                    yield day
+            k += 1
+
+    else:
+        # MONTHLY / YEARLY: 시작일과 같은 "일"에 반복 (그 날짜가 없는 달/해는 건너뜀)
+        step = rule.interval if rule.freq == "MONTHLY" else 12 * rule.interval
+        k = 0
+        if skip_to and skip_to > start:
+            months = (skip_to.year - start.year) * 12 + skip_to.month - start.month
+            k = max(0, months // step)
+        while True:
+            month_index = start.month - 1 + k * step
+            year, month = start.year + month_index // 12, month_index % 12 + 1
+            if start.day <= calendar.monthrange(year, month)[1]:
+                yield datetime.date(year, month, start.day)
+            k += 1
+
+
+# ---------------------------------------------------------
+# [4] 기간 [date_from, date_to] 안의 발생일을 하나씩 돌려주는 제너레이터
+# - 기간 밖의 발생일은 만들지 않는다 (COUNT가 있으면 횟수를 세기 위해 처음부터 셈).
+# ---------------------------------------------------------
+def occurrences(
+    rule: Rule,
+    start: datetime.date,
+    date_from: datetime.date,
+    date_to: datetime.date,
+) -> Iterator[datetime.date]:
+    skip_to = date_from if rule.count is None else None
+    for n, day in enumerate(_iter_all(rule, start, skip_to), start=1):
+        if day > date_to or (rule.until and day > rule.until):
+            return
+        if rule.count is not None and n > rule.count:
+            return
+        if day >= date_from:
+            yield day
+
+
+# ---------------------------------------------------------
+# [5] 어떤 날짜가 규칙의 발생일인지 확인하는 함수
+# ---------------------------------------------------------
+def is_occurrence(rule: Rule, start: datetime.date, day: datetime.date) -> bool:
+    return next(occurrences(rule, start, day, day), None) is not None
@@ -0,0 +1,292 @@
+# ---------------------------------------------------------
+# 파일명: reminder.py
+# 위치: api/reminder.py
+# 이 파일은 마감일이 다가온 할 일을 알려주는 알림 스케줄러를 정의한다.
+#
+# - 1분마다 전체 할 일을 조회하는 대신, 앞으로 REMINDER_WINDOW_DAYS일 안에
+#   마감인 할 일만 (due_date, id) 인덱스로 읽어 힙(heap)에 넣어 둔다.
+# - 힙의 맨 앞(가장 빨리 알려야 할 할 일)까지 잠들었다가 시각이 되면 알린다.
+# - 할 일이 추가/수정/삭제되거나 완료 상태가 바뀌면 라우터가 스케줄러에 알려주고,
+#   스케줄러는 힙을 그 자리에서 고친다. (전체를 다시 읽지 않음)
+#   - 지운 항목을 힙에서 바로 빼지 않고 "무효" 표시만 해 두었다가,
+#     꺼낼 때 무효인 항목은 건너뛴다. (lazy invalidation)
+#   - 하위 트리 완료처럼 어떤 할 일이 바뀌었는지 모르는 경우에는
+#     refresh()로 기간 전체를 다시 읽는다.
+# - 알림은 등록된 전달 방법(sink)들로 보낸다.
+#   - LogSink: 로그로 남김 (REMINDER_SINKS=log)
+#   - LocalSink: 메모리의 리스트에 모아 둠 (테스트용)
+#   - 다른 전달 방법은 send()를 가진 객체를 add_sink()로 등록하면 된다.
+# - 반복 할 일은 알림 대상이 아니다.
+# ---------------------------------------------------------
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, AsyncContextManager, Callable, Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.cruds.reminder as reminder_crud
+from api import metrics
+from api.db import utcnow
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# 알림 설정 (환경 변수)
+# - REMINDER_SINKS: 사용할 전달 방법 (쉼표로 구분, 설정하지 않으면 알림 기능 꺼짐)
+# - REMINDER_WINDOW_DAYS: 며칠 뒤까지의 할 일을 미리 읽어 둘지
+# - REMINDER_LEAD_HOURS: 마감일 0시(UTC)보다 몇 시간 먼저 알릴지
+# - REMINDER_RELOAD_SECONDS: 기간을 옮겨 가며 다시 읽는 간격
+# ---------------------------------------------------------
+REMINDER_SINKS = [name for name in os.getenv("REMINDER_SINKS", "").split(",") if name]
+REMINDER_WINDOW_DAYS = int(os.getenv("REMINDER_WINDOW_DAYS", "2"))
+REMINDER_LEAD_HOURS = float(os.getenv("REMINDER_LEAD_HOURS", "0"))
+REMINDER_RELOAD_SECONDS = float(os.getenv("REMINDER_RELOAD_SECONDS", "3600"))
+
+
+# ---------------------------------------------------------
+# [1] 알림 하나
+# ---------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class Reminder:
+    task_id: int
+    title: str | None
+    due_date: date
+    fire_at: datetime  # 알리는 시각 (UTC)
+
+
+# ---------------------------------------------------------
+# [2] 알림 전달 방법 (sink)
+# ---------------------------------------------------------
+class ReminderSink(Protocol):
+    async def send(self, reminder: Reminder) -> None: ...
+
+
+# 로그로 남기는 전달 방법
+class LogSink:
+    async def send(self, reminder: Reminder) -> None:
+        logger.info(
+            "task %d is due on %s: %s",
+            reminder.task_id,
+            reminder.due_date,
+            reminder.title,
+        )
+
+
+# 받은 알림을 리스트에 모아 두는 전달 방법 (테스트용)
+class LocalSink:
+    def __init__(self):
+        self.reminders: list[Reminder] = []
+
+    async def send(self, reminder: Reminder) -> None:
+        self.reminders.append(reminder)
+
+
+SINKS: dict[str, Callable[[], ReminderSink]] = {"log": LogSink}
+
+
+# ---------------------------------------------------------
+# [3] 알림 스케줄러
+# ---------------------------------------------------------
+class ReminderScheduler:
+    def __init__(
+        self,
+        window_days: int = REMINDER_WINDOW_DAYS,
+        lead: timedelta = timedelta(hours=REMINDER_LEAD_HOURS),
+    ):
+        self.window_days = window_days
+        self.lead = lead
+        self.sinks: list[ReminderSink] = []
+        # run()이 실행 중일 때만 라우터의 변경 알림을 반영한다
+        self.running = False
+
+        # 힙: (알릴 시각, 순번, Reminder) / 순번은 같은 시각끼리의 순서와 유효성 확인에 씀
+        self._heap: list[tuple[datetime, int, Reminder]] = []
+        # 할 일 번호 -> 지금 유효한 힙 항목의 순번 (여기 없거나 다르면 무효)
+        self._entries: dict[int, int] = {}
+        # 이미 알린 (할 일 번호, 마감일) -> 다시 읽어도 또 알리지 않음
+        self._fired: set[tuple[int, date]] = set()
+        self._seq = itertools.count()
+        self._window_end = date.min
+        self._reload_requested = False
+        self._reloading = False
+        self._changed = asyncio.Event()
+
+    def add_sink(self, sink: ReminderSink) -> None:
+        self.sinks.append(sink)
+
+    # -----------------------------------------------------
+    # 라우터에서 호출하는 변경 알림
+    # - task는 id, title, due_date, recurrence 속성을 가진 객체
+    # -----------------------------------------------------
+
+    # 새로 만든 할 일 (아직 완료되지 않았음)
+    def add(self, task: Any) -> None:
+        if self.running:
+            self._schedule(task.id, task.title, task.due_date, task.recurrence)
+            self._check_reloading()
+
+    # 수정한 할 일
+    # - 힙에 없던 할 일은 완료된 할 일일 수도 있으므로, 기간 안으로 들어왔을 때만
+    #   기간 전체를 다시 읽어서 확인한다.
+    def update(self, task: Any) -> None:
+        if not self.running:
+            return
+        if task.id in self._entries:
+            self._entries.pop(task.id)
+            self._schedule(task.id, task.title, task.due_date, task.recurrence)
+        elif task.due_date is not None and task.due_date <= self._window_end:
+            self.refresh()
+        self._check_reloading()
+
+    # 삭제했거나 완료한 할 일
+    def remove(self, task_id: int) -> None:
+        if self.running:
+            self._entries.pop(task_id, None)
+            self._check_reloading()
+
+    # 어떤 할 일이 바뀌었는지 모를 때 (완료 취소, 하위 트리 완료, 일괄 삭제 등)
+    def refresh(self) -> None:
+        if self.running:
+            self._reload_requested = True
+            self._changed.set()
+
+    # 다시 읽는 중(DB 응답 대기 중)에 바뀐 내용은 읽기가 끝나면 덮어써지므로
+    # 한 번 더 읽도록 표시해 둔다
+    def _check_reloading(self) -> None:
+        if self._reloading:
+            self._reload_requested = True
+
+    # -----------------------------------------------------
+    # 힙 관리
+    # -----------------------------------------------------
+    def _schedule(
+        self,
+        task_id: int,
+        title: str | None,
+        due_date: date | None,
+        recurrence: str | None,
+    ) -> None:
+        if due_date is None or recurrence is not None or due_date > self._window_end:
+            return
+        if (task_id, due_date) in self._fired:
+            return
+
+        fire_at = datetime.combine(due_date, time()) - self.lead
+        seq = next(self._seq)
+        self._entries[task_id] = seq
+        heapq.heappush(
+            self._heap, (fire_at, seq, Reminder(task_id, title, due_date, fire_at))
+        )
+
+        # 힙의 맨 앞이 바뀌었으면 잠든 run()을 깨워서 대기 시간을 다시 계산하게 함
+        if self._heap[0][1] == seq:
+            self._changed.set()
+
+    # 앞으로 window_days일 안에 마감인 할 일을 DB에서 다시 읽어 힙을 새로 만든다
+    async def reload(
+        self,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        now: datetime,
+    ) -> None:
+        self._reload_requested = False
+        today = now.date()
+        window_end = today + timedelta(days=self.window_days)
+        self._reloading = True
+        try:
+            async with session_factory() as db:
+                rows = await reminder_crud.get_upcoming(db, today, window_end)
+        finally:
+            self._reloading = False
+
+        self._heap.clear()
+        self._entries.clear()
+        self._fired = {key for key in self._fired if key[1] >= today}
+        self._window_end = window_end
+        for row in rows:
+            self._schedule(row.id, row.title, row.due_date, None)
+
+    # 알릴 시각이 지난 항목을 모두 꺼내서 보낸다 (반환값: 보낸 알림 수)
+    async def fire_due(self, now: datetime) -> int:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, reminder = heapq.heappop(self._heap)
+            if self._entries.get(reminder.task_id) != seq:
+                continue  # 무효가 된 항목
+            del self._entries[reminder.task_id]
+            self._fired.add((reminder.task_id, reminder.due_date))
+            due.append(reminder)
+
+        for reminder in due:
+            results = await asyncio.gather(
+                *(sink.send(reminder) for sink in self.sinks), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("reminder delivery failed", exc_info=result)
+                    metrics.inc("reminders_failed_total")
+                else:
+                    metrics.inc("reminders_sent_total")
+        return len(due)
+
+    # 다음 알림 시각까지 남은 시간 (초)
+    def _seconds_until_next(self, now: datetime) -> float | None:
+        while (
+            self._heap
+            and self._entries.get(self._heap[0][2].task_id) != self._heap[0][1]
+        ):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, (self._heap[0][0] - now).total_seconds())
+
+    # -----------------------------------------------------
+    # 앱이 실행되는 동안 도는 백그라운드 루프
+    # - api/main.py의 lifespan에서 시작되고, 앱이 종료될 때 취소된다.
+    # -----------------------------------------------------
+    async def run(
+        self,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        reload_interval: float = REMINDER_RELOAD_SECONDS,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        next_reload = loop.time()
+        self.running = True
+        try:
+            while True:
+                now = utcnow()
+                if self._reload_requested or loop.time() >= next_reload:
+                    try:
+                        await self.reload(session_factory, now)
+                    except Exception:
+                        logger.exception("failed to load upcoming reminders")
+                    next_reload = loop.time() + reload_interval
+                await self.fire_due(now)
+
+                timeout = next_reload - loop.time()
+                until_next = self._seconds_until_next(utcnow())
+                if until_next is not None:
+                    timeout = min(timeout, until_next)
+
+                self._changed.clear()
+                if self._reload_requested:
+                    continue
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait(), timeout=max(0.0, timeout)
+                    )
+                except TimeoutError:
+                    pass
+        finally:
+            self.running = False
+
+
+# 앱 전체에서 함께 쓰는 스케줄러
+scheduler = ReminderScheduler()
+for _name in REMINDER_SINKS:
+    scheduler.add_sink(SINKS[_name]())
@@ -0,0 +1,61 @@
+# ---------------------------------------------------------
+# 파일명: __init__.py
+# 위치: api/repositories/__init__.py
+# 이 패키지는 할 일을 어디에 저장할지(저장소, repository)를 정한다.
+# - REPO_BACKEND=sql (기본값): PostgreSQL/SQLite (api/repositories/sql.py)
+# - REPO_BACKEND=memory: DB 서버 없이 메모리에 저장 (api/repositories/memory.py)
+#   - MEMORY_REPO_PATH를 설정하면 그 폴더에 로그/스냅샷으로 저장해서
+#     다시 시작해도 할 일이 남는다. (설정하지 않으면 종료할 때 사라짐)
+#
+# 사용 예 (라우터):
+#   async def list_tasks(repo: TaskRepository = Depends(get_repo)): ...
+# ---------------------------------------------------------
+
+import functools
+import os
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.db import get_db
+from api.repositories.base import TaskRepository
+from api.repositories.memory import MemoryTaskRepository
+from api.repositories.sql import SqlTaskRepository
+
+REPO_BACKEND = os.getenv("REPO_BACKEND", "sql")
+MEMORY_REPO_PATH = os.getenv("MEMORY_REPO_PATH")
+
+if REPO_BACKEND not in ("sql", "memory"):
+    raise RuntimeError(f"REPO_BACKEND must be 'sql' or 'memory', not {REPO_BACKEND!r}")
+
+
+# 앱 전체에서 함께 쓰는 메모리 저장소 (처음 사용할 때 디스크에서 불러옴)
+@functools.cache
+def memory_repository() -> MemoryTaskRepository:
+    return MemoryTaskRepository(MEMORY_REPO_PATH)
+
+
+# ---------------------------------------------------------
+# 라우터에 저장소를 주입하는 의존성 함수
+# - memory 저장소는 DB 세션이 필요 없으므로 get_db()를 거치지 않는다.
+# ---------------------------------------------------------
+if REPO_BACKEND == "memory":
+
+    async def get_repo() -> TaskRepository:
+        return memory_repository()
+
+else:
+
+    async def get_repo(
+        db: AsyncSession = Depends(get_db, scope="function"),
+    ) -> TaskRepository:
+        return SqlTaskRepository(db)
+
+
+__all__ = [
+    "MemoryTaskRepository",
+    "SqlTaskRepository",
+    "TaskRepository",
+    "get_repo",
+    "memory_repository",
+]
@@ -0,0 +1,119 @@
+# ---------------------------------------------------------
+# 파일명: base.py
+# 위치: api/repositories/base.py
+# 이 파일은 할 일 저장소(repository)가 제공해야 하는 기능을 정의한다.
+# - 라우터는 DB 세션(AsyncSession) 대신 이 인터페이스만 보고 동작한다.
+# - 구현:
+#   - SqlTaskRepository (api/repositories/sql.py): 지금까지의 SQLAlchemy CRUD
+#   - MemoryTaskRepository (api/repositories/memory.py): DB 서버 없이 메모리에서 동작
+# - 여기 있는 기능은 모두 abstractmethod로, 모든 저장소가 구현한다.
+# - 작업 큐, 반복 발생, 감사 로그처럼 DB에서만 동작하는 기능은 이 인터페이스에 없고,
+#   SQL 저장소일 때만 해당 라우터를 등록한다. (api/main.py)
+# ---------------------------------------------------------
+
+import datetime
+from abc import ABC, abstractmethod
+from typing import Any
+
+import api.schemas.task as task_schema
+
+
+class TaskRepository(ABC):
+    # -----------------------------------------------------
+    # [1] 모든 저장소가 구현하는 기본 기능
+    # -----------------------------------------------------
+
+    # 할 일 목록 (id 순서) -> [{"id", "title", "due_date", "recurrence", "done", "tags"}, ...]
+    @abstractmethod
+    async def list_tasks(
+        self,
+        tags: list[str] | None = None,
+        tag_match: str = "all",
+        limit: int | None = None,
+        offset: int = 0,
+        include_archived: bool = False,
+    ) -> list[dict]: ...
+
+    # 할 일 개수 (mode: "exact" 또는 "estimated")
+    @abstractmethod
+    async def count_tasks(
+        self,
+        mode: str = "exact",
+        tags: list[str] | None = None,
+        tag_match: str = "all",
+        include_archived: bool = False,
+    ) -> int: ...
+
+    # 할 일 하나 (없으면 None)
+    @abstractmethod
+    async def get_task(self, task_id: int) -> Any | None: ...
+
+    @abstractmethod
+    async def create_task(self, task_create: task_schema.TaskCreate) -> Any: ...
+
+    # task는 get_task()가 돌려준 객체
+    @abstractmethod
+    async def update_task(
+        self, task: Any, task_create: task_schema.TaskCreate
+    ) -> Any: ...
+
+    # 삭제한 할 일 번호 목록 (자기 자신 + 모든 하위 할 일, 없었으면 빈 목록)
+    @abstractmethod
+    async def delete_task(self, task_id: int) -> list[int]: ...
+
+    @abstractmethod
+    async def is_done(self, task_id: int) -> bool: ...
+
+    # 완료 처리 -> "done", 할 일이 없으면 "not_found", 이미 완료된 할 일이면 "exists"
+    @abstractmethod
+    async def mark_done(self, task_id: int) -> str: ...
+
+    # 완료 취소 (완료 상태가 아니었으면 False)
+    @abstractmethod
+    async def unmark_done(self, task_id: int) -> bool: ...
+
+    # 기간 안의 할 일을 마감일별로 묶음 -> [{"date", "count", "done_count", "tasks"}, ...]
+    # (반복 할 일은 넣지 않음)
+    @abstractmethod
+    async def get_calendar(
+        self, date_from: datetime.date, date_to: datetime.date
+    ) -> list[dict]: ...
+
+    # 다음에 할 일 상위 limit개 (완료되지 않은 일반 할 일, 마감일 -> 우선순위 높은 순 -> id)
+    # -> [{"id", "title", "due_date", "priority", "overdue"}, ...]
+    @abstractmethod
+    async def get_next_tasks(self, today: datetime.date, limit: int) -> list[dict]: ...
+
+    # 실제로 삭제한 할 일 번호 목록 (ids와 done_before를 모두 주면 두 조건을 모두 만족하는 할 일)
+    @abstractmethod
+    async def bulk_delete_tasks(
+        self, ids: list[int] | None = None, done_before: datetime.date | None = None
+    ) -> list[int]: ...
+
+    # -----------------------------------------------------
+    # [2] 하위 할 일
+    # -----------------------------------------------------
+
+    # candidate가 root 자신이거나 root의 하위 할 일인지 확인
+    @abstractmethod
+    async def is_in_subtree(self, root: Any, candidate: Any) -> bool: ...
+
+    # root와 그 아래 모든 하위 할 일 -> 집계(total, done_count, percent_complete)를 포함한 트리
+    @abstractmethod
+    async def get_subtree(self, root: Any) -> dict: ...
+
+    @abstractmethod
+    async def mark_done_subtree(self, root: Any) -> None: ...
+
+    @abstractmethod
+    async def unmark_done_subtree(self, root: Any) -> None: ...
+
+    # -----------------------------------------------------
+    # [3] 태그
+    # - 반환값: 새로 붙은(떨어진) (할 일, 태그) 쌍마다 그 할 일 번호
+    # -----------------------------------------------------
+    @abstractmethod
+    async def attach_tags(self, task_ids: list[int], names: list[str]) -> list[int]: ...
+
+    @abstractmethod
+    async def detach_tags(self, task_ids: list[int], names: list[str]) -> list[int]: ...
@@ -0,0 +1,537 @@
+# ---------------------------------------------------------
+# 파일명: memory.py
+# 위치: api/repositories/memory.py
+# 이 파일은 DB 서버 없이 메모리에서 할 일을 저장하는 저장소이다.
+# - 작은 엣지 서버나 잠깐 쓰고 버리는 환경에서 사용한다. (REPO_BACKEND=memory)
+#
+# [메모리 구조]
+# - _tasks: 할 일 번호 -> TaskRecord (slots로 만든 작은 객체)
+#   번호는 1씩 늘어나며 추가되므로 사전의 순서가 곧 id 순서이다.
+# - _due_index: (마감일, 번호)를 정렬해 둔 리스트
+#   달력 조회는 bisect로 기간의 시작/끝 위치만 찾아서 그 사이만 읽는다.
+# - _done: 완료 여부 비트셋 (할 일 번호 하나당 1비트)
+#   _done_at: 완료 시각 (done_before 조건으로 여러 할 일을 지울 때 사용)
+# - _tags: 할 일 번호 -> 태그 이름 집합, _tag_index: 태그 이름 -> 할 일 번호 집합
+#   태그 필터는 태그마다 할 일 번호 집합을 꺼내 교집합(all) / 합집합(any)으로 계산한다.
+# - 하위 할 일은 SQL 저장소와 같은 경로(path, 예: "1/4/9/")로 표현한다.
+#
+# [저장 방식] (MEMORY_REPO_PATH를 설정했을 때만)
+# - 바뀐 내용을 한 줄짜리 JSON으로 tasks.log 끝에 덧붙인다. (append-only log)
+# - 로그가 snapshot_every 줄을 넘으면 전체 상태를 tasks.snapshot.json으로 저장하고
+#   로그를 비운다. 시작할 때는 스냅샷을 읽은 뒤 로그를 다시 적용한다.
+# - 로그의 모든 항목은 여러 번 적용해도 결과가 같으므로,
+#   스냅샷 저장 직후(로그를 비우기 전)에 프로세스가 죽어도 상태가 어긋나지 않는다.
+#
+# [DB에서만 동작하는 기능]
+# - 보관, 작업 큐, 반복 발생 상태, 감사 로그는 이 저장소에서 쓰지 않는다.
+#   해당 라우터는 SQL 저장소일 때만 등록된다. (api/main.py)
+# ---------------------------------------------------------
+
+import bisect
+import datetime
+import heapq
+import itertools
+import json
+import os
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import api.schemas.task as task_schema
+from api.cruds.task import build_subtree, is_in_subtree, task_path
+from api.db import utcnow
+from api.repositories.base import TaskRepository
+
+# 로그가 이 줄 수를 넘으면 스냅샷을 새로 만든다
+MEMORY_SNAPSHOT_EVERY = int(os.getenv("MEMORY_SNAPSHOT_EVERY", "10000"))
+
+LOG_FILE = "tasks.log"
+SNAPSHOT_FILE = "tasks.snapshot.json"
+
+
+# ---------------------------------------------------------
+# [1] 할 일 하나를 담는 레코드
+# - TaskCreateResponse가 속성으로 바로 읽을 수 있다. (from_attributes)
+# ---------------------------------------------------------
+@dataclass(slots=True)
+class TaskRecord:
+    id: int
+    title: str | None
+    due_date: datetime.date | None
+    recurrence: str | None
+    priority: int = 0
+    parent_id: int | None = None
+    path: str | None = None
+
+
+# ---------------------------------------------------------
+# [2] 메모리 저장소
+# ---------------------------------------------------------
+class MemoryTaskRepository(TaskRepository):
+    def __init__(
+        self, path: str | None = None, snapshot_every: int = MEMORY_SNAPSHOT_EVERY
+    ):
+        self._tasks: dict[int, TaskRecord] = {}
+        self._due_index: list[tuple[datetime.date, int]] = []
+        self._done = bytearray()
+        self._done_at: dict[int, datetime.datetime] = {}
+        self._tags: dict[int, set[str]] = {}
+        self._tag_index: dict[str, set[int]] = {}
+        self._next_id = 1
+
+        self._path = path
+        self._snapshot_every = snapshot_every
+        self._log = None
+        self._log_lines = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+            self._log = open(os.path.join(path, LOG_FILE), "a", encoding="utf-8")
+
+    # -----------------------------------------------------
+    # 기본 기능
+    # - 메서드 안에 await가 없으므로 한 요청의 변경이 다른 요청과 섞이지 않는다.
+    # -----------------------------------------------------
+    async def list_tasks(
+        self,
+        tags: list[str] | None = None,
+        tag_match: str = "all",
+        limit: int | None = None,
+        offset: int = 0,
+        include_archived: bool = False,
+    ) -> list[dict]:
+        # 보관 기능이 없으므로 include_archived와 상관없이 같은 목록이다
+        records = self._tasks.values()
+        if tags:
+            records = (
+                self._tasks[task_id]
+                for task_id in sorted(self._tagged(tags, tag_match))
+            )
+
+        end = None if limit is None else offset + limit
+        return [
+            self._to_dict(record) for record in itertools.islice(records, offset, end)
+        ]
+
+    async def count_tasks(
+        self,
+        mode: str = "exact",
+        tags: list[str] | None = None,
+        tag_match: str = "all",
+        include_archived: bool = False,
+    ) -> int:
+        if tags:
+            return len(self._tagged(tags, tag_match))
+        return len(self._tasks)
+
+    async def get_task(self, task_id: int) -> TaskRecord | None:
+        return self._tasks.get(task_id)
+
+    async def create_task(self, task_create: task_schema.TaskCreate) -> TaskRecord:
+        # 상위 할 일이 있는지는 라우터에서 먼저 확인한다
+        record = TaskRecord(
+            id=self._next_id,
+            title=task_create.title,
+            due_date=task_create.due_date,
+            recurrence=task_create.recurrence,
+            priority=task_create.priority,
+            parent_id=task_create.parent_id,
+            path=f"{self._parent_path(task_create.parent_id)}{self._next_id}/",
+        )
+        self._put(record)
+        self._append({"op": "put", **self._to_json(record)})
+        return record
+
+    async def update_task(
+        self, task: TaskRecord, task_create: task_schema.TaskCreate
+    ) -> TaskRecord:
+        # SQL 저장소와 같이 제목과 마감일은 항상 바꾸고,
+        # 우선순위/반복 규칙/상위 할 일은 요청에 보낸 경우에만 바꾼다
+        self._unindex(task)
+        task.title = task_create.title
+        task.due_date = task_create.due_date
+        if "priority" in task_create.model_fields_set:
+            task.priority = task_create.priority
+        if "recurrence" in task_create.model_fields_set:
+            task.recurrence = task_create.recurrence
+        self._index(task)
+
+        if (
+            "parent_id" in task_create.model_fields_set
+            and task_create.parent_id != task.parent_id
+        ):
+            # 하위 할 일들의 경로 앞부분도 함께 바꾸고, 바뀐 할 일마다 로그를 남긴다
+            old_prefix = task_path(task)
+            new_prefix = f"{self._parent_path(task_create.parent_id)}{task.id}/"
+            for record in self._subtree(task):
+                record.path = new_prefix + record.path[len(old_prefix) :]
+                if record is not task:
+                    self._append({"op": "put", **self._to_json(record)})
+            task.parent_id = task_create.parent_id
+
+        self._append({"op": "put", **self._to_json(task)})
+        return task
+
+    async def delete_task(self, task_id: int) -> list[int]:
+        if task_id not in self._tasks:
+            return []
+        # SQL 저장소와 같이 하위 할 일도 함께 지우고, 지운 번호를 모두 돌려준다
+        deleted = [record.id for record in self._subtree(self._tasks[task_id])]
+        for deleted_id in deleted:
+            self._delete(deleted_id)
+            self._append({"op": "delete", "id": deleted_id})
+        return deleted
+
+    async def is_done(self, task_id: int) -> bool:
+        return self._is_done_sync(task_id)
+
+    async def mark_done(self, task_id: int) -> str:
+        if task_id not in self._tasks:
+            return "not_found"
+        if await self.is_done(task_id):
+            return "exists"
+        self._mark(task_id, True)
+        return "done"
+
+    async def unmark_done(self, task_id: int) -> bool:
+        if not await self.is_done(task_id):
+            return False
+        self._mark(task_id, False)
+        return True
+
+    async def get_calendar(
+        self, date_from: datetime.date, date_to: datetime.date
+    ) -> list[dict]:
+        start = bisect.bisect_left(self._due_index, (date_from, 0))
+        end = bisect.bisect_left(
+            self._due_index, (date_to + datetime.timedelta(days=1), 0)
+        )
+
+        days: list[dict] = []
+        for due_date, task_id in self._due_index[start:end]:
+            if self._tasks[task_id].recurrence is not None:
+                continue
+            if not days or days[-1]["date"] != due_date:
+                days.append(
+                    {"date": due_date, "count": 0, "done_count": 0, "tasks": []}
+                )
+            task = self._to_dict(self._tasks[task_id])
+            days[-1]["count"] += 1
+            days[-1]["done_count"] += task["done"]
+            days[-1]["tasks"].append(task)
+        return days
+
+    # 완료되지 않은 일반 할 일 중 순서가 가장 앞선 limit개
+    # - 전체를 정렬하지 않고 힙으로 limit개만 고른다.
+    async def get_next_tasks(self, today: datetime.date, limit: int) -> list[dict]:
+        candidates = (
+            record
+            for record in self._tasks.values()
+            if record.recurrence is None and not self._is_done_sync(record.id)
+        )
+        records = heapq.nsmallest(
+            limit,
+            candidates,
+            key=lambda r: (r.due_date is None, r.due_date or today, -r.priority, r.id),
+        )
+        return [
+            {
+                "id": record.id,
+                "title": record.title,
+                "due_date": record.due_date,
+                "priority": record.priority,
+                "overdue": record.due_date is not None and record.due_date < today,
+            }
+            for record in records
+        ]
+
+    async def bulk_delete_tasks(
+        self, ids: list[int] | None = None, done_before: datetime.date | None = None
+    ) -> list[int]:
+        # SQL의 IN (...)과 같이 같은 번호를 여러 번 보내도 한 번만 센다
+        candidates = self._tasks if ids is None else dict.fromkeys(ids)
+        deleted = [task_id for task_id in candidates if task_id in self._tasks]
+        if done_before is not None:
+            cutoff = datetime.datetime.combine(done_before, datetime.time())
+            deleted = [
+                task_id
+                for task_id in deleted
+                if self._is_done_sync(task_id) and self._done_at[task_id] < cutoff
+            ]
+
+        # SQL 저장소와 같이 함께 지워진 하위 할 일까지, 실제로 지운 번호를 모두 돌려준다
+        removed: list[int] = []
+        for task_id in deleted:
+            if task_id in self._tasks:
+                removed += await self.delete_task(task_id)
+        return sorted(removed)
+
+    # -----------------------------------------------------
+    # 하위 할 일
+    # -----------------------------------------------------
+    async def is_in_subtree(self, root: TaskRecord, candidate: TaskRecord) -> bool:
+        return is_in_subtree(root, candidate)
+
+    async def get_subtree(self, root: TaskRecord) -> dict:
+        rows = [
+            SimpleNamespace(
+                **self._to_dict(record), parent_id=record.parent_id, path=record.path
+            )
+            for record in sorted(self._subtree(root), key=lambda r: r.id)
+        ]
+        return build_subtree(rows, root.id)
+
+    async def mark_done_subtree(self, root: TaskRecord) -> None:
+        for record in self._subtree(root):
+            if not self._is_done_sync(record.id):
+                self._mark(record.id, True)
+
+    async def unmark_done_subtree(self, root: TaskRecord) -> None:
+        for record in self._subtree(root):
+            if self._is_done_sync(record.id):
+                self._mark(record.id, False)
+
+    # -----------------------------------------------------
+    # 태그
+    # -----------------------------------------------------
+    async def attach_tags(self, task_ids: list[int], names: list[str]) -> list[int]:
+        attached = []
+        for task_id in sorted(set(task_ids)):
+            if task_id not in self._tasks:
+                continue
+            new = set(names) - self._tags.get(task_id, set())
+            if new:
+                self._tag(task_id, new, True)
+                self._append({"op": "tag", "id": task_id, "tags": sorted(new)})
+                attached += [task_id] * len(new)
+        return attached
+
+    async def detach_tags(self, task_ids: list[int], names: list[str]) -> list[int]:
+        detached = []
+        for task_id in sorted(set(task_ids)):
+            removed = set(names) & self._tags.get(task_id, set())
+            if removed:
+                self._tag(task_id, removed, False)
+                self._append({"op": "untag", "id": task_id, "tags": sorted(removed)})
+                detached += [task_id] * len(removed)
+        return detached
+
+    # -----------------------------------------------------
+    # 저장 (로그 / 스냅샷)
+    # -----------------------------------------------------
+
+    # 스냅샷을 저장하고 로그 파일을 닫는다 (앱 종료 시 호출)
+    def close(self) -> None:
+        if self._log is None:
+            return
+        self.snapshot()
+        self._log.close()
+        self._log = None
+
+    # 전체 상태를 스냅샷 파일로 저장하고 로그를 비운다
+    # - 임시 파일에 쓴 뒤 이름을 바꾸므로 저장 도중 죽어도 이전 스냅샷이 남는다.
+    def snapshot(self) -> None:
+        if self._path is None:
+            return
+        state = {
+            "next_id": self._next_id,
+            "tasks": [
+                {
+                    **self._to_json(record),
+                    "done": self._is_done_sync(record.id),
+                    "done_at": self._done_at_json(record.id),
+                    "tags": sorted(self._tags.get(record.id, ())),
+                }
+                for record in self._tasks.values()
+            ],
+        }
+        target = os.path.join(self._path, SNAPSHOT_FILE)
+        with open(f"{target}.tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{target}.tmp", target)
+
+        if self._log is not None:
+            self._log.truncate(0)
+            self._log.seek(0)
+        self._log_lines = 0
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        if self._log is None:
+            return
+        self._log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._log.flush()
+        self._log_lines += 1
+        if self._log_lines >= self._snapshot_every:
+            self.snapshot()
+
+    # 스냅샷을 읽고, 그 뒤에 쌓인 로그를 순서대로 다시 적용한다
+    def _load(self) -> None:
+        snapshot_path = os.path.join(self._path, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as f:
+                state = json.load(f)
+            for entry in state["tasks"]:
+                self._apply({"op": "put", **entry})
+                if entry["done"]:
+                    self._apply(
+                        {"op": "done", "id": entry["id"], "at": entry.get("done_at")}
+                    )
+                if entry.get("tags"):
+                    self._apply({"op": "tag", "id": entry["id"], "tags": entry["tags"]})
+            self._next_id = max(self._next_id, state["next_id"])
+
+        log_path = os.path.join(self._path, LOG_FILE)
+        if os.path.exists(log_path):
+            with open(log_path, encoding="utf-8") as f:
+                for line in f:
+                    # 마지막 줄이 쓰다 만 상태라면 버린다
+                    if line.endswith("\n"):
+                        self._apply(json.loads(line))
+                        self._log_lines += 1
+
+    def _apply(self, entry: dict[str, Any]) -> None:
+        op, task_id = entry["op"], entry["id"]
+        if op == "put":
+            if task_id in self._tasks:
+                self._unindex(self._tasks[task_id])
+            due_date = entry["due_date"]
+            self._put(
+                TaskRecord(
+                    id=task_id,
+                    title=entry["title"],
+                    due_date=(
+                        datetime.date.fromisoformat(due_date) if due_date else None
+                    ),
+                    recurrence=entry["recurrence"],
+                    priority=entry.get("priority", 0),
+                    parent_id=entry.get("parent_id"),
+                    path=entry.get("path") or f"{task_id}/",
+                )
+            )
+        elif op == "delete":
+            if task_id in self._tasks:
+                self._delete(task_id)
+        elif op in ("tag", "untag"):
+            if task_id in self._tasks:
+                self._tag(task_id, set(entry["tags"]), op == "tag")
+        elif op == "done":
+            at = entry.get("at")
+            self._set_done(
+                task_id, True, datetime.datetime.fromisoformat(at) if at else None
+            )
+        else:
+            self._set_done(task_id, False)
+
+    # -----------------------------------------------------
+    # 메모리 구조 관리
+    # -----------------------------------------------------
+    def _put(self, record: TaskRecord) -> None:
+        self._tasks[record.id] = record
+        self._index(record)
+        self._next_id = max(self._next_id, record.id + 1)
+
+    def _delete(self, task_id: int) -> None:
+        self._unindex(self._tasks.pop(task_id))
+        self._set_done(task_id, False)
+        self._tag(task_id, self._tags.get(task_id, set()), False)
+
+    # 완료 상태를 바꾸고 로그를 남긴다 (완료 시각은 로그에도 함께 적음)
+    def _mark(self, task_id: int, done: bool) -> None:
+        if done:
+            self._set_done(task_id, True, utcnow())
+            self._append(
+                {"op": "done", "id": task_id, "at": self._done_at_json(task_id)}
+            )
+        else:
+            self._set_done(task_id, False)
+            self._append({"op": "undone", "id": task_id})
+
+    # 태그를 붙이거나(attach=True) 떼고, 태그 -> 할 일 번호 색인도 함께 고친다
+    def _tag(self, task_id: int, names: set[str], attach: bool) -> None:
+        for name in list(names):
+            if attach:
+                self._tags.setdefault(task_id, set()).add(name)
+                self._tag_index.setdefault(name, set()).add(task_id)
+            else:
+                self._tags.get(task_id, set()).discard(name)
+                self._tag_index.get(name, set()).discard(task_id)
+        if not self._tags.get(task_id, True):
+            del self._tags[task_id]
+
+    # 태그 조건에 맞는 할 일 번호 집합 (match: "all"은 교집합, "any"는 합집합)
+    def _tagged(self, names: list[str], match: str) -> set[int]:
+        sets = [self._tag_index.get(name, set()) for name in set(names)]
+        if match == "all":
+            return set.intersection(*sets)
+        return set().union(*sets)
+
+    # root 자신과 그 아래 모든 하위 할 일 (경로 앞부분이 같은 할 일)
+    def _subtree(self, root: TaskRecord) -> list[TaskRecord]:
+        prefix = task_path(root)
+        return [
+            r for r in self._tasks.values() if r is root or r.path.startswith(prefix)
+        ]
+
+    def _parent_path(self, parent_id: int | None) -> str:
+        if parent_id is None:
+            return ""
+        return task_path(self._tasks[parent_id])
+
+    def _index(self, record: TaskRecord) -> None:
+        if record.due_date is not None:
+            bisect.insort(self._due_index, (record.due_date, record.id))
+
+    def _unindex(self, record: TaskRecord) -> None:
+        if record.due_date is not None:
+            i = bisect.bisect_left(self._due_index, (record.due_date, record.id))
+            del self._due_index[i]
+
+    def _set_done(
+        self, task_id: int, done: bool, at: datetime.datetime | None = None
+    ) -> None:
+        if done:
+            self._done_at[task_id] = at or utcnow()
+        else:
+            self._done_at.pop(task_id, None)
+        byte, bit = divmod(task_id, 8)
+        if byte >= len(self._done):
+            if not done:
+                return
+            self._done.extend(bytes(byte - len(self._done) + 1))
+        if done:
+            self._done[byte] |= 1 << bit
+        else:
+            self._done[byte] &= ~(1 << bit) & 0xFF
+
+    def _is_done_sync(self, task_id: int) -> bool:
+        byte, bit = divmod(task_id, 8)
+        return byte < len(self._done) and bool(self._done[byte] >> bit & 1)
+
+    def _to_dict(self, record: TaskRecord) -> dict:
+        return {
+            "id": record.id,
+            "title": record.title,
+            "due_date": record.due_date,
+            "recurrence": record.recurrence,
+            "priority": record.priority,
+            "done": self._is_done_sync(record.id),
+            "tags": sorted(self._tags.get(record.id, ())),
+        }
+
+    def _done_at_json(self, task_id: int) -> str | None:
+        at = self._done_at.get(task_id)
+        return at.isoformat() if at else None
+
+    @staticmethod
+    def _to_json(record: TaskRecord) -> dict[str, Any]:
+        return {
+            "id": record.id,
+            "title": record.title,
+            "due_date": record.due_date.isoformat() if record.due_date else None,
+            "recurrence": record.recurrence,
+            "priority": record.priority,
+            "parent_id": record.parent_id,
+            "path": record.path,
+        }
@@ -0,0 +1,135 @@
+# ---------------------------------------------------------
+# 파일명: sql.py
+# 위치: api/repositories/sql.py
+# 이 파일은 SQLAlchemy(PostgreSQL/SQLite)로 할 일을 저장하는 저장소이다.
+# - 실제 쿼리는 지금까지처럼 api/cruds/의 함수들이 담당하고,
+#   이 클래스는 요청마다 받은 DB 세션을 들고 그 함수들을 호출하기만 한다.
+# - 큰 결과를 돌려주는 조회(목록, 달력, 하위 트리)는 결과를 읽은 즉시 연결을 돌려준다.
+#   (응답을 JSON으로 바꾸는 동안 연결을 붙잡지 않도록, api/db.py의 release_connection 참고)
+# ---------------------------------------------------------
+
+import datetime
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.cruds.done as done_crud
+import api.cruds.tag as tag_crud
+import api.cruds.task as task_crud
+import api.models.task as task_model
+import api.schemas.task as task_schema
+from api.db import release_connection
+from api.repositories.base import TaskRepository
+
+
+class SqlTaskRepository(TaskRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_tasks(
+        self,
+        tags: list[str] | None = None,
+        tag_match: str = "all",
+        limit: int | None = None,
+        offset: int = 0,
+        include_archived: bool = False,
+    ) -> list[dict]:
+        tasks = await task_crud.get_tasks_with_done(
+            self.db,
+            tags=tags,
+            tag_match=tag_match,
+            limit=limit,
+            offset=offset,
+            include_archived=include_archived,
+        )
+        await release_connection(self.db)
+        return tasks
+
+    async def count_tasks(
+        self,
+        mode: str = "exact",
+        tags: list[str] | None = None,
+        tag_match: str = "all",
+        include_archived: bool = False,
+    ) -> int:
+        return await task_crud.count_tasks(
+            self.db,
+            mode,
+            tags=tags,
+            tag_match=tag_match,
+            include_archived=include_archived,
+        )
+
+    async def get_task(self, task_id: int) -> task_model.Task | None:
+        return await task_crud.get_task(self.db, task_id=task_id)
+
+    async def create_task(self, task_create: task_schema.TaskCreate) -> task_model.Task:
+        return await task_crud.create_task(self.db, task_create)
+
+    async def update_task(
+        self, task: task_model.Task, task_create: task_schema.TaskCreate
+    ) -> task_model.Task:
+        return await task_crud.update_task(self.db, task_create, original=task)
+
+    async def delete_task(self, task_id: int) -> list[int]:
+        return await task_crud.delete_task(self.db, task_id=task_id)
+
+    async def is_done(self, task_id: int) -> bool:
+        return await done_crud.get_done(self.db, task_id=task_id) is not None
+
+    async def mark_done(self, task_id: int) -> str:
+        # 할 일이 없으면 외래키 제약, 이미 완료된 할 일이면 기본키 제약에 걸림
+        # - 실패한 트랜잭션을 되돌린 뒤 완료 기록이 있는지 보고 둘을 구분한다.
+        #   (다른 요청이 먼저 완료 처리한 경우도 여기서 "exists"가 됨)
+        try:
+            await done_crud.create_done(self.db, task_id)
+        except IntegrityError:
+            await self.db.rollback()
+            return "exists" if await self.is_done(task_id) else "not_found"
+        return "done"
+
+    async def unmark_done(self, task_id: int) -> bool:
+        done = await done_crud.get_done(self.db, task_id=task_id)
+        if done is None:
+            return False
+        await done_crud.delete_done(self.db, original=done)
+        return True
+
+    async def get_calendar(
+        self, date_from: datetime.date, date_to: datetime.date
+    ) -> list[dict]:
+        days = await task_crud.get_calendar(self.db, date_from, date_to)
+        await release_connection(self.db)
+        return days
+
+    async def get_next_tasks(self, today: datetime.date, limit: int) -> list[dict]:
+        return await task_crud.get_next_tasks(self.db, today, limit)
+
+    async def bulk_delete_tasks(
+        self, ids: list[int] | None = None, done_before: datetime.date | None = None
+    ) -> list[int]:
+        return await task_crud.bulk_delete_tasks(
+            self.db, ids=ids, done_before=done_before
+        )
+
+    async def is_in_subtree(
+        self, root: task_model.Task, candidate: task_model.Task
+    ) -> bool:
+        return task_crud.is_in_subtree(root, candidate)
+
+    async def get_subtree(self, root: task_model.Task) -> dict:
+        tree = await task_crud.get_subtree(self.db, root=root)
+        await release_connection(self.db)
+        return tree
+
+    async def mark_done_subtree(self, root: task_model.Task) -> None:
+        await done_crud.create_done_subtree(self.db, root=root)
+
+    async def unmark_done_subtree(self, root: task_model.Task) -> None:
+        await done_crud.delete_done_subtree(self.db, root=root)
+
+    async def attach_tags(self, task_ids: list[int], names: list[str]) -> list[int]:
+        return await tag_crud.attach_tags(self.db, task_ids, names)
+
+    async def detach_tags(self, task_ids: list[int], names: list[str]) -> list[int]:
+        return await tag_crud.detach_tags(self.db, task_ids, names)
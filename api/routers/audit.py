@@ -0,0 +1,33 @@
+# -----------------------------------------------------------------
+# 파일명: audit.py
+# 위치: api/routers/audit.py
+# 이 파일은 할 일의 변경 이력(감사 로그)을 조회하는 API를 정의합니다.
+# - 요청 주소: GET /tasks/{할 일 번호}/history
+# - 다음 페이지: 응답의 마지막 id를 before_id로 보냅니다.
+#   예) /tasks/3/history?limit=20&before_id=120
+# - 변경 이벤트는 백그라운드에서 모아서 저장하므로 조금 늦게(최대 약 1초) 보일 수 있습니다.
+# -----------------------------------------------------------------
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.cruds.audit as audit_crud
+import api.schemas.audit as audit_schema
+from api.db import get_db, release_connection
+
+# DB에서만 동작하는 기능이므로 SQL 저장소일 때만 앱에 등록됩니다 (api/main.py)
+router = APIRouter()
+
+
+@router.get("/tasks/{task_id}/history", response_model=list[audit_schema.AuditEntry])
+async def get_task_history(
+    task_id: int,
+    limit: int = Query(default=50, ge=1, le=500),
+    before_id: int | None = Query(default=None, ge=1),
+    db: AsyncSession = Depends(get_db, scope="function"),
+):
+    history = await audit_crud.get_history(
+        db, task_id, limit=limit, before_id=before_id
+    )
+    await release_connection(db)
+    return history
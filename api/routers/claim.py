@@ -0,0 +1,67 @@
+# -----------------------------------------------------------------
+# 파일명: claim.py
+# 위치: api/routers/claim.py
+# 이 파일은 할 일 목록을 작업 큐로 사용하는 API를 정의합니다.
+# - 기능 1: 다음 할 일 점유 (POST /tasks/claim)
+# - 기능 2: 점유 기한 연장 (POST /tasks/{할 일 번호}/heartbeat)
+# - 기능 3: 점유 반납 (DELETE /tasks/{할 일 번호}/claim?worker=...)
+# - 작업을 마치면 기존처럼 PUT /tasks/{할 일 번호}/done 으로 완료 처리합니다.
+# -----------------------------------------------------------------
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.cruds.claim as claim_crud
+import api.schemas.claim as claim_schema
+from api.db import get_db
+
+# DB에서만 동작하는 기능이므로 SQL 저장소일 때만 앱에 등록됩니다 (api/main.py)
+router = APIRouter()
+
+
+# -----------------------------------------------------------------
+# [1] 다음 할 일을 점유하는 API
+# - 아직 완료되지 않고 아무도 점유하지 않은 할 일 중 마감일이 가장 빠른 것을 줍니다.
+# - 가져갈 할 일이 없으면 204 No Content를 반환합니다.
+# -----------------------------------------------------------------
+@router.post(
+    "/tasks/claim",
+    response_model=claim_schema.ClaimedTask,
+    responses={204: {"description": "No task to claim"}},
+)
+async def claim_task(
+    body: claim_schema.ClaimRequest,
+    db: AsyncSession = Depends(get_db, scope="function"),
+):
+    task = await claim_crud.claim_next(db, body.worker, body.lease_seconds)
+    if task is None:
+        return Response(status_code=204)
+    return task
+
+
+# -----------------------------------------------------------------
+# [2] 점유 기한을 늘리는 API (heartbeat)
+# - 점유 중인 작업자가 주기적으로 호출해야 합니다.
+# - 점유자가 아니거나 기한이 이미 지났으면 409 Conflict를 반환합니다.
+# -----------------------------------------------------------------
+@router.post("/tasks/{task_id}/heartbeat", response_model=claim_schema.ClaimedTask)
+async def heartbeat(
+    task_id: int,
+    body: claim_schema.ClaimRequest,
+    db: AsyncSession = Depends(get_db, scope="function"),
+):
+    task = await claim_crud.heartbeat(db, task_id, body.worker, body.lease_seconds)
+    if task is None:
+        raise HTTPException(status_code=409, detail="Claim not held")
+    return task
+
+
+# -----------------------------------------------------------------
+# [3] 점유를 반납하는 API
+# -----------------------------------------------------------------
+@router.delete("/tasks/{task_id}/claim", response_model=None)
+async def release_claim(
+    task_id: int, worker: str, db: AsyncSession = Depends(get_db, scope="function")
+):
+    if not await claim_crud.release(db, task_id, worker):
+        raise HTTPException(status_code=409, detail="Claim not held")
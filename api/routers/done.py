@@ -14,20 +14,18 @@ from fastapi import APIRouter, HTTPException, Depends
 # - HTTPException: 오류가 발생했을 때 사용저에게 에러 응답을 보내는 데 사용
 # - Depends: 다른 함수(DB 접속 등)에 자동으로 연결해주는 도구
 
-# SQLAlchemy의 비동기 DB 세션을 불러옵니다
-from sqlalchemy.ext.asyncio import AsyncSession
-
-# - DB와 연결할 때 비동기 방식으로 작업하기 위해 필요
-
 # 완료 기능에 필요한 스키마(입출력 형식)를 불러옵니다
 import api.schemas.done as done_schema
 
-# 완료 기능을 처리하는 CRUD 함수들을 불러옵니다
-import api.cruds.done as done_crud
+# 할 일 저장소와, 저장소를 자동으로 주입해주는 함수 (파일 위치: api/repositories/)
+# - SQL 저장소는 내부에서 완료 CRUD 함수(api/cruds/done.py)를 호출합니다
+from api.repositories import TaskRepository, get_repo
 
-# DB 접속에 필요한 함수 (FastAPI에서 의존성 주입에 사용)
-from api.db import get_db
+# 완료/취소 기록을 감사 로그로 남깁니다 (파일 위치: api/audit.py)
+from api import audit
 
+# 완료된 할 일은 마감 알림에서 빼고, 완료를 취소하면 다시 넣습니다 (파일 위치: api/reminder.py)
+from api import reminder
 
 # -----------------------------------------------------------------
 # router 객체 생성
@@ -45,15 +43,38 @@ router = APIRouter()
 # -----------------------------------------------------------------
 @router.put("/tasks/{task_id}/done", response_model=done_schema.DoneResponse)
 # task_id는 URL에서 전달받은 숫자 (예: 3번 할 일)
-# db는 비동기 DB세션, Depends를 통해 자동으로 주입됨
-async def mark_task_as_done(task_id: int, db: AsyncSession = Depends(get_db)):
-    # 먼저 해당 할 일이 이미 완료되었는지 확인합니다
-    done = await done_crud.get_done(db, task_id=task_id)
-    if done is not None:
+# repo는 할 일 저장소, Depends를 통해 자동으로 주입됨
+# cascade=true 이면 하위 할 일까지 한 번에 완료 처리합니다 (예: /tasks/3/done?cascade=true)
+async def mark_task_as_done(
+    task_id: int,
+    cascade: bool = False,
+    repo: TaskRepository = Depends(get_repo),
+    actor: str | None = Depends(audit.get_actor),
+):
+    if cascade:
+        task = await repo.get_task(task_id)
+        if task is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+
+        # 하위 트리 중 아직 완료되지 않은 할 일만 한 번의 INSERT로 완료 처리합니다
+        await repo.mark_done_subtree(task)
+        audit.emit("done", task_id, actor, {"cascade": True})
+        reminder.scheduler.refresh()
+        return done_schema.DoneResponse(id=task_id)
+
+    # 새로 완료로 저장합니다
+    # - 할 일이 없으면 404, 이미 완료된 할 일이면 400으로 알려줍니다
+    #   (SQL 저장소는 외래키/기본키 제약으로 확인하므로, 같은 할 일을 동시에
+    #    완료 처리한 두 요청 중 늦은 쪽도 400을 받습니다)
+    outcome = await repo.mark_done(task_id)
+    if outcome == "not_found":
+        raise HTTPException(status_code=404, detail="Task not found")
+    if outcome == "exists":
         raise HTTPException(status_code=400, detail="Done already exists")
 
-    # 완료되지 않았다면 새로 완료로 저장합니다
-    return await done_crud.create_done(db, task_id)
+    audit.emit("done", task_id, actor)
+    reminder.scheduler.remove(task_id)
+    return done_schema.DoneResponse(id=task_id)
 
 
 # -----------------------------------------------------------------
@@ -63,12 +84,29 @@ async def mark_task_as_done(task_id: int, db: AsyncSession = Depends(get_db)):
 #   (3번 할 일을 완료 취소한다는 의미)
 # -----------------------------------------------------------------
 @router.delete("/tasks/{task_id}/done", response_model=None)
-async def remove_task_as_done(task_id: int, db: AsyncSession = Depends(get_db)):
-    # 먼저 완료 상태인지 확인합니다
-    done = await done_crud.get_done(db, task_id=task_id)
-    if done is None:
+# cascade=true 이면 하위 할 일의 완료 상태까지 한 번에 해제합니다
+async def remove_task_as_done(
+    task_id: int,
+    cascade: bool = False,
+    repo: TaskRepository = Depends(get_repo),
+    actor: str | None = Depends(audit.get_actor),
+):
+    if cascade:
+        task = await repo.get_task(task_id)
+        if task is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+
+        # 하위 트리의 완료 기록을 한 번의 DELETE로 삭제합니다
+        await repo.unmark_done_subtree(task)
+        audit.emit("undone", task_id, actor, {"cascade": True})
+        reminder.scheduler.refresh()
+        return
+
+    # 완료 상태라면 삭제 (완료 해제)
+    if not await repo.unmark_done(task_id):
         # 완료 상태가 아니라면 삭제할 것이 없으므로 예외 발생
         raise HTTPException(status_code=404, detail="Done not found")
 
-    # 완료 상태라면 삭제 (완료 해제)
-    return await done_crud.delete_done(db, original=done)
+    audit.emit("undone", task_id, actor)
+    # 완료를 취소한 할 일의 제목/마감일은 모르므로 알림 기간을 다시 읽음
+    reminder.scheduler.refresh()
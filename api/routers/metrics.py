@@ -0,0 +1,17 @@
+# -----------------------------------------------------------------
+# 파일명: metrics.py
+# 위치: api/routers/metrics.py
+# 이 파일은 앱 내부 메트릭(api/metrics.py)을 조회하는 API를 정의합니다.
+# - 요청 주소: GET /metrics
+# -----------------------------------------------------------------
+
+from fastapi import APIRouter
+
+from api import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_model=dict[str, float])
+async def get_metrics():
+    return metrics.snapshot()
@@ -0,0 +1,119 @@
+# -----------------------------------------------------------------
+# 파일명: occurrence.py
+# 위치: api/routers/occurrence.py
+# 이 파일은 반복 할 일의 발생(occurrence)을 다루는 API를 정의합니다.
+# - 기능 1: 기간 안의 발생 목록 (GET /tasks/occurrences?from=...&to=...)
+# - 기능 2: 특정 날짜의 발생 완료 / 완료 취소 (PUT, DELETE .../done)
+# - 기능 3: 특정 날짜의 발생만 제목 바꾸기 (PUT /tasks/{id}/occurrences/{날짜})
+# -----------------------------------------------------------------
+
+import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.cruds.occurrence as occurrence_crud
+import api.cruds.task as task_crud
+import api.schemas.occurrence as occurrence_schema
+from api.db import get_db, release_connection
+from api import audit
+
+# DB에서만 동작하는 기능이므로 SQL 저장소일 때만 앱에 등록됩니다 (api/main.py)
+router = APIRouter()
+
+# 한 번에 조회할 수 있는 최대 기간 (일)
+MAX_WINDOW_DAYS = 366
+
+
+# -----------------------------------------------------------------
+# [1] 기간 안의 발생 목록을 날짜순으로 돌려주는 API
+# - 예: /tasks/occurrences?from=2025-05-01&to=2025-05-31
+# -----------------------------------------------------------------
+@router.get("/tasks/occurrences", response_model=list[occurrence_schema.Occurrence])
+async def list_occurrences(
+    date_from: datetime.date = Query(alias="from"),
+    date_to: datetime.date = Query(alias="to"),
+    db: AsyncSession = Depends(get_db, scope="function"),
+):
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= MAX_WINDOW_DAYS:
+        raise HTTPException(status_code=400, detail="Date window is too large")
+
+    occurrences = await occurrence_crud.list_occurrences(db, date_from, date_to)
+    await release_connection(db)
+    return occurrences
+
+
+# -----------------------------------------------------------------
+# 반복 할 일과 날짜를 확인하는 공통 함수
+# - 할 일이 없거나, 그 날짜가 발생일이 아니면 404
+# -----------------------------------------------------------------
+async def _get_recurring_task(db: AsyncSession, task_id: int, day: datetime.date):
+    task = await task_crud.get_task(db, task_id=task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not occurrence_crud.is_task_occurrence(task, day):
+        raise HTTPException(status_code=404, detail="Occurrence not found")
+    return task
+
+
+# -----------------------------------------------------------------
+# [2] 특정 날짜의 발생을 완료 처리하는 API
+# - 예: PUT /tasks/3/occurrences/2025-05-05/done
+# -----------------------------------------------------------------
+@router.put(
+    "/tasks/{task_id}/occurrences/{day}/done",
+    response_model=occurrence_schema.Occurrence,
+)
+async def mark_occurrence_done(
+    task_id: int,
+    day: datetime.date,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    actor: str | None = Depends(audit.get_actor),
+):
+    task = await _get_recurring_task(db, task_id, day)
+    occurrence = await occurrence_crud.update_occurrence(db, task, day, done=True)
+    audit.emit("occurrence_done", task_id, actor, {"date": day})
+    return occurrence
+
+
+# -----------------------------------------------------------------
+# [3] 특정 날짜의 발생의 완료를 취소하는 API
+# -----------------------------------------------------------------
+@router.delete(
+    "/tasks/{task_id}/occurrences/{day}/done",
+    response_model=occurrence_schema.Occurrence,
+)
+async def remove_occurrence_done(
+    task_id: int,
+    day: datetime.date,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    actor: str | None = Depends(audit.get_actor),
+):
+    task = await _get_recurring_task(db, task_id, day)
+    occurrence = await occurrence_crud.update_occurrence(db, task, day, done=False)
+    audit.emit("occurrence_undone", task_id, actor, {"date": day})
+    return occurrence
+
+
+# -----------------------------------------------------------------
+# [4] 특정 날짜의 발생만 제목을 바꾸는 API
+# -----------------------------------------------------------------
+@router.put(
+    "/tasks/{task_id}/occurrences/{day}",
+    response_model=occurrence_schema.Occurrence,
+)
+async def update_occurrence(
+    task_id: int,
+    day: datetime.date,
+    body: occurrence_schema.OccurrenceUpdate,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    actor: str | None = Depends(audit.get_actor),
+):
+    task = await _get_recurring_task(db, task_id, day)
+    occurrence = await occurrence_crud.update_occurrence(
+        db, task, day, title=body.title
+    )
+    audit.emit("occurrence_update", task_id, actor, {"date": day, "title": body.title})
+    return occurrence
@@ -0,0 +1,50 @@
+# -----------------------------------------------------------------
+# 파일명: tag.py
+# 위치: api/routers/tag.py
+# 이 파일은 여러 할 일에 태그(라벨)를 한 번에 붙이거나 떼는 API를 정의합니다.
+# - 기능 1: 태그 붙이기 (POST /tasks/tags/attach)
+# - 기능 2: 태그 떼기 (POST /tasks/tags/detach)
+# - 태그로 목록을 거르는 기능은 GET /tasks?tag=...에 있습니다. (api/routers/task.py)
+# -----------------------------------------------------------------
+
+from fastapi import APIRouter, Depends
+
+import api.schemas.tag as tag_schema
+from api.repositories import TaskRepository, get_repo
+from api import audit
+
+router = APIRouter()
+
+
+# -----------------------------------------------------------------
+# [1] 여러 할 일에 여러 태그를 한 번에 붙이는 API
+# - 예: {"task_ids": [1, 2], "tags": ["집", "급함"]} -> 최대 4쌍이 붙음
+# - 이미 붙어 있는 태그나 없는 할 일은 건너뜁니다.
+# -----------------------------------------------------------------
+@router.post("/tasks/tags/attach", response_model=tag_schema.TagBulkResult)
+async def attach_tags(
+    body: tag_schema.TagBulk,
+    repo: TaskRepository = Depends(get_repo),
+    actor: str | None = Depends(audit.get_actor),
+):
+    attached = await repo.attach_tags(body.task_ids, body.tags)
+    # 실제로 태그가 새로 붙은 할 일만 기록합니다
+    for task_id in sorted(set(attached)):
+        audit.emit("tag", task_id, actor, {"tags": body.tags})
+    return tag_schema.TagBulkResult(affected=len(attached))
+
+
+# -----------------------------------------------------------------
+# [2] 여러 할 일에서 여러 태그를 한 번에 떼는 API
+# -----------------------------------------------------------------
+@router.post("/tasks/tags/detach", response_model=tag_schema.TagBulkResult)
+async def detach_tags(
+    body: tag_schema.TagBulk,
+    repo: TaskRepository = Depends(get_repo),
+    actor: str | None = Depends(audit.get_actor),
+):
+    detached = await repo.detach_tags(body.task_ids, body.tags)
+    # 실제로 태그가 떨어진 할 일만 기록합니다
+    for task_id in sorted(set(detached)):
+        audit.emit("untag", task_id, actor, {"tags": body.tags})
+    return tag_schema.TagBulkResult(affected=len(detached))
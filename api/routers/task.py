@@ -7,24 +7,34 @@
 # ------------------------------------------------------------
 
 # FastAPI에서 여러 개의 URL 경로를 그룹으로 묶어 관리할 수 있게 해주는 도구
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+# - Query: URL의 쿼리 문자열(?tag=a&tag=b)을 받을 때 사용
+# - Response: 응답 헤더(X-Total-Count 등)를 설정할 때 사용
+from typing import Literal
+import datetime
 
 # - APIRouter: 기능별로 URL을 나눠 관리할 수 있게 해줌 (예: /tasks, /users 등)
 # - Depends: 다른 함수(예: DB 연결)를 자동으로 실행하고 주입해주는 도구
 
-# * SQLAlchemy의 비동기 세션을 사용하기 위한 도구
-from sqlalchemy.ext.asyncio import AsyncSession
+# * 할 일 저장소(repository)를 불러온다 (파일 위치: api/repositories/)
+# - TaskRepository: 할 일 저장/조회 기능을 모아 둔 인터페이스
+#   (DB에 저장하는 SqlTaskRepository, 메모리에 저장하는 MemoryTaskRepository가 있음)
+# - get_repo: REPO_BACKEND 설정에 맞는 저장소를 Depends로 주입해주는 함수
+#   (SQL 저장소는 내부에서 get_db()로 비동기 DB 세션을 받아 api/cruds/의 함수를 호출함)
+from api.repositories import TaskRepository, get_repo
 
-# - AsyncSession: await를 사용하는 비동기 DB 작업에 사용됨
+# * 감사 로그(누가 무엇을 바꿨는지)를 남기기 위한 모듈 (파일 위치: api/audit.py)
+# - emit(): 변경 이벤트를 큐에 넣기만 하고, 저장은 백그라운드에서 한꺼번에 함
+# - get_actor(): X-Actor 헤더로 요청한 사람을 알아냄
+from api import audit
 
-# * 우리가 만든 CRUD 함수들을 불러온다 (파일 위치: api/cruds/task.py)
-# - 여기에 create_task, update_task 같은 실제 DB 작업 함수를 정의되어 있음
-import api.cruds.task as task_crud
+# * "다음에 할 일"에서 마감일이 지났는지 판단할 오늘 날짜(UTC)를 구할 때 사용
+from api.db import utcnow
 
-# * DB 세션을 자동으로 가져오기 위한 함수 (파일 위치: api/db.py)
-# - FastAPI에서 Depends로 연결할 수 있게 준비해둔 함수
-# -  비동기 세션(AsyncSession)을 반환함
-from api.db import get_db
+# * 마감 알림 스케줄러 (파일 위치: api/reminder.py)
+# - 할 일이 바뀌면 알려줘서, 스케줄러가 DB를 다시 읽지 않고 알림 목록을 고치게 함
+from api import reminder
 
 # * 우리가 정의한 데이터 구조를 불러온다 (파일 위치: api/schemas/task.py)
 # - Task: 전체 할 일 데이터를 표현
@@ -37,6 +47,22 @@ import api.schemas.task as task_schema
 #   나중에 main.py에서 FastAPI 앱에 등록하게 된다.
 router = APIRouter()
 
+# 달력 조회에서 한 번에 조회할 수 있는 최대 기간 (일)
+MAX_CALENDAR_DAYS = 366
+
+# 다음에 할 일 조회에서 한 번에 가져올 수 있는 최대 개수
+MAX_NEXT_TASKS = 100
+
+
+# * 보관된 할 일에는 태그가 없으므로, 태그 필터와 include_archived를 함께 쓰면
+#   보관된 할 일이 말없이 빠지게 된다 -> 400으로 거절함
+def check_archived_filter(tag: list[str] | None, include_archived: bool) -> None:
+    if tag and include_archived:
+        raise HTTPException(
+            status_code=400,
+            detail="include_archived cannot be combined with tag filters",
+        )
+
 
 # ----------------------------------------------------------------
 # [1]할 일 목록 조회(GET 방식)
@@ -47,7 +73,35 @@ router = APIRouter()
 @router.get("/tasks", response_model=list[task_schema.Task])
 # - response_model: 응답의 데이터 형태를 지정함
 # - 여기서는 Task 모델을 여러 개 담은 리스트를 반환한다고 지정함
-async def list_tasks(db: AsyncSession = Depends(get_db)):
+# - tag: 태그로 거르기 (여러 번 쓸 수 있음, 예: /tasks?tag=집&tag=급함)
+# - tag_match: "all"이면 모든 태그가 붙은 할 일(AND), "any"면 하나라도 붙은 할 일(OR)
+# - limit, offset: 페이지 나누기 (예: /tasks?limit=20&offset=40 -> 3페이지)
+# - count: 전체 개수를 X-Total-Count 헤더로 함께 보냄
+#   - "exact": 정확한 개수 / "estimated": DB 통계로 즉시 추정한 개수
+#   - 보내지 않으면 개수를 세지 않음 (목록만 필요할 때 비용을 줄임)
+# - include_archived: true이면 보관된(오래전에 완료된) 할 일도 함께 보여줌
+#   (보관된 할 일에는 태그가 없으므로 tag와 함께 쓰면 400)
+async def list_tasks(
+    response: Response,
+    tag: list[str] | None = Query(default=None),
+    tag_match: Literal["all", "any"] = "all",
+    limit: int | None = Query(default=None, ge=1),
+    offset: int = Query(default=0, ge=0),
+    count: Literal["exact", "estimated"] | None = None,
+    include_archived: bool = False,
+    repo: TaskRepository = Depends(get_repo),
+):
+    check_archived_filter(tag, include_archived)
+
+    if count is not None:
+        total = await repo.count_tasks(
+            count,
+            tags=tag,
+            tag_match=tag_match,
+            include_archived=include_archived,
+        )
+        response.headers["X-Total-Count"] = str(total)
+
     # * async: 이 함수는 '비동기 함수'임
     #   - 비동기 함수는 DB와 통신 같은 시간이 오래 걸리는 작업울
     #     기다리지 않고도 다른 작업을 처리할 수 있게 해줌
@@ -55,12 +109,78 @@ async def list_tasks(db: AsyncSession = Depends(get_db)):
 
     # * await: 시간이 오래 걸리는 작업을 '기다렸다가' 실행을 이어감
     #   - 여기서는 DB 조회 작업을 기다리는 데 사용함
-    return await task_crud.get_tasks_with_done(db)
+    return await repo.list_tasks(
+        tags=tag,
+        tag_match=tag_match,
+        limit=limit,
+        offset=offset,
+        include_archived=include_archived,
+    )
     # * 실제 DB에서 모든 할 일을 가져오고, 각 할 일이 완료되었는지도 함께 반환함
     # * 완료여부는 'Done 테이블에 해당 할 일이 있는지'로 판단
     #   (외부 조인이라는 방식으로 처리됨 - 모든 할 일을 보여주되, 완료된 것도 함께 표시함)
 
 
+# ----------------------------------------------------------------
+# [1-1] 할 일 개수만 조회 (HEAD 방식)
+# - 응답 본문 없이 X-Total-Count 헤더만 돌려준다.
+# - 목록 전체를 내려받지 않고 "N개"만 보여주고 싶을 때 사용한다.
+# - 예: HEAD /tasks?count=estimated
+# ----------------------------------------------------------------
+@router.head("/tasks", response_model=None)
+async def count_tasks(
+    tag: list[str] | None = Query(default=None),
+    tag_match: Literal["all", "any"] = "all",
+    count: Literal["exact", "estimated"] = "exact",
+    include_archived: bool = False,
+    repo: TaskRepository = Depends(get_repo),
+):
+    check_archived_filter(tag, include_archived)
+
+    total = await repo.count_tasks(
+        count, tags=tag, tag_match=tag_match, include_archived=include_archived
+    )
+    return Response(headers={"X-Total-Count": str(total)})
+
+
+# ----------------------------------------------------------------
+# [1-2] 달력 조회 (GET 방식)
+# - 기간 안의 할 일을 마감일별로 묶어서 반환한다.
+# - 예: /tasks/calendar?from=2025-05-01&to=2025-05-31 (5월 한 달)
+# - 날짜별 개수와 완료 개수는 DB에서 계산해서 함께 보내준다.
+# - 반복 할 일은 나오지 않는다. 반복 할 일이 기간 안에 언제 나오는지는
+#   GET /tasks/occurrences?from=...&to=... 로 조회한다.
+# ----------------------------------------------------------------
+@router.get("/tasks/calendar", response_model=list[task_schema.CalendarDay])
+async def get_calendar(
+    date_from: datetime.date = Query(alias="from"),
+    date_to: datetime.date = Query(alias="to"),
+    repo: TaskRepository = Depends(get_repo),
+):
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail="Date window is too large")
+
+    return await repo.get_calendar(date_from, date_to)
+
+
+# ----------------------------------------------------------------
+# [1-3] 다음에 할 일 (GET 방식)
+# - 아직 완료되지 않은 일반(반복 아님) 할 일을 "먼저 할 순서"대로 limit개 보여준다.
+#   마감일이 지난 할 일 -> 마감일이 가까운 할 일 -> 마감일 없는 할 일,
+#   마감일이 같으면 우선순위(priority)가 높은 할 일이 먼저 나온다.
+# - 예: /tasks/next?limit=5
+# - 전체 목록을 정렬하지 않고 같은 순서로 정렬된 인덱스에서 앞의 limit개만 읽는다.
+# ----------------------------------------------------------------
+@router.get("/tasks/next", response_model=list[task_schema.NextTask])
+async def get_next_tasks(
+    limit: int = Query(default=10, ge=1, le=MAX_NEXT_TASKS),
+    repo: TaskRepository = Depends(get_repo),
+):
+    return await repo.get_next_tasks(utcnow().date(), limit)
+
+
 # -------------------------------------------------------------
 # [2] 할 일 추가 (POST 방식)
 # - 사용자가 할 일 하나를 JSON으로 보내면 서버가 저장해줍니다.
@@ -71,19 +191,30 @@ async def list_tasks(db: AsyncSession = Depends(get_db)):
 # - task_body: 사용자가 보낸 데이터 요청 본문
 # - TaskCreate: 사용자가 보낸 데이터(title만 포함됨)
 # - TaskCreateResponse: 응답할 때 포함한 데이터(id 포함)
-# - db: FastAPI가 get_db() 함수를 통해 자동으로 주입하는 DB 세션 객체
+# - repo: FastAPI가 get_repo() 함수를 통해 자동으로 주입하는 저장소 객체
 async def create_task(
-    task_body: task_schema.TaskCreate, db: AsyncSession = Depends(get_db)
+    task_body: task_schema.TaskCreate,
+    repo: TaskRepository = Depends(get_repo),
+    actor: str | None = Depends(audit.get_actor),
 ):
-    return await task_crud.create_task(db, task_body)
-    # * crud 모듈의 create_task() 함수를 호출하여 실제 DB에 저장함
+    # * 상위 할 일을 지정했다면 그 할 일이 실제로 있는지 먼저 확인함
+    if task_body.parent_id is not None:
+        if await repo.get_task(task_body.parent_id) is None:
+            raise HTTPException(status_code=404, detail="Parent task not found")
+
+    created = await repo.create_task(task_body)
+    audit.emit("create", created.id, actor, task_body.model_dump())
+    reminder.scheduler.add(created)
+    return created
+    # * 저장소의 create_task()를 호출하여 실제로 저장함 (SQL 저장소는 crud 모듈을 사용)
     # * 저장 후 생성된 할 일 (Task)을 반환하며, 그 안에는 id가 포함됨
     #   (예: TaskCreateResponse(id=1, title="책 읽기"))
     #
-    # * db: get_db() 함수를 통해 생성된 SQLAlchemy 비동기 세션이 자동으로 들어옴
+    # * repo: get_repo() 함수를 통해 만들어진 저장소가 자동으로 들어옴
     #   - FastAPI의 Depends를 사용해 '의존성 주입(Dependency Injection)' 방식으로 처리함
     #   - 함수 안에서 직접 DB 연결을 만들지 않아도 되므로 코드가 더 유연하고 테스트하기 쉬워짐
     #   - 테스트 시에는 get_db 함수를 오버라이드해서 가짜 DB나 테스트용 DB를 넣을 수 있음
+    #     (get_repo를 오버라이드하면 메모리 저장소로도 같은 API를 시험할 수 있음)
     #
     # * 이 구조는 DB 작업(비즈니스 로직)은 crud.py에 따로 만들고,
     #   이 함수는 요청 받고 응답하는 역할만 담당하도록 나눠서 구성함
@@ -102,9 +233,12 @@ async def create_task(
 
 
 async def update_task(
-    task_id: int, task_body: task_schema.TaskCreate, db: AsyncSession = Depends(get_db)
+    task_id: int,
+    task_body: task_schema.TaskCreate,
+    repo: TaskRepository = Depends(get_repo),
+    actor: str | None = Depends(audit.get_actor),
 ):
-    task = await task_crud.get_task(db, task_id=task_id)
+    task = await repo.get_task(task_id)
     # * DB에서 해당 task_id에 맞는 Task를 조회함
 
     # * if: 조건문 -> 특정 조건이 참(True)이면 아래 코드를 실행함
@@ -115,7 +249,34 @@ async def update_task(
         #     클라이언트에 "할 일을 찾을 수 없음"이라는 에러 응답을 보냄
         raise HTTPException(status_code=404, detail="Task not found")
 
-    return await task_crud.update_task(db, task_body, original=task)
+    # * 마감일은 요청에 없으면 지워지므로, 반복 할 일은 시작일이 없어지지 않는지 확인함
+    #   (반복을 함께 끄려면 "recurrence": null을 보냄)
+    recurrence = (
+        task_body.recurrence
+        if "recurrence" in task_body.model_fields_set
+        else task.recurrence
+    )
+    if recurrence is not None and task_body.due_date is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Recurring tasks need a due_date as their first occurrence",
+        )
+
+    # * 상위 할 일을 바꾸려는 경우: 새 상위 할 일이 있는지,
+    #   자기 자신이나 자기 하위 할 일 아래로 옮기려는 것은 아닌지 확인함
+    if "parent_id" in task_body.model_fields_set and task_body.parent_id is not None:
+        parent = await repo.get_task(task_body.parent_id)
+        if parent is None:
+            raise HTTPException(status_code=404, detail="Parent task not found")
+        if await repo.is_in_subtree(task, parent):
+            raise HTTPException(
+                status_code=400, detail="Cannot move a task under its own subtree"
+            )
+
+    updated = await repo.update_task(task, task_body)
+    audit.emit("update", task_id, actor, task_body.model_dump(exclude_unset=True))
+    reminder.scheduler.update(updated)
+    return updated
     # * 기존 Task 객체(original)의 title을 수정하고, 수정된 결과를 반환함
 
 
@@ -127,22 +288,63 @@ async def update_task(
 @router.delete("/tasks/{task_id}", response_model=None)
 # - task_id: 삭제할 일의 번호
 # - response_model이 없으므로 별도 응답내용 없이 처이 가능 (204 No Content)
-async def delete_task(task_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_task(
+    task_id: int,
+    repo: TaskRepository = Depends(get_repo),
+    actor: str | None = Depends(audit.get_actor),
+):
     # * async: 이 함수가 '비동기 함수'임을 나타냄
     #   - DB와 통신하는 동안 서버가 멈추지 않고 다른 요청도 처리할 수 있음
     #   - FastAPI는 동시에 많은 요청을 빠르게 처리하기 위해 async 사용을 권장함
 
-    task = await task_crud.get_task(db, task_id=task_id)
-    # * await: 시간이 걸리는 작업(DB 조회)이 끝낭 때까지 잠깐 기다림
-    #   - 비동기 DB 세션에서는 데이터를 읽거나 쓸 때 항상 await를 붙여야 함
+    deleted = await repo.delete_task(task_id)
+    # * await: 시간이 걸리는 작업(DB 삭제)이 끝낭 때까지 잠깐 기다림
+    #   - 하위 할 일도 함께 삭제되고, 삭제된 할 일 번호가 모두 돌아옴
+    #   - 완료 기록과 태그 연결 등은 DB가 ON DELETE CASCADE로 함께 삭제함
 
     # * if: 조건문 -> 특정 조건이 참일 때만 아래 코드를 실행함
-    if task is None:
+    if not deleted:
         # * raise: 오류(예외)를 의도적으로 발생시킴
         #   - 해당 Task가 DB에 존제하지 않으면 404 Not Found 오류 발생
         #   - FastAPI는 이 오류를 받아서 클라이언트에 에러 응답을 자동으로 전송함
         raise HTTPException(status_code=404, detail="Task not found")
 
-    return await task_crud.delete_task(db, original=task)
-    # * 실제 구현에서는 crud.py의 삭제 함수를 호출하고,
-    #   성공 시 상태 코드(예: 204)니 메시지를 응답으로 보낼 수 있음
+    # 하위 할 일까지, 지워진 할 일마다 감사 로그를 남기고 알림 목록에서 뺌
+    for deleted_id in deleted:
+        audit.emit("delete", deleted_id, actor)
+        reminder.scheduler.remove(deleted_id)
+
+
+# ---------------------------------------------------------------
+# [4-1] 여러 할 일 한 번에 삭제 (POST 요청)
+# - id 목록이나 조건(예: 이 날짜 이전에 완료된 할 일)으로 삭제한다.
+# - 한 건씩 지우지 않고, 묶음(batch) 단위의 DELETE 문으로 처리한다.
+# ---------------------------------------------------------------
+@router.post("/tasks/bulk-delete", response_model=task_schema.TaskBulkDeleteResult)
+async def bulk_delete_tasks(
+    body: task_schema.TaskBulkDelete,
+    repo: TaskRepository = Depends(get_repo),
+    actor: str | None = Depends(audit.get_actor),
+):
+    deleted = await repo.bulk_delete_tasks(ids=body.ids, done_before=body.done_before)
+    # 한 건 삭제와 같이, 하위 할 일까지 실제로 지워진 할 일마다 감사 로그를 남김
+    # (없는 번호나 done_before 조건에 맞지 않아 남은 할 일은 기록하지 않음)
+    for task_id in deleted:
+        audit.emit("delete", task_id, actor)
+    reminder.scheduler.refresh()
+    return task_schema.TaskBulkDeleteResult(deleted=len(deleted))
+
+
+# ---------------------------------------------------------------
+# [5] 하위 트리 조회 (GET 요청)
+# - task_id 할 일과 그 아래 모든 하위 할 일을 트리 형태로 반환한다.
+# - 깊이와 상관없이 DB 쿼리는 한 번만 실행된다 (path LIKE 'prefix%').
+# - 각 노드에 완료 집계(total, done_count, percent_complete)가 포함된다.
+# ---------------------------------------------------------------
+@router.get("/tasks/{task_id}/subtree", response_model=task_schema.TaskTree)
+async def get_subtree(task_id: int, repo: TaskRepository = Depends(get_repo)):
+    task = await repo.get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return await repo.get_subtree(task)
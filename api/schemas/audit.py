@@ -0,0 +1,32 @@
+# -----------------------------------------------------------------
+# 파일명: audit.py
+# 위치: api/schemas/audit.py
+# 이 파일은 할 일 변경 이력(감사 로그) 조회에 쓰는 데이터 형식을 정의합니다.
+# -----------------------------------------------------------------
+
+import datetime
+import json
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+# -----------------------------------------------------------------
+# AuditEntry 클래스
+# - 변경 기록 하나를 나타냅니다.
+# - changes는 DB에 JSON 문자열로 저장되어 있으므로 객체로 풀어서 돌려줍니다.
+# -----------------------------------------------------------------
+class AuditEntry(BaseModel):
+    id: int
+    task_id: int | None
+    action: str
+    actor: str | None
+    changes: dict[str, Any] | None
+    created_at: datetime.datetime  # UTC 기준
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("changes", mode="before")
+    @classmethod
+    def load_changes(cls, value):
+        return json.loads(value) if isinstance(value, str) else value
@@ -0,0 +1,30 @@
+# -----------------------------------------------------------------
+# 파일명: claim.py
+# 위치: api/schemas/claim.py
+# 이 파일은 작업 큐(할 일 점유) API에서 주고받는 데이터 형식을 정의합니다.
+# -----------------------------------------------------------------
+
+import datetime
+
+from pydantic import BaseModel, Field
+
+import api.schemas.task as task_schema
+
+
+# -----------------------------------------------------------------
+# ClaimRequest 클래스
+# - 할 일을 점유하거나 점유 기한을 늘릴 때 보내는 요청 형식입니다.
+# - 예: {"worker": "agent-1", "lease_seconds": 60}
+# -----------------------------------------------------------------
+class ClaimRequest(BaseModel):
+    worker: str = Field(min_length=1, max_length=255, examples=["agent-1"])
+    lease_seconds: int = Field(default=60, ge=1, le=3600)  # 점유 기한(초)
+
+
+# -----------------------------------------------------------------
+# ClaimedTask 클래스
+# - 점유한 할 일의 정보와 점유 상태(누가, 언제까지)를 돌려줍니다.
+# -----------------------------------------------------------------
+class ClaimedTask(task_schema.TaskCreateResponse):
+    claimed_by: str
+    lease_expires_at: datetime.datetime  # UTC 기준
@@ -0,0 +1,31 @@
+# -----------------------------------------------------------------
+# 파일명: occurrence.py
+# 위치: api/schemas/occurrence.py
+# 이 파일은 반복 할 일의 발생(occurrence) 조회/수정에 쓰는 데이터 형식을 정의합니다.
+# -----------------------------------------------------------------
+
+import datetime
+
+from pydantic import BaseModel, Field
+
+
+# -----------------------------------------------------------------
+# Occurrence 클래스
+# - 특정 날짜에 해야 할 일 하나를 나타냅니다.
+# - recurring=True 이면 반복 할 일에서 계산된 발생이고,
+#   False 이면 그 날짜가 마감일인 일반 할 일입니다.
+# -----------------------------------------------------------------
+class Occurrence(BaseModel):
+    task_id: int
+    date: datetime.date
+    title: str | None
+    done: bool
+    recurring: bool
+
+
+# -----------------------------------------------------------------
+# OccurrenceUpdate 클래스
+# - 반복 할 일의 특정 날짜에만 다른 제목을 쓰고 싶을 때 보냅니다.
+# -----------------------------------------------------------------
+class OccurrenceUpdate(BaseModel):
+    title: str = Field(examples=["이번 주만 오후에 회의"])
@@ -0,0 +1,31 @@
+# -----------------------------------------------------------------
+# 파일명: tag.py
+# 위치: api/schemas/tag.py
+# 이 파일은 태그(라벨)를 여러 할 일에 한 번에 붙이거나 뗄 때
+# 주고받는 데이터 형식을 정의합니다.
+# -----------------------------------------------------------------
+
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+# 태그 이름: 1~64글자 (DB의 tags.name 컬럼 길이와 같음)
+TagName = Annotated[str, Field(min_length=1, max_length=64)]
+
+
+# -----------------------------------------------------------------
+# TagBulk 클래스
+# - 여러 할 일(task_ids)에 여러 태그(tags)를 한 번에 붙이거나 뗄 때 사용합니다.
+# - 예: {"task_ids": [1, 2, 3], "tags": ["집", "급함"]}
+# -----------------------------------------------------------------
+class TagBulk(BaseModel):
+    task_ids: list[int] = Field(min_length=1, examples=[[1, 2, 3]])
+    tags: list[TagName] = Field(min_length=1, examples=[["집", "급함"]])
+
+
+# -----------------------------------------------------------------
+# TagBulkResult 클래스
+# - 실제로 붙거나 떨어진 (할 일, 태그) 쌍의 개수를 돌려줍니다.
+# -----------------------------------------------------------------
+class TagBulkResult(BaseModel):
+    affected: int
@@ -6,7 +6,10 @@
 import datetime  # 데이터를 깔끔하게 다루기 위한 도구를 불러온다.
 
 # pydantic: 우리가 정의한 자료가 숫자인지 글자인지 자동으로 확인해주는 도구다.
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+
+# 반복 규칙(RRULE)을 해석하는 도구 (api/recurrence.py)
+from api.recurrence import parse_rule
 
 
 # ----------------------------------------------------
@@ -26,6 +29,28 @@ class TaskBase(BaseModel):  # '할 일'을 표현할 수 있는 Task라는 틀
     #   예) 2025-05-15처럼 연-월-일 형식의 문자열을 입력
     # * 마감일은 선택사항이므로 입력하지 않아도 에러가 나지 않음
 
+    recurrence: str | None = Field(
+        default=None,
+        examples=["FREQ=WEEKLY;BYDAY=MO"],
+        description="반복 규칙 (RRULE 형식, due_date가 첫 발생일)",
+    )
+    # * recurrence: 반복 할 일의 규칙 (예: 매주 월요일)
+    # * 반복 할 일은 due_date(시작일)가 꼭 있어야 함
+
+    priority: int = Field(
+        default=0, ge=0, le=9, description="우선순위 (0: 보통 ~ 9: 가장 중요)"
+    )
+    # * priority: 마감일이 같은 할 일 중 무엇을 먼저 할지 정하는 값 (클수록 먼저)
+    # * 수정(PUT) 요청에서 보내지 않으면 기존 값을 그대로 유지함
+
+    # * 반복 규칙의 형식이 잘못되면 422 오류를 돌려줌
+    @field_validator("recurrence")
+    @classmethod
+    def check_recurrence(cls, value: str | None) -> str | None:
+        if value is not None:
+            parse_rule(value)
+        return value
+
 
 # ----------------------------------------------------
 # [2] 할 일 생성 요청용 모델: TaskCreate
@@ -33,15 +58,32 @@ class TaskBase(BaseModel):  # '할 일'을 표현할 수 있는 Task라는 틀
 # - title만 필요하므로 TaskBase를 그대로 상속해서 사용함
 # ----------------------------------------------------
 class TaskCreate(TaskBase):
-    pass  # TaskBase에 정의된 내용을 그대로 사용함
+    parent_id: int | None = Field(
+        default=None,
+        description="상위 할 일 번호 (없으면 최상위 할 일)",
+    )
+    # * parent_id: 이 할 일을 어떤 할 일의 하위 단계로 만들지 지정함
+    # * 수정(PUT) 요청에서 parent_id를 보내면 하위 트리 전체가 함께 옮겨짐
+
+    # * 요청 본문에 반복 규칙만 있고 시작일(due_date)이 없으면 422 오류를 돌려줌
+    #   (응답 모델에는 적용하지 않음, 수정 요청은 기존 값과 합쳐서 라우터에서 확인함)
+    @model_validator(mode="after")
+    def check_recurrence_start(self):
+        if self.recurrence is not None and self.due_date is None:
+            raise ValueError(
+                "recurring tasks need a due_date as their first occurrence"
+            )
+        return self
 
 
 # ----------------------------------------------------
 # [3] 할 일 생성 응답용 모델:  TaskCreateResponse
 # - 서버가 클라이언트에게 응답할 때 사용하는 구조
 # - 새로 만들어진 할 일의 번호(id)를 포함함
+# - 요청 검사(check_recurrence_start)는 필요 없으므로 TaskCreate가 아닌 TaskBase를 상속함
 # ----------------------------------------------------
-class TaskCreateResponse(TaskCreate):
+class TaskCreateResponse(TaskBase):
+    parent_id: int | None = None  # 상위 할 일 번호
     id: int  # 새로 만들어진 할 일의 고유 번호
 
     model_config = ConfigDict(
@@ -64,6 +106,74 @@ class Task(TaskBase):  # '할 일'을 표현할 수 있는 Task라는 틀을 만
 
     # done: 이 할 일이 끝났는지를 표시하는 값 (True또는 False만 가능함)
 
+    tags: list[str] = Field(default=[], description="할 일에 붙은 태그 목록")
+
     model_config = ConfigDict(
         from_attributes=True
     )  # Orm 모델(SQLAlchemy 등)을 사용할 수 있도록 설정
+
+
+# ----------------------------------------------------
+# 하위 트리 조회 응답용 구조: TaskTree
+# - GET /tasks/{id}/subtree 에서 사용됨
+# - 각 노드는 자기 아래 하위 트리 전체 기준의 집계(rollup)를 함께 가진다.
+# ----------------------------------------------------
+class TaskTree(Task):
+    parent_id: int | None = None  # 상위 할 일 번호
+
+    total: int  # 자기 자신을 포함한 하위 트리의 할 일 개수
+    done_count: int  # 그중 완료된 할 일 개수
+    percent_complete: float  # 완료 비율 (0 ~ 100)
+
+    children: list["TaskTree"] = []  # 바로 아래 하위 할 일 목록
+
+
+# ----------------------------------------------------
+# 달력 조회 응답용 구조: CalendarDay
+# - GET /tasks/calendar 에서 사용됨
+# - 하루(마감일)에 해당하는 할 일 목록과 개수/완료 개수를 담는다.
+# - 반복 할 일은 포함하지 않는다 (GET /tasks/occurrences 참고).
+# ----------------------------------------------------
+class CalendarDay(BaseModel):
+    date: datetime.date  # 마감일
+    count: int  # 이날 마감인 할 일 개수
+    done_count: int  # 그중 완료된 개수
+    tasks: list[Task]  # 이날 마감인 할 일 목록 (id 순서)
+
+
+# ----------------------------------------------------
+# 여러 할 일 한 번에 삭제 요청용 구조: TaskBulkDelete
+# - POST /tasks/bulk-delete 에서 사용됨
+# - ids, done_before 중 하나 이상은 꼭 보내야 함 (둘 다 보내면 두 조건 모두 만족)
+#   예) {"ids": [1, 2, 3]}
+#   예) {"done_before": "2025-01-01"} -> 2025년 이전에 완료된 할 일 모두 삭제
+# ----------------------------------------------------
+class TaskBulkDelete(BaseModel):
+    ids: list[int] | None = Field(default=None, min_length=1)
+    done_before: datetime.date | None = None
+
+    @model_validator(mode="after")
+    def check_condition(self):
+        if self.ids is None and self.done_before is None:
+            raise ValueError("either ids or done_before is required")
+        return self
+
+
+# ----------------------------------------------------
+# 여러 할 일 삭제 결과: TaskBulkDeleteResult
+# ----------------------------------------------------
+class TaskBulkDeleteResult(BaseModel):
+    deleted: int  # 삭제된 할 일 개수
+
+
+# ----------------------------------------------------
+# "다음에 할 일" 응답용 구조: NextTask
+# - GET /tasks/next 에서 사용됨
+# - 아직 완료되지 않은 일반(반복 아님) 할 일만 나오므로 done / recurrence는 없다.
+# ----------------------------------------------------
+class NextTask(BaseModel):
+    id: int
+    title: str | None
+    due_date: datetime.date | None
+    priority: int
+    overdue: bool  # 마감일이 오늘(UTC)보다 앞이면 True
@@ -0,0 +1,419 @@
+# ---------------------------------------------------------
+# 파일명: snapshot.py
+# 위치: api/snapshot.py
+# 이 파일은 tasks / dones 테이블을 압축 파일 하나로 빠르게 저장(dump)하고
+# 다시 채워 넣는(restore) 명령어를 정의한다.
+# - 개발 환경을 되돌리거나 벤치마크용 데이터를 채울 때 사용한다.
+#   (api/migrate_db.py는 테이블을 비우기만 하고, init.sql은 느린 SQL 덤프임)
+#
+# 실행 방법 (DB 주소는 DB_URL 환경 변수를 사용):
+#   python -m api.snapshot dump tasks.snap [--chunk-rows 50000]
+#   python -m api.snapshot restore tasks.snap [--jobs 4]
+#
+# [저장 방식]
+# - PostgreSQL: COPY ... TO STDOUT (FORMAT binary)로 묶음(chunk)마다 그대로 받아 저장
+# - SQLite: id 순서로 묶음마다 읽어서 JSON 배열로 저장
+# - 묶음은 id 범위(keyset)로 나누므로 표가 커도 OFFSET처럼 느려지지 않는다.
+#
+# [파일 형식] (gzip으로 압축된 하나의 스트림)
+#   프레임 = 4바이트 길이(big-endian) + JSON 헤더 + 데이터(헤더의 size 바이트)
+#   - 첫 프레임: 형식 이름, 형식 버전, 스키마 버전(테이블 구조의 해시), DB 종류
+#   - 데이터 프레임: 테이블 이름, 컬럼 목록, 인코딩("pgcopy" 또는 "json"), 단계(phase)
+#   - 마지막 프레임: 앞의 모든 바이트의 sha256 체크섬
+#
+# [복원 방식]
+# - 먼저 파일 전체의 체크섬과 스키마 버전을 확인한 뒤에 테이블을 비우고 복원한다.
+#   (TRUNCATE ... CASCADE 이므로 태그 연결/반복 발생 상태도 함께 비워짐)
+# - 같은 단계(phase)의 묶음들은 여러 연결로 동시에(--jobs) 넣는다.
+#   - 하위 할 일은 상위 할 일을 외래키로 가리키므로, tasks는 트리 깊이별로 단계를 나눠
+#     상위 할 일이 모두 들어간 뒤에 하위 할 일을 넣는다. dones는 tasks 다음 단계이다.
+#   - 묶음마다 따로 commit 하므로 도중에 실패하면 복원을 다시 실행해야 한다.
+# - PostgreSQL은 복원 후 id 시퀀스를 최댓값 다음으로 맞춘다.
+# - pgcopy 스냅샷은 PostgreSQL에만 복원할 수 있다. (json 스냅샷은 어디든 가능)
+# ---------------------------------------------------------
+
+import argparse
+import asyncio
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import struct
+import sys
+from typing import Any, BinaryIO, Iterator
+
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Table,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+import api.models.task as task_model
+from api.db import DB_URL, engine_options
+
+FORMAT_NAME = "todo-snapshot"
+FORMAT_VERSION = 1
+
+# 저장할 테이블 (복원은 이 순서대로 단계를 나눠서 진행)
+TABLES: tuple[Table, ...] = (task_model.Task.__table__, task_model.Done.__table__)
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_JOBS = 4
+
+_LENGTH = struct.Struct(">I")
+
+
+# ---------------------------------------------------------
+# [1] 스키마 버전
+# - 저장하는 테이블의 컬럼 이름/타입으로 만든 해시
+# - 모델(api/models/task.py)의 컬럼이 바뀌면 값이 달라져서 옛 스냅샷 복원을 막는다.
+# ---------------------------------------------------------
+def schema_version() -> str:
+    description = ";".join(
+        f"{table.name}:"
+        + ",".join(f"{column.name} {column.type}" for column in table.columns)
+        for table in TABLES
+    )
+    return hashlib.sha256(description.encode()).hexdigest()[:16]
+
+
+# ---------------------------------------------------------
+# [2] 프레임 읽기/쓰기
+# ---------------------------------------------------------
+class _FrameWriter:
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._sha256 = hashlib.sha256()
+
+    def write(self, header: dict[str, Any], data: bytes = b"") -> None:
+        encoded = json.dumps({**header, "size": len(data)}).encode()
+        for part in (_LENGTH.pack(len(encoded)), encoded, data):
+            self._sha256.update(part)
+            self._f.write(part)
+
+    # 마지막 프레임: 지금까지 쓴 모든 바이트의 체크섬
+    def close(self) -> None:
+        self.write({"end": True, "sha256": self._sha256.hexdigest()})
+
+
+def _read_frames(f: BinaryIO) -> Iterator[tuple[dict[str, Any], bytes]]:
+    sha256 = hashlib.sha256()
+    while True:
+        prefix = f.read(_LENGTH.size)
+        if len(prefix) < _LENGTH.size:
+            raise ValueError("snapshot is truncated")
+        encoded = f.read(_LENGTH.unpack(prefix)[0])
+        header = json.loads(encoded)
+        if header.get("end"):
+            if header["sha256"] != sha256.hexdigest():
+                raise ValueError("snapshot checksum mismatch")
+            return
+        data = f.read(header["size"])
+        if len(data) < header["size"]:
+            raise ValueError("snapshot is truncated")
+        for part in (prefix, encoded, data):
+            sha256.update(part)
+        yield header, data
+
+
+# 파일 전체를 한 번 읽어서 체크섬/형식/스키마 버전을 확인하고 첫 프레임을 돌려준다
+def verify(path: str) -> dict[str, Any]:
+    with gzip.open(path, "rb") as f:
+        frames = _read_frames(f)
+        first, _ = next(frames)
+        if first.get("format") != FORMAT_NAME or first.get("version") != FORMAT_VERSION:
+            raise ValueError("not a task snapshot file")
+        if first["schema_version"] != schema_version():
+            raise ValueError(
+                f"snapshot schema {first['schema_version']} does not match "
+                f"current schema {schema_version()}"
+            )
+        for _ in frames:
+            pass
+    return first
+
+
+# ---------------------------------------------------------
+# [3] 저장(dump)
+# ---------------------------------------------------------
+# 트리 깊이 ("1/" -> 1, "1/2/" -> 2, path가 없는 예전 데이터는 최상위로 봄)
+def _depth():
+    path = task_model.Task.path
+    return func.coalesce(
+        func.length(path) - func.length(func.replace(path, "/", "")), 1
+    )
+
+
+# 테이블을 (단계, 조건) 목록으로 나눔: tasks는 깊이별, 나머지는 한 단계
+async def _phases(conn, table: Table, phase: int) -> list[tuple[int, Any]]:
+    if table is not task_model.Task.__table__:
+        return [(phase, None)]
+    depths = (
+        (
+            await conn.execute(
+                select(_depth()).select_from(table).distinct().order_by(_depth())
+            )
+        )
+        .scalars()
+        .all()
+    )
+    return [(phase + i, _depth() == depth) for i, depth in enumerate(depths)]
+
+
+# 조건에 맞는 행을 id 순서로 chunk_rows개씩 나눈 (시작 id 초과, 끝 id 이하) 범위
+async def _chunk_bounds(conn, table: Table, where, chunk_rows: int):
+    last = None
+    while True:
+        query = select(table.c.id).order_by(table.c.id).limit(1)
+        if where is not None:
+            query = query.where(where)
+        if last is not None:
+            query = query.where(table.c.id > last)
+        # 남은 행이 없으면 끝 (빈 묶음은 만들지 않음)
+        if (await conn.execute(query)).scalar() is None:
+            return
+        upper = (await conn.execute(query.offset(chunk_rows - 1))).scalar()
+        yield last, upper
+        if upper is None:
+            return
+        last = upper
+
+
+def _chunk_query(table: Table, where, lower, upper):
+    query = select(*table.columns).order_by(table.c.id)
+    if where is not None:
+        query = query.where(where)
+    if lower is not None:
+        query = query.where(table.c.id > lower)
+    if upper is not None:
+        query = query.where(table.c.id <= upper)
+    return query
+
+
+# 반환값: 저장한 묶음 수
+async def dump(
+    engine: AsyncEngine, path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> int:
+    postgresql = engine.dialect.name == "postgresql"
+    chunks = 0
+
+    async with engine.connect() as conn:
+        # 모든 묶음을 같은 시점의 데이터로 읽기 위해 한 트랜잭션 안에서 읽음
+        if postgresql:
+            await conn.execution_options(isolation_level="REPEATABLE READ")
+            raw = (await conn.get_raw_connection()).driver_connection
+
+        with gzip.open(path, "wb", compresslevel=1) as f:
+            writer = _FrameWriter(f)
+            writer.write(
+                {
+                    "format": FORMAT_NAME,
+                    "version": FORMAT_VERSION,
+                    "schema_version": schema_version(),
+                    "dialect": engine.dialect.name,
+                    "created_at": datetime.datetime.now(
+                        datetime.timezone.utc
+                    ).isoformat(),
+                }
+            )
+
+            phase = 0
+            for table in TABLES:
+                columns = [column.name for column in table.columns]
+                for phase, where in await _phases(conn, table, phase):
+                    async for lower, upper in _chunk_bounds(
+                        conn, table, where, chunk_rows
+                    ):
+                        query = _chunk_query(table, where, lower, upper)
+                        header = {
+                            "table": table.name,
+                            "columns": columns,
+                            "phase": phase,
+                        }
+
+                        if postgresql:
+                            sql = str(
+                                query.compile(
+                                    dialect=engine.dialect,
+                                    compile_kwargs={"literal_binds": True},
+                                )
+                            )
+                            buffer = io.BytesIO()
+                            await raw.copy_from_query(
+                                sql, output=buffer.write, format="binary"
+                            )
+                            writer.write(
+                                {**header, "encoding": "pgcopy"}, buffer.getvalue()
+                            )
+                        else:
+                            rows = (await conn.execute(query)).all()
+                            data = json.dumps(
+                                [list(row) for row in rows], default=_json_default
+                            ).encode()
+                            writer.write(
+                                {**header, "encoding": "json", "rows": len(rows)}, data
+                            )
+                        chunks += 1
+                phase += 1
+            writer.close()
+
+    return chunks
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"cannot store {type(value).__name__} in a snapshot")
+
+
+# ---------------------------------------------------------
+# [4] 복원(restore)
+# ---------------------------------------------------------
+# JSON으로 저장한 날짜/시각 문자열을 컬럼 타입에 맞게 되돌리는 함수들
+def _converters(table: Table, columns: list[str]):
+    converters = []
+    for name in columns:
+        column_type = table.c[name].type
+        if isinstance(column_type, DateTime):
+            converters.append(datetime.datetime.fromisoformat)
+        elif isinstance(column_type, Date):
+            converters.append(datetime.date.fromisoformat)
+        else:
+            converters.append(None)
+    return converters
+
+
+async def _restore_chunk(
+    engine: AsyncEngine, header: dict[str, Any], data: bytes
+) -> None:
+    table = next(table for table in TABLES if table.name == header["table"])
+    columns = header["columns"]
+
+    async with engine.begin() as conn:
+        if header["encoding"] == "pgcopy":
+            raw = (await conn.get_raw_connection()).driver_connection
+            await raw.copy_to_table(
+                table.name, source=io.BytesIO(data), columns=columns, format="binary"
+            )
+            return
+
+        converters = _converters(table, columns)
+        rows = [
+            {
+                name: (convert(value) if convert and value is not None else value)
+                for name, convert, value in zip(columns, converters, row)
+            }
+            for row in json.loads(data)
+        ]
+        if rows:
+            await conn.execute(insert(table), rows)
+
+
+async def restore(engine: AsyncEngine, path: str, jobs: int = DEFAULT_JOBS) -> None:
+    postgresql = engine.dialect.name == "postgresql"
+    first = verify(path)
+    if first["dialect"] == "postgresql" and not postgresql:
+        raise ValueError(
+            "a PostgreSQL (COPY BINARY) snapshot can only be restored into PostgreSQL"
+        )
+
+    # 기존 데이터를 비움 (자식 테이블부터)
+    async with engine.begin() as conn:
+        if postgresql:
+            names = ", ".join(table.name for table in TABLES)
+            await conn.execute(text(f"TRUNCATE {names} CASCADE"))
+        else:
+            for table in reversed(TABLES):
+                await conn.execute(delete(table))
+
+    # SQLite는 쓰기를 동시에 하나만 할 수 있으므로 순서대로 넣음
+    limit = asyncio.Semaphore(jobs if postgresql else 1)
+
+    async def run(header, data):
+        async with limit:
+            await _restore_chunk(engine, header, data)
+
+    pending: list[asyncio.Task] = []
+    current_phase = None
+    with gzip.open(path, "rb") as f:
+        frames = _read_frames(f)
+        next(frames)
+        for header, data in frames:
+            # 다음 단계로 넘어가기 전에 이전 단계의 묶음이 모두 끝나기를 기다림
+            if header["phase"] != current_phase:
+                await asyncio.gather(*pending)
+                pending.clear()
+                current_phase = header["phase"]
+            # 동시에 메모리에 올리는 묶음 수도 jobs개로 제한함
+            while len(pending) >= jobs:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()
+                pending = [task for task in pending if not task.done()]
+            pending.append(asyncio.create_task(run(header, data)))
+        await asyncio.gather(*pending)
+
+    # tasks.is_done을 dones에 맞춰 다시 채움 (is_done이 없던 예전 스냅샷도 복원할 수 있게)
+    tasks, dones = TABLES
+    async with engine.begin() as conn:
+        is_done = tasks.c.id.in_(select(dones.c.id))
+        await conn.execute(
+            update(tasks).where(tasks.c.is_done != is_done).values(is_done=is_done)
+        )
+
+    # dones.id는 tasks.id를 가리키는 값이므로 시퀀스는 tasks에만 있음
+    if postgresql:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "SELECT setval(pg_get_serial_sequence('tasks', 'id'), "
+                    "COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM tasks"
+                )
+            )
+
+
+# ---------------------------------------------------------
+# [5] 명령어 실행
+# ---------------------------------------------------------
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m api.snapshot")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    dump_parser = commands.add_parser(
+        "dump", help="save tasks and dones to a snapshot file"
+    )
+    dump_parser.add_argument("path")
+    dump_parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+
+    restore_parser = commands.add_parser(
+        "restore", help="replace tasks and dones from a snapshot file"
+    )
+    restore_parser.add_argument("path")
+    restore_parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+
+    args = parser.parse_args(argv)
+    engine = create_async_engine(DB_URL, **engine_options(DB_URL))
+    try:
+        if args.command == "dump":
+            await dump(engine, args.path, chunk_rows=args.chunk_rows)
+        else:
+            await restore(engine, args.path, jobs=args.jobs)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except ValueError as e:
+        sys.exit(f"error: {e}")
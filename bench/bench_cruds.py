@@ -0,0 +1,116 @@
+# ---------------------------------------------------------
+# 파일명: bench_cruds.py
+# 위치: bench/bench_cruds.py
+# 이 파일은 CRUD 조회 함수 한 번 호출에 드는 시간(오버헤드)을 재는 마이크로벤치마크이다.
+# - 매번 select(...)를 새로 만드는 방식(before)과
+#   api/cruds/statements.py에 미리 만들어 둔 쿼리를 쓰는 방식(after)을 비교한다.
+# - before 쿼리는 statements의 쿼리와 같은 컬럼으로 만들어서, 쿼리를 새로 만드는 비용만 비교한다.
+#   (목록 조회는 태그 일괄 조회를 빼고 쿼리 실행만 잰다)
+# - 메모리 SQLite를 사용하므로 DB 서버 없이 실행할 수 있다.
+#
+# 실행 방법:
+#   python -m bench.bench_cruds [반복 횟수]
+# ---------------------------------------------------------
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+import api.cruds.done as done_crud
+import api.cruds.statements as statements
+import api.cruds.task as task_crud
+import api.models.task as task_model
+from api.db import Base
+
+BENCH_DB_URL = "sqlite+aiosqlite:///:memory:"
+
+
+# ---------------------------------------------------------
+# [1] 비교 대상: 예전 방식(매 호출마다 select를 새로 만듦)
+# - 컬럼은 statements의 쿼리에서 그대로 가져오므로, 쿼리가 바뀌어도 같은 SQL끼리 비교된다.
+# ---------------------------------------------------------
+async def get_task_plain(db, task_id):
+    result = await db.execute(
+        select(task_model.Task).filter(task_model.Task.id == task_id)
+    )
+    return result.scalars().first()
+
+
+async def get_done_plain(db, task_id):
+    result = await db.execute(
+        select(task_model.Done).filter(task_model.Done.id == task_id)
+    )
+    return result.scalars().first()
+
+
+async def get_tasks_with_done_plain(db):
+    result = await db.execute(
+        select(*statements.TASKS_WITH_DONE.selected_columns).outerjoin(task_model.Done)
+    )
+    return result.all()
+
+
+async def get_tasks_with_done_prepared(db):
+    result = await db.execute(statements.TASKS_WITH_DONE)
+    return result.all()
+
+
+# ---------------------------------------------------------
+# [2] 한 함수를 n번 호출하고 1회당 평균 시간(마이크로초)을 반환
+# ---------------------------------------------------------
+async def measure(fn, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        await fn(i)
+    return (time.perf_counter() - start) / n * 1_000_000
+
+
+async def main(n: int) -> None:
+    engine = create_async_engine(BENCH_DB_URL)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as db:
+        db.add_all(task_model.Task(title=f"task {i}") for i in range(1, 11))
+        await db.commit()
+        db.add(task_model.Done(id=1))
+        await db.commit()
+
+        cases = [
+            (
+                "get_task",
+                lambda i: get_task_plain(db, i % 10 + 1),
+                lambda i: task_crud.get_task(db, i % 10 + 1),
+            ),
+            (
+                "get_done",
+                lambda i: get_done_plain(db, i % 10 + 1),
+                lambda i: done_crud.get_done(db, i % 10 + 1),
+            ),
+            (
+                "get_tasks_with_done",
+                lambda i: get_tasks_with_done_plain(db),
+                lambda i: get_tasks_with_done_prepared(db),
+            ),
+        ]
+
+        print(f"{'function':<22}{'before(us)':>12}{'after(us)':>12}")
+        for name, before, after in cases:
+            # 워밍업: 캐시를 채운 상태에서 측정한다
+            await measure(before, 100)
+            await measure(after, 100)
+            print(
+                f"{name:<22}{await measure(before, n):>12.1f}{await measure(after, n):>12.1f}"
+            )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
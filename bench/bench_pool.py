@@ -0,0 +1,163 @@
+# ---------------------------------------------------------
+# 파일명: bench_pool.py
+# 위치: bench/bench_pool.py
+# 이 파일은 요청 하나가 DB 연결(pool의 connection)을 얼마나 오래 붙잡는지 재는 벤치마크이다.
+# - 같은 목록 조회(get_tasks_with_done + list[Task] 응답)를 두 방식으로 비교한다.
+#   - before: 예전 방식. 세션을 응답 전송이 끝난 뒤에 닫음 (Depends 기본 scope="request")
+#   - after: 지금 방식(SqlTaskRepository.list_tasks). 결과를 읽자마자 연결을 돌려주고
+#     (release_connection), 세션은 라우터 함수가 끝나면 닫음 (scope="function")
+# - 동시에 여러 요청을 보내면서 다음 값을 기록한다.
+#   - peak: 동시에 빌려 간 연결 수의 최댓값
+#   - hold(ms): 요청 하나가 연결을 붙잡고 있던 평균 시간
+#   - req/s: 초당 처리한 요청 수
+# - 마지막으로 실제 앱에서 쿼리 전에 422/400으로 끝나는 요청이 연결을 빌려 가는지 확인한다.
+# - 파일 SQLite를 사용하므로 DB 서버 없이 실행할 수 있다.
+#
+# 실행 방법:
+#   python -m bench.bench_pool [할 일 수] [동시 요청 수] [반복 횟수]
+# ---------------------------------------------------------
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import api.cruds.task as task_crud
+import api.models.task as task_model
+import api.schemas.task as task_schema
+from api.db import Base, get_db
+from api.main import app
+from api.repositories.sql import SqlTaskRepository
+
+
+# ---------------------------------------------------------
+# [1] 연결을 빌려 가고(checkout) 돌려주는(checkin) 것을 세는 도구
+# ---------------------------------------------------------
+class PoolMonitor:
+    def __init__(self, engine):
+        self.reset()
+        self._started: dict[int, float] = {}
+        event.listen(engine.sync_engine, "checkout", self._checkout)
+        event.listen(engine.sync_engine, "checkin", self._checkin)
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak = 0
+        self.held_seconds = 0.0
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+        self.checked_out += 1
+        self.peak = max(self.peak, self.checked_out)
+        self._started[id(connection_record)] = time.perf_counter()
+
+    def _checkin(self, dbapi_connection, connection_record):
+        started = self._started.pop(id(connection_record), None)
+        if started is not None:
+            self.checked_out -= 1
+            self.held_seconds += time.perf_counter() - started
+
+
+# ---------------------------------------------------------
+# [2] 비교할 두 가지 목록 조회 (실제 GET /tasks와 같은 쿼리와 응답 모델)
+# ---------------------------------------------------------
+def build_app(session_factory) -> FastAPI:
+    async def get_session():
+        async with session_factory() as session:
+            yield session
+
+    bench_app = FastAPI()
+
+    @bench_app.get("/before", response_model=list[task_schema.Task])
+    async def list_before(db: AsyncSession = Depends(get_session)):
+        return await task_crud.get_tasks_with_done(db)
+
+    @bench_app.get("/after", response_model=list[task_schema.Task])
+    async def list_after(db: AsyncSession = Depends(get_session, scope="function")):
+        return await SqlTaskRepository(db).list_tasks()
+
+    return bench_app
+
+
+async def run_load(
+    client: AsyncClient, path: str, concurrency: int, rounds: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        responses = await asyncio.gather(
+            *(client.get(path) for _ in range(concurrency))
+        )
+        assert all(response.status_code == 200 for response in responses)
+    return time.perf_counter() - start
+
+
+async def main(n_tasks: int, concurrency: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}",
+            pool_size=5,
+            max_overflow=0,
+            pool_timeout=60,
+        )
+        session_factory = sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                task_model.Task.__table__.insert(),
+                [{"title": f"task {i}"} for i in range(1, n_tasks + 1)],
+            )
+
+        monitor = PoolMonitor(engine)
+        transport = ASGITransport(app=build_app(session_factory))
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            # 워밍업
+            await run_load(client, "/before", concurrency, 1)
+            await run_load(client, "/after", concurrency, 1)
+
+            print(f"{'lifecycle':<10}{'peak':>6}{'hold(ms)':>10}{'req/s':>10}")
+            for name in ["before", "after"]:
+                monitor.reset()
+                elapsed = await run_load(client, f"/{name}", concurrency, rounds)
+                requests = concurrency * rounds
+                print(
+                    f"{name:<10}{monitor.peak:>6}"
+                    f"{monitor.held_seconds / requests * 1000:>10.2f}"
+                    f"{requests / elapsed:>10.1f}"
+                )
+
+        # 실제 앱: 쿼리 전에 422/404로 끝나는 요청은 연결을 빌려 가지 않아야 함
+        async def get_bench_db():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = get_bench_db
+        try:
+            transport = ASGITransport(app=app)
+            async with AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                monitor.reset()
+                await client.put("/tasks/1", json={"title": ["not", "a", "string"]})
+                await client.get("/tasks/abc/subtree")
+                await client.get("/tasks/calendar?from=2025-05-31&to=2025-05-01")
+                print(f"checkouts for early 422/400 responses: {monitor.checkouts}")
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(main(*(args + [2000, 20, 20][len(args) :])))
@@ -29,24 +29,190 @@ SET default_tablespace = '';
 
 SET default_table_access_method = heap;
 
+--
+-- Name: archived_tasks; Type: TABLE; Schema: public; Owner: todo_user
+--
+
+CREATE TABLE public.archived_tasks (
+    id integer NOT NULL,
+    title character varying(1024),
+    due_date date,
+    parent_id integer,
+    path character varying(255),
+    done_at timestamp without time zone NOT NULL,
+    archived_at timestamp without time zone NOT NULL
+);
+
+
+ALTER TABLE public.archived_tasks OWNER TO todo_user;
+
+--
+-- Name: audit_logs; Type: TABLE; Schema: public; Owner: todo_user
+--
+
+CREATE TABLE public.audit_logs (
+    id integer NOT NULL,
+    task_id integer,
+    action character varying(32) NOT NULL,
+    actor character varying(255),
+    changes text,
+    created_at timestamp without time zone NOT NULL
+);
+
+
+ALTER TABLE public.audit_logs OWNER TO todo_user;
+
+--
+-- Name: audit_logs_id_seq; Type: SEQUENCE; Schema: public; Owner: todo_user
+--
+
+CREATE SEQUENCE public.audit_logs_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.audit_logs_id_seq OWNER TO todo_user;
+
+--
+-- Name: audit_logs_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: todo_user
+--
+
+ALTER SEQUENCE public.audit_logs_id_seq OWNED BY public.audit_logs.id;
+
+
 --
 -- Name: dones; Type: TABLE; Schema: public; Owner: todo_user
 --
 
 CREATE TABLE public.dones (
-    id integer NOT NULL
+    id integer NOT NULL,
+    done_at timestamp without time zone NOT NULL
 );
 
 
 ALTER TABLE public.dones OWNER TO todo_user;
 
+--
+-- Name: outbox_events; Type: TABLE; Schema: public; Owner: todo_user
+--
+
+CREATE TABLE public.outbox_events (
+    id integer NOT NULL,
+    endpoint character varying(2048) NOT NULL,
+    event_type character varying(32) NOT NULL,
+    task_id integer NOT NULL,
+    payload text NOT NULL,
+    status character varying(16) NOT NULL,
+    attempts integer NOT NULL,
+    next_attempt_at timestamp without time zone NOT NULL,
+    last_error text,
+    created_at timestamp without time zone NOT NULL
+);
+
+
+ALTER TABLE public.outbox_events OWNER TO todo_user;
+
+--
+-- Name: outbox_events_id_seq; Type: SEQUENCE; Schema: public; Owner: todo_user
+--
+
+CREATE SEQUENCE public.outbox_events_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.outbox_events_id_seq OWNER TO todo_user;
+
+--
+-- Name: outbox_events_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: todo_user
+--
+
+ALTER SEQUENCE public.outbox_events_id_seq OWNED BY public.outbox_events.id;
+
+
+--
+-- Name: tags; Type: TABLE; Schema: public; Owner: todo_user
+--
+
+CREATE TABLE public.tags (
+    id integer NOT NULL,
+    name character varying(64) NOT NULL
+);
+
+
+ALTER TABLE public.tags OWNER TO todo_user;
+
+--
+-- Name: tags_id_seq; Type: SEQUENCE; Schema: public; Owner: todo_user
+--
+
+CREATE SEQUENCE public.tags_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.tags_id_seq OWNER TO todo_user;
+
+--
+-- Name: tags_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: todo_user
+--
+
+ALTER SEQUENCE public.tags_id_seq OWNED BY public.tags.id;
+
+
+--
+-- Name: task_occurrences; Type: TABLE; Schema: public; Owner: todo_user
+--
+
+CREATE TABLE public.task_occurrences (
+    task_id integer NOT NULL,
+    occurrence_date date NOT NULL,
+    title character varying(1024),
+    done boolean NOT NULL
+);
+
+
+ALTER TABLE public.task_occurrences OWNER TO todo_user;
+
+--
+-- Name: task_tags; Type: TABLE; Schema: public; Owner: todo_user
+--
+
+CREATE TABLE public.task_tags (
+    task_id integer NOT NULL,
+    tag_id integer NOT NULL
+);
+
+
+ALTER TABLE public.task_tags OWNER TO todo_user;
+
 --
 -- Name: tasks; Type: TABLE; Schema: public; Owner: todo_user
 --
 
 CREATE TABLE public.tasks (
     id integer NOT NULL,
-    title character varying(1024)
+    title character varying(1024),
+    due_date date,
+    parent_id integer,
+    path character varying(255),
+    recurrence character varying(255),
+    priority integer DEFAULT 0 NOT NULL,
+    is_done boolean DEFAULT false NOT NULL,
+    claimed_by character varying(255),
+    lease_expires_at timestamp without time zone
 );
 
 
@@ -74,6 +240,27 @@ ALTER SEQUENCE public.tasks_id_seq OWNER TO todo_user;
 ALTER SEQUENCE public.tasks_id_seq OWNED BY public.tasks.id;
 
 
+--
+-- Name: audit_logs id; Type: DEFAULT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.audit_logs ALTER COLUMN id SET DEFAULT nextval('public.audit_logs_id_seq'::regclass);
+
+
+--
+-- Name: outbox_events id; Type: DEFAULT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.outbox_events ALTER COLUMN id SET DEFAULT nextval('public.outbox_events_id_seq'::regclass);
+
+
+--
+-- Name: tags id; Type: DEFAULT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.tags ALTER COLUMN id SET DEFAULT nextval('public.tags_id_seq'::regclass);
+
+
 --
 -- Name: tasks id; Type: DEFAULT; Schema: public; Owner: todo_user
 --
@@ -81,11 +268,59 @@ ALTER SEQUENCE public.tasks_id_seq OWNED BY public.tasks.id;
 ALTER TABLE ONLY public.tasks ALTER COLUMN id SET DEFAULT nextval('public.tasks_id_seq'::regclass);
 
 
+--
+-- Data for Name: archived_tasks; Type: TABLE DATA; Schema: public; Owner: todo_user
+--
+
+COPY public.archived_tasks (id, title, due_date, parent_id, path, done_at, archived_at) FROM stdin;
+\.
+
+
+--
+-- Data for Name: audit_logs; Type: TABLE DATA; Schema: public; Owner: todo_user
+--
+
+COPY public.audit_logs (id, task_id, action, actor, changes, created_at) FROM stdin;
+\.
+
+
 --
 -- Data for Name: dones; Type: TABLE DATA; Schema: public; Owner: todo_user
 --
 
-COPY public.dones (id) FROM stdin;
+COPY public.dones (id, done_at) FROM stdin;
+\.
+
+
+--
+-- Data for Name: outbox_events; Type: TABLE DATA; Schema: public; Owner: todo_user
+--
+
+COPY public.outbox_events (id, endpoint, event_type, task_id, payload, status, attempts, next_attempt_at, last_error, created_at) FROM stdin;
+\.
+
+
+--
+-- Data for Name: tags; Type: TABLE DATA; Schema: public; Owner: todo_user
+--
+
+COPY public.tags (id, name) FROM stdin;
+\.
+
+
+--
+-- Data for Name: task_occurrences; Type: TABLE DATA; Schema: public; Owner: todo_user
+--
+
+COPY public.task_occurrences (task_id, occurrence_date, title, done) FROM stdin;
+\.
+
+
+--
+-- Data for Name: task_tags; Type: TABLE DATA; Schema: public; Owner: todo_user
+--
+
+COPY public.task_tags (task_id, tag_id) FROM stdin;
 \.
 
 
@@ -93,10 +328,31 @@ COPY public.dones (id) FROM stdin;
 -- Data for Name: tasks; Type: TABLE DATA; Schema: public; Owner: todo_user
 --
 
-COPY public.tasks (id, title) FROM stdin;
+COPY public.tasks (id, title, due_date, parent_id, path, recurrence, priority, is_done, claimed_by, lease_expires_at) FROM stdin;
 \.
 
 
+--
+-- Name: audit_logs_id_seq; Type: SEQUENCE SET; Schema: public; Owner: todo_user
+--
+
+SELECT pg_catalog.setval('public.audit_logs_id_seq', 1, false);
+
+
+--
+-- Name: outbox_events_id_seq; Type: SEQUENCE SET; Schema: public; Owner: todo_user
+--
+
+SELECT pg_catalog.setval('public.outbox_events_id_seq', 1, false);
+
+
+--
+-- Name: tags_id_seq; Type: SEQUENCE SET; Schema: public; Owner: todo_user
+--
+
+SELECT pg_catalog.setval('public.tags_id_seq', 1, false);
+
+
 --
 -- Name: tasks_id_seq; Type: SEQUENCE SET; Schema: public; Owner: todo_user
 --
@@ -104,6 +360,22 @@ COPY public.tasks (id, title) FROM stdin;
 SELECT pg_catalog.setval('public.tasks_id_seq', 1, false);
 
 
+--
+-- Name: archived_tasks archived_tasks_pkey; Type: CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.archived_tasks
+    ADD CONSTRAINT archived_tasks_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: audit_logs audit_logs_pkey; Type: CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.audit_logs
+    ADD CONSTRAINT audit_logs_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: dones dones_pkey; Type: CONSTRAINT; Schema: public; Owner: todo_user
 --
@@ -112,6 +384,46 @@ ALTER TABLE ONLY public.dones
     ADD CONSTRAINT dones_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: outbox_events outbox_events_pkey; Type: CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.outbox_events
+    ADD CONSTRAINT outbox_events_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: tags tags_name_key; Type: CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.tags
+    ADD CONSTRAINT tags_name_key UNIQUE (name);
+
+
+--
+-- Name: tags tags_pkey; Type: CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.tags
+    ADD CONSTRAINT tags_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: task_occurrences task_occurrences_pkey; Type: CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.task_occurrences
+    ADD CONSTRAINT task_occurrences_pkey PRIMARY KEY (task_id, occurrence_date);
+
+
+--
+-- Name: task_tags task_tags_pkey; Type: CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.task_tags
+    ADD CONSTRAINT task_tags_pkey PRIMARY KEY (task_id, tag_id);
+
+
 --
 -- Name: tasks tasks_pkey; Type: CONSTRAINT; Schema: public; Owner: todo_user
 --
@@ -120,12 +432,107 @@ ALTER TABLE ONLY public.tasks
     ADD CONSTRAINT tasks_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: ix_audit_logs_task_id_id; Type: INDEX; Schema: public; Owner: todo_user
+--
+
+CREATE INDEX ix_audit_logs_task_id_id ON public.audit_logs USING btree (task_id, id);
+
+
+--
+-- Name: ix_dones_done_at; Type: INDEX; Schema: public; Owner: todo_user
+--
+
+CREATE INDEX ix_dones_done_at ON public.dones USING btree (done_at);
+
+
+--
+-- Name: ix_outbox_events_pending; Type: INDEX; Schema: public; Owner: todo_user
+--
+
+CREATE INDEX ix_outbox_events_pending ON public.outbox_events USING btree (next_attempt_at, id) WHERE ((status)::text = 'pending'::text);
+
+
+--
+-- Name: ix_task_tags_tag_id_task_id; Type: INDEX; Schema: public; Owner: todo_user
+--
+
+CREATE INDEX ix_task_tags_tag_id_task_id ON public.task_tags USING btree (tag_id, task_id);
+
+
+--
+-- Name: ix_tasks_due_date_id; Type: INDEX; Schema: public; Owner: todo_user
+--
+
+CREATE INDEX ix_tasks_due_date_id ON public.tasks USING btree (due_date, id);
+
+
+--
+-- Name: ix_tasks_next_open; Type: INDEX; Schema: public; Owner: todo_user
+--
+
+CREATE INDEX ix_tasks_next_open ON public.tasks USING btree (due_date, priority DESC, id) INCLUDE (title) WHERE ((recurrence IS NULL) AND (NOT is_done));
+
+
+--
+-- Name: ix_tasks_parent_id; Type: INDEX; Schema: public; Owner: todo_user
+--
+
+CREATE INDEX ix_tasks_parent_id ON public.tasks USING btree (parent_id);
+
+
+--
+-- Name: ix_tasks_path; Type: INDEX; Schema: public; Owner: todo_user
+--
+
+CREATE INDEX ix_tasks_path ON public.tasks USING btree (path varchar_pattern_ops);
+
+
+--
+-- Name: ix_tasks_recurring_due_date; Type: INDEX; Schema: public; Owner: todo_user
+--
+
+CREATE INDEX ix_tasks_recurring_due_date ON public.tasks USING btree (due_date) WHERE (recurrence IS NOT NULL);
+
+
 --
 -- Name: dones dones_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: todo_user
 --
 
 ALTER TABLE ONLY public.dones
-    ADD CONSTRAINT dones_id_fkey FOREIGN KEY (id) REFERENCES public.tasks(id);
+    ADD CONSTRAINT dones_id_fkey FOREIGN KEY (id) REFERENCES public.tasks(id) ON DELETE CASCADE;
+
+
+--
+-- Name: task_occurrences task_occurrences_task_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.task_occurrences
+    ADD CONSTRAINT task_occurrences_task_id_fkey FOREIGN KEY (task_id) REFERENCES public.tasks(id) ON DELETE CASCADE;
+
+
+--
+-- Name: task_tags task_tags_tag_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.task_tags
+    ADD CONSTRAINT task_tags_tag_id_fkey FOREIGN KEY (tag_id) REFERENCES public.tags(id) ON DELETE CASCADE;
+
+
+--
+-- Name: task_tags task_tags_task_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.task_tags
+    ADD CONSTRAINT task_tags_task_id_fkey FOREIGN KEY (task_id) REFERENCES public.tasks(id) ON DELETE CASCADE;
+
+
+--
+-- Name: tasks tasks_parent_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: todo_user
+--
+
+ALTER TABLE ONLY public.tasks
+    ADD CONSTRAINT tasks_parent_id_fkey FOREIGN KEY (parent_id) REFERENCES public.tasks(id) ON DELETE CASCADE;
 
 
 --
@@ -14,6 +14,8 @@ import pytest_asyncio
 # httpx: 코드로 HTTP 요청을 보낼 수 있는 클라이언트 (FastAPI와 잘 호환됨)
 from httpx import AsyncClient, ASGITransport
 
+from fastapi import FastAPI, Request, Response
+
 # SQLAlchemy 비동기 전용 모듈
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
@@ -25,6 +27,22 @@ from api.main import app
 # 타입 힌트를 위한 모듈
 from typing import AsyncGenerator
 
+import asyncio
+import gzip
+import inspect
+import zlib
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+
+import api.models.task as task_model
+import api.schemas.task as task_schema
+from sqlalchemy import select, update
+
+from api import audit, coalesce, compression, outbox, reminder, snapshot
+from api.archiver import archive_completed
+from api.repositories import MemoryTaskRepository, get_repo
+from api.db import utcnow
+
 import starlette.status as status
 
 # -----------------------------------------------------------
@@ -48,7 +66,11 @@ async def async_client() -> AsyncGenerator[AsyncClient, None]:
     # -----------------------------------------------------------
     async_engine = create_async_engine(ASYNC_DB_URL, echo=True)
     async_session = sessionmaker(
-        autocommit=False, autoflush=False, bind=async_engine, class_=AsyncSession
+        autocommit=False,
+        autoflush=False,
+        bind=async_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
     )
 
     # -----------------------------------------------------------
@@ -155,6 +177,13 @@ async def test_done_flag(async_client):
     response = await async_client.delete("/tasks/1/done")
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    # ---------------------------------------------------------------
+    # [6] 없는 할 일을 완료 처리하려고 시도
+    # - 완료 기록이 중복된 경우(400)와 구분해서 404 Not Found를 반환해야 함
+    # ---------------------------------------------------------------
+    response = await async_client.put("/tasks/999/done")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
 
 # ---------------------------------------------------------------
 # [테스트 함수] 마감일(due_date)이 포함된 할 일 생성 테스트
@@ -296,3 +325,1042 @@ async def test_due_date(async_client):
         )
         # 결과 검증: 응답 상태 코드가 기대값과 일치해야 통과
         assert response.status_code == expectation
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 할 일 수정 / 없는 할 일 수정 테스트
+# - PUT /tasks/{id}는 미리 만들어 둔 조회 쿼리(TASK_BY_ID)로 할 일을 찾는다.
+# - 있는 할 일은 수정되고, 없는 할 일은 404를 반환해야 한다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_update_task(async_client):
+    response = await async_client.post("/tasks", json={"title": "수정 전"})
+    task_id = response.json()["id"]
+
+    response = await async_client.put(f"/tasks/{task_id}", json={"title": "수정 후"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "수정 후"
+
+    response = await async_client.put("/tasks/999", json={"title": "없음"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 하위 할 일(subtask) 트리 테스트
+# - 프로젝트(1) -> 단계(2) -> 세부 단계(3) 구조를 만들고
+# - 하위 트리 조회, 완료 집계, 하위 트리 일괄 완료/삭제를 확인한다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_subtree(async_client):
+    project = (await async_client.post("/tasks", json={"title": "프로젝트"})).json()
+    step = (
+        await async_client.post(
+            "/tasks", json={"title": "단계", "parent_id": project["id"]}
+        )
+    ).json()
+    await async_client.post(
+        "/tasks", json={"title": "세부 단계", "parent_id": step["id"]}
+    )
+    await async_client.post(
+        "/tasks", json={"title": "다른 단계", "parent_id": project["id"]}
+    )
+
+    # 없는 상위 할 일을 지정하면 404
+    response = await async_client.post(
+        "/tasks", json={"title": "고아", "parent_id": 999}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # 단계(2)와 그 하위를 한 번에 완료 처리
+    response = await async_client.put(f"/tasks/{step['id']}/done?cascade=true")
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await async_client.get(f"/tasks/{project['id']}/subtree")
+    assert response.status_code == status.HTTP_200_OK
+    tree = response.json()
+    assert tree["total"] == 4
+    assert tree["done_count"] == 2
+    assert tree["percent_complete"] == 50.0
+    assert [child["title"] for child in tree["children"]] == ["단계", "다른 단계"]
+    assert tree["children"][0]["children"][0]["done"] is True
+
+    # 자기 하위 할 일 아래로 옮기는 것은 허용되지 않음
+    response = await async_client.put(
+        f"/tasks/{project['id']}", json={"title": "프로젝트", "parent_id": step["id"]}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # 단계(2)를 최상위로 옮기면 하위 할 일도 함께 옮겨짐
+    response = await async_client.put(
+        f"/tasks/{step['id']}", json={"title": "단계", "parent_id": None}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert (await async_client.get(f"/tasks/{step['id']}/subtree")).json()["total"] == 2
+    assert (await async_client.get(f"/tasks/{project['id']}/subtree")).json()[
+        "total"
+    ] == 2
+
+    # 프로젝트를 삭제하면 남은 하위 할 일도 함께 삭제됨
+    await async_client.delete(f"/tasks/{project['id']}")
+    titles = [task["title"] for task in (await async_client.get("/tasks")).json()]
+    assert titles == ["단계", "세부 단계"]
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 태그 붙이기/떼기와 태그 필터 테스트
+# - 태그를 여러 할 일에 한 번에 붙이고,
+# - GET /tasks?tag=...로 AND(all) / OR(any) 필터가 동작하는지 확인한다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_tags(async_client, monkeypatch):
+    for title in ["빨래", "보고서", "장보기"]:
+        await async_client.post("/tasks", json={"title": title})
+    # 감사 로그는 실제로 태그가 붙거나 떨어진 할 일만 남아야 함
+    events = []
+    monkeypatch.setattr(
+        audit, "emit", lambda action, task_id, *args: events.append((action, task_id))
+    )
+
+    response = await async_client.post(
+        "/tasks/tags/attach", json={"task_ids": [1, 2, 3], "tags": ["급함"]}
+    )
+    assert response.json()["affected"] == 3
+    await async_client.post(
+        "/tasks/tags/attach", json={"task_ids": [1, 3], "tags": ["집"]}
+    )
+
+    # 이미 붙은 태그는 다시 붙지 않음
+    response = await async_client.post(
+        "/tasks/tags/attach", json={"task_ids": [1, 99], "tags": ["집"]}
+    )
+    assert response.json()["affected"] == 0
+    assert events == [("tag", 1), ("tag", 2), ("tag", 3), ("tag", 1), ("tag", 3)]
+
+    response = await async_client.get("/tasks", params={"tag": ["급함", "집"]})
+    assert [task["title"] for task in response.json()] == ["빨래", "장보기"]
+    assert response.json()[0]["tags"] == ["급함", "집"]
+
+    await async_client.post(
+        "/tasks/tags/detach", json={"task_ids": [2, 3], "tags": ["집"]}
+    )
+    assert events[-1:] == [("untag", 3)]
+    response = await async_client.get("/tasks", params={"tag": ["급함", "집"]})
+    assert [task["title"] for task in response.json()] == ["빨래"]
+
+    response = await async_client.get(
+        "/tasks", params={"tag": ["집", "없는태그"], "tag_match": "any"}
+    )
+    assert [task["title"] for task in response.json()] == ["빨래"]
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 작업 큐(할 일 점유) 테스트
+# - 작업자는 마감일이 빠른 순서로 서로 다른 할 일을 가져가야 한다.
+# - 점유자만 기한을 늘리거나 반납할 수 있다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_claim_queue(async_client):
+    await async_client.post("/tasks", json={"title": "나중", "due_date": "2024-12-31"})
+    await async_client.post("/tasks", json={"title": "먼저", "due_date": "2024-12-01"})
+    await async_client.post("/tasks", json={"title": "마감 없음"})
+    await async_client.put("/tasks/3/done")
+
+    response = await async_client.post("/tasks/claim", json={"worker": "a"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "먼저"
+    assert response.json()["claimed_by"] == "a"
+
+    response = await async_client.post("/tasks/claim", json={"worker": "b"})
+    assert response.json()["title"] == "나중"
+
+    # 완료된 할 일만 남았으므로 가져갈 할 일이 없음
+    response = await async_client.post("/tasks/claim", json={"worker": "c"})
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await async_client.post("/tasks/2/heartbeat", json={"worker": "a"})
+    assert response.status_code == status.HTTP_200_OK
+    response = await async_client.post("/tasks/2/heartbeat", json={"worker": "b"})
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    # a가 반납하면 c가 가져갈 수 있음
+    response = await async_client.delete("/tasks/2/claim", params={"worker": "a"})
+    assert response.status_code == status.HTTP_200_OK
+    response = await async_client.post("/tasks/claim", json={"worker": "c"})
+    assert response.json()["id"] == 2
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 전체 개수(X-Total-Count)와 페이지 나누기 테스트
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_total_count(async_client):
+    for i in range(5):
+        await async_client.post("/tasks", json={"title": f"작업 {i}"})
+
+    response = await async_client.head("/tasks")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Total-Count"] == "5"
+    assert response.content == b""
+
+    response = await async_client.get(
+        "/tasks", params={"limit": 2, "offset": 2, "count": "exact"}
+    )
+    assert response.headers["X-Total-Count"] == "5"
+    assert [task["title"] for task in response.json()] == ["작업 2", "작업 3"]
+
+    # SQLite에는 통계가 없으므로 estimated도 정확한 개수로 대신함
+    response = await async_client.head("/tasks", params={"count": "estimated"})
+    assert response.headers["X-Total-Count"] == "5"
+
+    # count를 요청하지 않으면 헤더를 붙이지 않음
+    response = await async_client.get("/tasks")
+    assert "X-Total-Count" not in response.headers
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 반복 할 일 테스트
+# - "매주 월요일" 할 일을 만들고, 기간 안의 발생일이 계산되는지 확인한다.
+# - 특정 날짜의 발생만 완료하거나 제목을 바꿀 수 있다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_recurring_tasks(async_client):
+    # 2025-05-05는 월요일
+    response = await async_client.post(
+        "/tasks",
+        json={
+            "title": "주간 회의",
+            "due_date": "2025-05-05",
+            "recurrence": "FREQ=WEEKLY;BYDAY=MO",
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    task_id = response.json()["id"]
+    await async_client.post(
+        "/tasks", json={"title": "보고서", "due_date": "2025-05-14"}
+    )
+
+    # 잘못된 규칙, 시작일이 없는 규칙은 422
+    response = await async_client.post(
+        "/tasks",
+        json={"title": "x", "due_date": "2025-05-05", "recurrence": "FREQ=HOURLY"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    response = await async_client.post(
+        "/tasks", json={"title": "x", "recurrence": "FREQ=DAILY"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await async_client.put(f"/tasks/{task_id}/occurrences/2025-05-12/done")
+    assert response.status_code == status.HTTP_200_OK
+    response = await async_client.put(
+        f"/tasks/{task_id}/occurrences/2025-05-19", json={"title": "회의 (휴가)"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    # 월요일이 아닌 날은 발생일이 아님
+    response = await async_client.put(f"/tasks/{task_id}/occurrences/2025-05-13/done")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await async_client.get(
+        "/tasks/occurrences", params={"from": "2025-05-10", "to": "2025-05-25"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [(o["date"], o["title"], o["done"]) for o in response.json()] == [
+        ("2025-05-12", "주간 회의", True),
+        ("2025-05-14", "보고서", False),
+        ("2025-05-19", "회의 (휴가)", False),
+    ]
+
+    # 완료를 취소하면 다시 "계산만 되는" 발생으로 돌아감
+    response = await async_client.delete(
+        f"/tasks/{task_id}/occurrences/2025-05-12/done"
+    )
+    assert response.json()["done"] is False
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 반복 할 일 수정 테스트
+# - 수정(PUT)에서 마감일만 빠지면 반복 할 일의 시작일이 없어지므로 400을 돌려준다.
+# - 반복 규칙은 보낸 경우에만 바뀌고, null을 보내면 반복을 끈다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_update_recurring_task(async_client):
+    response = await async_client.post(
+        "/tasks",
+        json={
+            "title": "주간 회의",
+            "due_date": "2025-05-05",
+            "recurrence": "FREQ=WEEKLY;BYDAY=MO",
+        },
+    )
+    task_id = response.json()["id"]
+
+    response = await async_client.put(f"/tasks/{task_id}", json={"title": "회의"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    # 거절된 수정 때문에 목록 조회가 깨지지 않아야 함
+    response = await async_client.get("/tasks")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0]["due_date"] == "2025-05-05"
+
+    response = await async_client.put(
+        f"/tasks/{task_id}",
+        json={
+            "title": "격주 회의",
+            "due_date": "2025-05-05",
+            "recurrence": "FREQ=WEEKLY;INTERVAL=2",
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["recurrence"] == "FREQ=WEEKLY;INTERVAL=2"
+
+    # 반복과 마감일을 함께 지우면 일반 할 일이 됨
+    response = await async_client.put(
+        f"/tasks/{task_id}", json={"title": "회의", "recurrence": None}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = await async_client.get("/tasks")
+    assert response.status_code == status.HTTP_200_OK
+    assert (response.json()[0]["due_date"], response.json()[0]["recurrence"]) == (
+        None,
+        None,
+    )
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 완료된 할 일 보관(archive) 테스트
+# - 완료된 할 일은 보관 테이블로 옮겨지고, 기본 목록에서는 빠진다.
+# - include_archived=true 로 보관된 할 일도 함께 볼 수 있다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_archive_completed(async_client):
+    for title in ["완료 1", "진행 중", "완료 2"]:
+        await async_client.post("/tasks", json={"title": title})
+    await async_client.put("/tasks/1/done")
+    await async_client.put("/tasks/3/done")
+
+    # 테스트용 DB 세션으로 보관 작업을 직접 실행 (기준 시각: 하루 뒤 -> 모든 완료가 대상)
+    session_factory = asynccontextmanager(app.dependency_overrides[get_db])
+    moved = await archive_completed(
+        session_factory, cutoff=utcnow() + timedelta(days=1), batch_size=1, pause=0
+    )
+    assert moved == 2
+
+    response = await async_client.get("/tasks")
+    assert [task["title"] for task in response.json()] == ["진행 중"]
+
+    response = await async_client.get(
+        "/tasks", params={"include_archived": True, "limit": 10, "count": "exact"}
+    )
+    assert response.headers["X-Total-Count"] == "3"
+    assert [(task["title"], task["done"]) for task in response.json()] == [
+        ("완료 1", True),
+        ("진행 중", False),
+        ("완료 2", True),
+    ]
+
+    # 보관된 할 일에는 태그가 없으므로 태그 필터와 함께 쓸 수 없음
+    response = await async_client.get(
+        "/tasks", params={"include_archived": True, "tag": "집"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 보관하지 않는 할 일 테스트
+# - 하위 트리에 속한 할 일과 태그가 붙은 할 일은 완료되어도 그대로 남는다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_archive_skips_subtasks_and_tagged(async_client):
+    await async_client.post("/tasks", json={"title": "상위"})
+    await async_client.post("/tasks", json={"title": "하위", "parent_id": 1})
+    await async_client.post("/tasks", json={"title": "태그"})
+    await async_client.post(
+        "/tasks/tags/attach", json={"task_ids": [3], "tags": ["집"]}
+    )
+    for task_id in [1, 2, 3]:
+        await async_client.put(f"/tasks/{task_id}/done")
+
+    session_factory = asynccontextmanager(app.dependency_overrides[get_db])
+    moved = await archive_completed(
+        session_factory, cutoff=utcnow() + timedelta(days=1), batch_size=10, pause=0
+    )
+    assert moved == 0
+
+    response = await async_client.get("/tasks/1/subtree")
+    assert (response.json()["total"], response.json()["done_count"]) == (2, 2)
+    response = await async_client.get("/tasks", params={"tag": "집"})
+    assert [task["title"] for task in response.json()] == ["태그"]
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 삭제 시 CASCADE와 여러 할 일 한 번에 삭제 테스트
+# - 할 일을 지우면 완료 기록/태그 연결이 DB에서 함께 지워진다.
+# - id 목록 또는 "이 날짜 이전 완료" 조건으로 여러 할 일을 지울 수 있다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_bulk_delete(async_client, monkeypatch):
+    for i in range(5):
+        await async_client.post("/tasks", json={"title": f"작업 {i}"})
+    await async_client.put("/tasks/1/done")
+    await async_client.put("/tasks/2/done")
+    await async_client.post(
+        "/tasks/tags/attach", json={"task_ids": [1], "tags": ["집"]}
+    )
+
+    response = await async_client.delete("/tasks/1")
+    assert response.status_code == status.HTTP_200_OK
+    response = await async_client.delete("/tasks/1")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # 없는 할 일은 완료 처리할 수 없음 (외래키)
+    response = await async_client.put("/tasks/1/done")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await async_client.post("/tasks/bulk-delete", json={})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    # 내일 이전에 완료된 할 일 -> 2번만 해당
+    tomorrow = (utcnow() + timedelta(days=1)).date().isoformat()
+    response = await async_client.post(
+        "/tasks/bulk-delete", json={"done_before": tomorrow}
+    )
+    assert response.json()["deleted"] == 1
+
+    # 같은 번호를 여러 번 보내도 한 번만 지워진 것으로 셈
+    response = await async_client.post("/tasks/bulk-delete", json={"ids": [3, 3, 99]})
+    assert response.json()["deleted"] == 1
+
+    # 감사 로그는 실제로 지워진 할 일만 남아야 함 (없는 번호, 조건에 맞지 않는 할 일 제외)
+    events = []
+    monkeypatch.setattr(
+        audit, "emit", lambda action, task_id, *args: events.append((action, task_id))
+    )
+    await async_client.put("/tasks/5/done")
+    events.clear()
+    response = await async_client.post(
+        "/tasks/bulk-delete", json={"ids": [4, 5, 99], "done_before": tomorrow}
+    )
+    assert response.json()["deleted"] == 1
+    assert events == [("delete", 5)]
+
+    response = await async_client.get("/tasks")
+    assert [task["title"] for task in response.json()] == ["작업 3"]
+
+    # 함께 지워진 하위 할 일도 삭제 개수와 감사 로그에 들어가야 함
+    # (상위 할 일과 함께 목록에 넣은 하위 할 일도 한 번만 셈)
+    await async_client.post("/tasks", json={"title": "하위", "parent_id": 4})
+    await async_client.post("/tasks", json={"title": "세부", "parent_id": 6})
+    events.clear()
+    response = await async_client.post("/tasks/bulk-delete", json={"ids": [4, 7]})
+    assert response.json()["deleted"] == 3
+    assert events == [("delete", 4), ("delete", 6), ("delete", 7)]
+    assert (await async_client.get("/tasks")).json() == []
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 달력(마감일별 묶음) 조회 테스트
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_calendar(async_client):
+    for title, due_date in [
+        ("A", "2025-05-02"),
+        ("B", "2025-05-02"),
+        ("C", "2025-05-20"),
+        ("다음 달", "2025-06-01"),
+        ("마감 없음", None),
+    ]:
+        await async_client.post("/tasks", json={"title": title, "due_date": due_date})
+    await async_client.put("/tasks/2/done")
+    # 반복 할 일은 첫 발생일(due_date)에도 나오지 않음 (/tasks/occurrences 에서 조회)
+    await async_client.post(
+        "/tasks",
+        json={"title": "운동", "due_date": "2025-05-02", "recurrence": "FREQ=DAILY"},
+    )
+
+    response = await async_client.get(
+        "/tasks/calendar", params={"from": "2025-05-01", "to": "2025-05-31"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    days = response.json()
+    assert [(day["date"], day["count"], day["done_count"]) for day in days] == [
+        ("2025-05-02", 2, 1),
+        ("2025-05-20", 1, 0),
+    ]
+    assert [task["title"] for task in days[0]["tasks"]] == ["A", "B"]
+
+    response = await async_client.get(
+        "/tasks/calendar", params={"from": "2025-05-31", "to": "2025-05-01"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 다음에 할 일(GET /tasks/next) 테스트
+# - 지난 마감일 -> 가까운 마감일 -> 마감일 없음, 같은 날이면 우선순위가 높은 순서
+# - 완료한 할 일과 반복 할 일은 나오지 않는다.
+# - 수정할 때 priority를 보내지 않으면 기존 값을 유지한다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_next_tasks(async_client):
+    today = utcnow().date()
+    ids = {}
+    for title, due, priority in [
+        ("언젠가", None, 9),
+        ("보고서", today + timedelta(days=3), 0),
+        ("밀린 일", today - timedelta(days=1), 0),
+        ("발표", today + timedelta(days=3), 5),
+        ("끝낸 일", today - timedelta(days=2), 0),
+    ]:
+        body = {
+            "title": title,
+            "due_date": due and due.isoformat(),
+            "priority": priority,
+        }
+        ids[title] = (await async_client.post("/tasks", json=body)).json()["id"]
+    await async_client.put(f"/tasks/{ids['끝낸 일']}/done")
+    await async_client.post(
+        "/tasks",
+        json={
+            "title": "운동",
+            "due_date": (today - timedelta(days=5)).isoformat(),
+            "recurrence": "FREQ=DAILY",
+        },
+    )
+
+    response = await async_client.get("/tasks/next?limit=3")
+    assert response.status_code == status.HTTP_200_OK
+    assert [(task["title"], task["overdue"]) for task in response.json()] == [
+        ("밀린 일", True),
+        ("발표", False),
+        ("보고서", False),
+    ]
+
+    # 보고서의 우선순위를 올리면 같은 마감일의 발표보다 먼저 나옴
+    due = (today + timedelta(days=3)).isoformat()
+    await async_client.put(
+        f"/tasks/{ids['보고서']}",
+        json={"title": "보고서", "due_date": due, "priority": 9},
+    )
+    # priority를 보내지 않은 수정은 우선순위를 바꾸지 않음
+    await async_client.put(
+        f"/tasks/{ids['발표']}", json={"title": "발표 준비", "due_date": due}
+    )
+
+    response = await async_client.get("/tasks/next")
+    assert [(task["title"], task["priority"]) for task in response.json()] == [
+        ("밀린 일", 0),
+        ("보고서", 9),
+        ("발표 준비", 5),
+        ("언젠가", 9),
+    ]
+
+    response = await async_client.get("/tasks/next?limit=0")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+# 완료된 할 일이 마감일 앞쪽에 많이 쌓여 있어도 완료되지 않은 할 일만 나와야 함
+# (완료/완료 취소, 하위까지 한 번에 완료/취소 모두 tasks.is_done에 반영되는지 확인)
+async def test_next_tasks_skips_done(async_client):
+    today = utcnow().date()
+    for i in range(30):
+        due = (today - timedelta(days=60 - i)).isoformat()
+        task = await async_client.post("/tasks", json={"title": "끝", "due_date": due})
+        await async_client.put(f"/tasks/{task.json()['id']}/done")
+    parent = (await async_client.post("/tasks", json={"title": "묶음"})).json()
+    for i in range(5):
+        due = (today - timedelta(days=90 + i)).isoformat()
+        await async_client.post(
+            "/tasks",
+            json={"title": "묶음 하위", "due_date": due, "parent_id": parent["id"]},
+        )
+    await async_client.put(f"/tasks/{parent['id']}/done?cascade=true")
+    for days in (2, 1):
+        due = (today + timedelta(days=days)).isoformat()
+        await async_client.post(
+            "/tasks", json={"title": f"{days}일 뒤", "due_date": due}
+        )
+
+    response = await async_client.get("/tasks/next?limit=5")
+    assert [task["title"] for task in response.json()] == ["1일 뒤", "2일 뒤"]
+
+    # 완료를 취소하면 다시 나옴 (하나씩 / 하위까지 한 번에)
+    await async_client.delete("/tasks/30/done")
+    response = await async_client.get("/tasks/next?limit=5")
+    assert [task["id"] for task in response.json()] == [30, 38, 37]
+
+    await async_client.delete(f"/tasks/{parent['id']}/done?cascade=true")
+    response = await async_client.get("/tasks/next?limit=3")
+    assert [task["title"] for task in response.json()] == ["묶음 하위"] * 3
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 변경 이력(감사 로그) 테스트
+# - 라우터는 이벤트를 큐에 넣기만 하고, flush_all()로 한 번에 저장한다.
+# - 큐가 가득 차면 이벤트를 버리고 audit_dropped_total 메트릭을 늘린다.
+# - 이력은 최신순이며 before_id로 다음 페이지를 읽는다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_audit_history(async_client, monkeypatch):
+    queue = audit.AuditQueue(maxsize=4, batch_size=2)
+    monkeypatch.setattr(audit, "audit_queue", queue)
+
+    headers = {"X-Actor": "alice"}
+    await async_client.post("/tasks", json={"title": "보고서"}, headers=headers)
+    await async_client.put("/tasks/1", json={"title": "보고서 v2"}, headers=headers)
+    await async_client.put("/tasks/1/done")
+    assert queue.qsize() == 3
+
+    # 아직 저장 전이므로 이력이 비어 있음
+    response = await async_client.get("/tasks/1/history")
+    assert response.json() == []
+
+    dropped = (await async_client.get("/metrics")).json().get("audit_dropped_total", 0)
+    await async_client.delete("/tasks/1/done")
+    await async_client.put("/tasks/1/done")  # 큐(최대 4개)가 가득 차서 버려짐
+    metrics = (await async_client.get("/metrics")).json()
+    assert metrics["audit_dropped_total"] == dropped + 1
+    assert metrics["audit_queue_depth"] == 4
+
+    session_factory = asynccontextmanager(app.dependency_overrides[get_db])
+    assert await queue.flush_all(session_factory) == 4
+    assert queue.qsize() == 0
+
+    response = await async_client.get("/tasks/1/history", params={"limit": 3})
+    history = response.json()
+    assert [entry["action"] for entry in history] == ["undone", "done", "update"]
+    assert history[2]["actor"] == "alice"
+    assert history[2]["changes"] == {"title": "보고서 v2"}
+
+    response = await async_client.get(
+        "/tasks/1/history", params={"before_id": history[-1]["id"]}
+    )
+    assert [entry["action"] for entry in response.json()] == ["create"]
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 마감 알림 스케줄러 테스트
+# - 오늘 마감인 할 일은 바로 알리고, 완료된 할 일이나 기간 밖의 할 일은 알리지 않는다.
+# - 실행 중에 추가/수정한 할 일도 DB 전체를 다시 읽지 않고 알림 목록에 반영된다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_reminders(async_client, monkeypatch):
+    scheduler = reminder.ReminderScheduler(window_days=2)
+    sink = reminder.LocalSink()
+    scheduler.add_sink(sink)
+    monkeypatch.setattr(reminder, "scheduler", scheduler)
+
+    today = utcnow().date()
+    for title, due_date in [
+        ("오늘", today),
+        ("오늘 (완료)", today),
+        ("다음 달", today + timedelta(days=30)),
+        ("마감 없음", None),
+    ]:
+        await async_client.post(
+            "/tasks",
+            json={"title": title, "due_date": due_date and due_date.isoformat()},
+        )
+    await async_client.put("/tasks/2/done")
+
+    async def delivered(count):
+        for _ in range(100):
+            if len(sink.reminders) >= count:
+                break
+            await asyncio.sleep(0.01)
+        return [item.title for item in sink.reminders]
+
+    session_factory = asynccontextmanager(app.dependency_overrides[get_db])
+    runner = asyncio.create_task(scheduler.run(session_factory))
+    try:
+        assert await delivered(1) == ["오늘"]
+
+        await async_client.post(
+            "/tasks", json={"title": "새 할 일", "due_date": today.isoformat()}
+        )
+        await async_client.put(
+            "/tasks/3", json={"title": "당겨진 할 일", "due_date": today.isoformat()}
+        )
+        assert await delivered(3) == ["오늘", "새 할 일", "당겨진 할 일"]
+
+        # 다시 읽어도 이미 알린 할 일은 또 알리지 않음
+        scheduler.refresh()
+        await asyncio.sleep(0.05)
+        assert len(sink.reminders) == 3
+
+        # 할 일을 지우면 함께 지워진 하위 할 일도 알림 목록에서 빠져야 함
+        removed = []
+        remove = scheduler.remove
+        monkeypatch.setattr(
+            scheduler,
+            "remove",
+            lambda task_id: (removed.append(task_id), remove(task_id)),
+        )
+        await async_client.post("/tasks", json={"title": "하위", "parent_id": 3})
+        await async_client.post("/tasks", json={"title": "세부", "parent_id": 6})
+        await async_client.delete("/tasks/3")
+        assert sorted(removed) == [3, 6, 7]
+    finally:
+        runner.cancel()
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 웹훅 outbox 테스트
+# - 할 일 변경과 함께 outbox에 쌓인 알림을 가짜 웹훅 서버로 보낸다.
+# - 실패한 주소는 나중에 다시 보내고, 계속 실패하면 dead로 남긴다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_outbox_webhooks(async_client, monkeypatch):
+    received = []
+    stub = FastAPI()
+
+    @stub.post("/ok")
+    async def ok(request: Request):
+        received.append((request.headers["X-Outbox-Event-Id"], await request.json()))
+
+    @stub.post("/down")
+    async def down():
+        return Response(status_code=503)
+
+    monkeypatch.setattr(outbox, "WEBHOOK_URLS", ["http://stub/ok", "http://stub/down"])
+    await async_client.post("/tasks", json={"title": "웹훅"})
+    await async_client.put("/tasks/1/done")
+
+    session_factory = asynccontextmanager(app.dependency_overrides[get_db])
+    client = AsyncClient(transport=ASGITransport(app=stub))
+    dispatcher = outbox.OutboxDispatcher(
+        session_factory, client=client, max_attempts=2, rate_per_second=1000
+    )
+
+    now = utcnow()
+    assert await dispatcher.dispatch_once(now) == 4
+    assert [body["event"] for _, body in received] == ["task.created", "task.done"]
+    assert received[0][1]["data"]["title"] == "웹훅"
+
+    # 실패한 알림은 대기 시간(backoff)이 지나기 전에는 다시 보내지 않음
+    assert await dispatcher.dispatch_once(now) == 0
+    assert await dispatcher.dispatch_once(now + timedelta(hours=1)) == 2
+
+    async with session_factory() as db:
+        result = await db.execute(
+            select(task_model.OutboxEvent.endpoint, task_model.OutboxEvent.status)
+        )
+        assert result.all() == [("http://stub/down", "dead")] * 2
+    await client.aclose()
+
+
+# ---------------------------------------------------------------
+# 메모리 저장소(MemoryTaskRepository)를 사용하는 테스트용 클라이언트
+# - get_repo()를 오버라이드해서 DB 대신 메모리 저장소로 같은 API를 실행한다.
+# ---------------------------------------------------------------
+@pytest_asyncio.fixture
+async def memory_client() -> AsyncGenerator[AsyncClient, None]:
+    repo = MemoryTaskRepository()
+    app.dependency_overrides[get_repo] = lambda: repo
+
+    transport = ASGITransport(app=app, raise_app_exceptions=True)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+    del app.dependency_overrides[get_repo]
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 메모리 저장소로 기본 기능 테스트
+# - 위의 테스트들을 그대로 메모리 저장소에서 다시 실행한다.
+# - DB에서만 동작하는 기능(작업 큐 등)은 SQL 저장소일 때만 등록되므로 여기서 다루지 않는다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "scenario",
+    [
+        test_create_and_read,
+        test_done_flag,
+        test_update_task,
+        test_subtree,
+        test_tags,
+        test_update_recurring_task,
+        test_bulk_delete,
+        test_calendar,
+        test_next_tasks,
+        test_next_tasks_skips_done,
+    ],
+)
+async def test_memory_backend(memory_client, monkeypatch, scenario):
+    if "monkeypatch" in inspect.signature(scenario).parameters:
+        await scenario(memory_client, monkeypatch)
+    else:
+        await scenario(memory_client)
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 메모리 저장소의 로그/스냅샷 저장 테스트
+# - 다시 열었을 때 스냅샷 + 로그로 같은 상태가 복원되어야 한다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_memory_backend_persistence(tmp_path):
+    repo = MemoryTaskRepository(str(tmp_path), snapshot_every=3)
+    for title in ["A", "B", "C", "D"]:
+        await repo.create_task(task_schema.TaskCreate(title=title))
+    await repo.mark_done(2)
+    await repo.delete_task(3)
+    # 로그 3줄마다 스냅샷을 만들므로 여기까지(6줄)는 모두 스냅샷에 들어가 있음
+
+    await repo.create_task(task_schema.TaskCreate(title="E", due_date="2025-05-02"))
+
+    reopened = MemoryTaskRepository(str(tmp_path))
+    tasks = await reopened.list_tasks()
+    assert [(task["id"], task["title"], task["done"]) for task in tasks] == [
+        (1, "A", False),
+        (2, "B", True),
+        (4, "D", False),
+        (5, "E", False),
+    ]
+    days = await reopened.get_calendar(date(2025, 5, 1), date(2025, 5, 31))
+    assert [(day["date"], day["count"]) for day in days] == [(date(2025, 5, 2), 1)]
+    assert (await reopened.create_task(task_schema.TaskCreate(title="F"))).id == 6
+
+    # 하위 할 일 경로와 태그도 로그에서 복원되어야 함
+    await reopened.create_task(task_schema.TaskCreate(title="G", parent_id=6))
+    await reopened.attach_tags([6, 7], ["집"])
+    await reopened.detach_tags([6], ["집"])
+
+    reopened = MemoryTaskRepository(str(tmp_path))
+    assert (await reopened.get_subtree(await reopened.get_task(6)))["total"] == 2
+    tasks = await reopened.list_tasks(tags=["집"])
+    assert [(task["id"], task["tags"]) for task in tasks] == [(7, ["집"])]
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 스냅샷 저장/복원 테스트
+# - 상위 할 일보다 번호가 작은 하위 할 일(옮긴 할 일)이 있어도
+#   트리 깊이 순서로 복원되어 외래키가 깨지지 않아야 한다.
+# - 파일이 손상되면 체크섬 검사에서 복원을 거부해야 한다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_snapshot_roundtrip(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'todo.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            task_model.Task.__table__.insert(),
+            [
+                {
+                    "id": 3,
+                    "title": "상위",
+                    "due_date": None,
+                    "parent_id": None,
+                    "path": "3/",
+                },
+                {
+                    "id": 2,
+                    "title": "마감",
+                    "due_date": date(2025, 5, 2),
+                    "parent_id": None,
+                    "path": "2/",
+                },
+                {
+                    "id": 1,
+                    "title": "하위",
+                    "due_date": None,
+                    "parent_id": 3,
+                    "path": "3/1/",
+                },
+                {
+                    "id": 4,
+                    "title": "세부",
+                    "due_date": None,
+                    "parent_id": 1,
+                    "path": "3/1/4/",
+                },
+            ],
+        )
+        await conn.execute(
+            task_model.Done.__table__.insert(), [{"id": 1, "done_at": utcnow()}]
+        )
+        await conn.execute(
+            update(task_model.Task).where(task_model.Task.id == 1).values(is_done=True)
+        )
+
+    async def read_all():
+        async with engine.connect() as conn:
+            return [
+                (await conn.execute(select(table).order_by(table.c.id))).all()
+                for table in snapshot.TABLES
+            ]
+
+    path = str(tmp_path / "todo.snap")
+    before = await read_all()
+    assert await snapshot.dump(engine, path, chunk_rows=1) == 5
+
+    async with engine.begin() as conn:
+        await conn.execute(task_model.Task.__table__.delete())
+    await snapshot.restore(engine, path, jobs=2)
+    assert await read_all() == before
+
+    with gzip.open(path, "rb") as f:
+        data = bytearray(f.read())
+    data[-100] ^= 1
+    with gzip.open(path, "wb") as f:
+        f.write(data)
+    with pytest.raises(ValueError):
+        await snapshot.restore(engine, path)
+    assert await read_all() == before
+
+    await engine.dispose()
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 같은 조회 요청 묶기(single-flight) 테스트
+# - 동시에 들어온 같은 GET /tasks 요청(쿼리 순서만 다름)은 한 번만 처리되고
+#   나머지는 같은 응답을 받아야 한다.
+# - 요청자(X-Actor)가 다르면 따로 처리해야 한다.
+# - 기본값(COALESCE_PATHS 없음)에서는 아무 요청도 묶지 않는다.
+# - leader가 5xx로 끝나면 기다리던 요청은 그 응답을 받지 않고 각자 처리한다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_coalesce_reads(async_client, monkeypatch):
+    for title in ["빨래", "보고서"]:
+        await async_client.post("/tasks", json={"title": title})
+
+    before = (await async_client.get("/metrics")).json()
+    await asyncio.gather(*(async_client.get("/tasks") for _ in range(3)))
+    after = (await async_client.get("/metrics")).json()
+    assert after.get("coalesce_requests_total", 0) == before.get(
+        "coalesce_requests_total", 0
+    )
+
+    monkeypatch.setattr(coalesce, "COALESCE_PATHS", ["/tasks"])
+
+    before = (await async_client.get("/metrics")).json()
+    urls = ["/tasks?limit=10&offset=0", "/tasks?offset=0&limit=10"] * 3
+    responses = await asyncio.gather(*(async_client.get(url) for url in urls))
+    after = (await async_client.get("/metrics")).json()
+
+    assert {response.status_code for response in responses} == {status.HTTP_200_OK}
+    assert len({response.content for response in responses}) == 1
+    assert [task["title"] for task in responses[0].json()] == ["빨래", "보고서"]
+    assert (
+        after["coalesce_requests_total"] - before.get("coalesce_requests_total", 0) == 6
+    )
+    assert (
+        after["coalesce_leaders_total"] - before.get("coalesce_leaders_total", 0) == 1
+    )
+    assert after["coalesce_ratio"] > 0
+
+    before = (await async_client.get("/metrics")).json()
+    await asyncio.gather(
+        *(
+            async_client.get("/tasks", headers={"X-Actor": actor})
+            for actor in ["a", "b"]
+        )
+    )
+    after = (await async_client.get("/metrics")).json()
+    assert after["coalesce_leaders_total"] - before["coalesce_leaders_total"] == 2
+
+    calls = 0
+
+    async def flaky_app(scope, receive, send):
+        nonlocal calls
+        calls += 1
+        first = calls == 1
+        if first:
+            await asyncio.sleep(0.05)  # 그동안 같은 요청이 뒤따라 들어옴
+        code = 500 if first else 200
+        await send({"type": "http.response.start", "status": code, "headers": []})
+        await send({"type": "http.response.body", "body": str(code).encode()})
+
+    transport = ASGITransport(app=coalesce.CoalesceMiddleware(flaky_app, ["/"]))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*(client.get("/tasks") for _ in range(3)))
+    assert [response.status_code for response in responses] == [500, 200, 200]
+    assert calls == 3
+
+
+# ---------------------------------------------------------------
+# [테스트 함수] 응답 압축 테스트
+# - Accept-Encoding에 맞춰 큰 목록은 압축하고, 작은 응답이나 identity 요청은 그대로 보낸다.
+# - 스트리밍 응답도 조각마다 이어서 압축해야 한다.
+# ---------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_compression(async_client):
+    assert compression.choose_encoding("br;q=0, gzip;q=0.5") == "gzip"
+    assert compression.choose_encoding("identity") is None
+    assert compression.choose_encoding("*") == next(iter(compression.ENCODERS))
+
+    response = await async_client.get("/tasks", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers  # "[]"는 너무 작음
+
+    for i in range(50):
+        await async_client.post("/tasks", json={"title": f"주간 보고서 작성 {i}"})
+    before = (
+        await async_client.get("/metrics", headers={"Accept-Encoding": "identity"})
+    ).json()
+
+    response = await async_client.get("/tasks", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()) == 50
+
+    response = await async_client.get("/tasks", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+    after = (
+        await async_client.get("/metrics", headers={"Accept-Encoding": "identity"})
+    ).json()
+    assert (
+        after["compression_gzip_responses_total"]
+        - before.get("compression_gzip_responses_total", 0)
+        == 1
+    )
+    assert 0 < after["compression_ratio"] < 0.5
+
+    # 스트리밍 응답: 조각마다 압축해서 보내고, 이어 붙이면 원래 본문이 되어야 함
+    chunks = [b'{"line": %d, "title": "repeated title"}\n' % i for i in range(500)]
+
+    async def streaming_app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            }
+        )
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = compression.CompressionMiddleware(streaming_app, thread_min_size=64)
+    transport = ASGITransport(app=middleware)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == b"".join(chunks)
+
+    # 마지막 조각 전에도 보낸 조각마다 바로 풀 수 있는 내용이 들어 있어야 함
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    await middleware(scope, receive, send)
+    bodies = [
+        message for message in messages if message["type"] == "http.response.body"
+    ]
+    assert len(bodies) > 2
+    decompressor = zlib.decompressobj(31)
+    decoded = b""
+    for message in bodies[:-1]:
+        assert message["more_body"] is True
+        piece = decompressor.decompress(message["body"])
+        assert piece  # 빈 조각을 보내지 않고, 보낸 조각은 바로 풀림
+        decoded += piece
+    decoded += decompressor.decompress(bodies[-1]["body"]) + decompressor.flush()
+    assert decoded == b"".join(chunks)